@@ -14,17 +14,19 @@ import os
 import signal
 import sys
 import time
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Union
 
-from being.backends import CanBackend
+from being.backends import MAX_BUS_LOAD, CanBackend, connected_networks
 from being.being import Being
 from being.block import Block
+from being.can.recorder import CanRecorder
 from being.clock import Clock
 from being.configuration import CONFIG
 from being.connectables import MessageInput
 from being.logging import get_logger
-from being.pacemaker import Pacemaker
+from being.pacemaker import MAIN_CYCLE_PHASE, Pacemaker, cycle_time, next_cycle
 from being.resources import register_resource
+from being.serialization import dumps_fast
 from being.web.server import init_web_server, run_web_server
 from being.web.web_socket import WebSocket
 
@@ -34,6 +36,8 @@ _API_PREFIX = CONFIG['Web']['API_PREFIX']
 _WEB_SOCKET_ADDRESS = CONFIG['Web']['WEB_SOCKET_ADDRESS']
 _INTERVAL = CONFIG['General']['INTERVAL']
 _WEB_INTERVAL = CONFIG['Web']['INTERVAL']
+_RECORDER_FILEPATH = CONFIG['Can']['RECORDER_FILEPATH']
+_METRICS_INTERVAL = CONFIG['Can']['METRICS_INTERVAL']
 
 LOGGER = get_logger(name=__name__, parent=None)
 
@@ -45,7 +49,8 @@ def _exit_signal_handler(signum=None, frame=None):
 
 
 def _run_being_standalone(being: Being):
-    """Run being standalone without web server / front-end.
+    """Run being standalone without web server / front-end. Phase locked to
+    the pacemaker.
 
     Args:
         being: Being application instance.
@@ -53,31 +58,26 @@ def _run_being_standalone(being: Being):
     if os.name == 'posix':
         signal.signal(signal.SIGTERM, _exit_signal_handler)
 
-    cycle = int(time.perf_counter() / _INTERVAL)
+    cycle = next_cycle(time.perf_counter(), _INTERVAL, MAIN_CYCLE_PHASE)
     while True:
-        now = time.perf_counter()
-        then = cycle * _INTERVAL
-        sleepTime = then - now
+        sleepTime = cycle_time(cycle, _INTERVAL, MAIN_CYCLE_PHASE) - time.perf_counter()
         if sleepTime >= 0:
-            time.sleep(then - now)
+            time.sleep(sleepTime)
 
         being.single_cycle()
         cycle += 1
 
 
 async def _run_being_async(being: Being):
-    """Run being inside async loop.
+    """Run being inside async loop. Phase locked to the pacemaker (same
+    :func:`time.perf_counter` grid, not the loop clock).
 
     Args:
         being: Being application instance.
     """
-    time_func = asyncio.get_running_loop().time
-    cycle = int(time_func() / _INTERVAL)
-
+    cycle = next_cycle(time.perf_counter(), _INTERVAL, MAIN_CYCLE_PHASE)
     while True:
-        now = time_func()
-        then = cycle * _INTERVAL
-        sleepTime = then - now
+        sleepTime = cycle_time(cycle, _INTERVAL, MAIN_CYCLE_PHASE) - time.perf_counter()
         if sleepTime >= 0:
             await asyncio.sleep(sleepTime)
 
@@ -116,11 +116,33 @@ async def _send_being_state_to_front_end(being: Being, ws: WebSocket):
                 list(dummy.receive())
                 for dummy in dummies
             ],
-        })
+        }, dumps=dumps_fast)
 
         cycle += 1
 
 
+async def _send_bus_metrics_to_front_end(being: Being, ws: WebSocket):
+    """Periodically sample the bus metrics of all networks and send them to
+    the front-end.
+
+    Args:
+        being: Being application instance.
+        ws: Active web socket.
+    """
+    if not being.networks:
+        return
+
+    while True:
+        await asyncio.sleep(_METRICS_INTERVAL)
+        ws.send_json_buffered({
+            'type': 'bus-metrics',
+            'metrics': {
+                str(network.channel): network.metrics.sample()
+                for network in being.networks
+            },
+        })
+
+
 async def _run_being_with_web_server(being: Being):
     """Run being with web server. Continuation for awake() for asyncio part.
 
@@ -132,6 +154,7 @@ async def _run_being_with_web_server(being: Being):
     await asyncio.gather(
         _run_being_async(being),
         _send_being_state_to_front_end(being, ws),
+        _send_bus_metrics_to_front_end(being, ws),
         run_web_server(app),
     )
 
@@ -143,7 +166,7 @@ def awake(
         homeMotors: bool = True,
         usePacemaker: bool = True,
         clock: Optional[Clock] = None,
-        network: Optional[CanBackend] = None,
+        network: Union[None, CanBackend, Iterable[CanBackend]] = None,
     ):
     """Run being block network.
 
@@ -151,31 +174,53 @@ def awake(
         blocks: Some blocks of the network.
         web: Run with web server.
         enableMotors: Enable motors on startup.
-        homeMotors: Home motors on startup.
-        usePacemaker: If to use an extra pacemaker thread.
+        homeMotors: Home motors on startup. Motors which resumed a still
+            valid recorded homing get skipped.
+        usePacemaker: Send SYNC and RPDOs on a strict period from a dedicated
+            pacemaker thread. The main cycle only publishes its set-points.
         clock: Clock instance.
-        network: CanBackend instance.
+        network: CanBackend instance(s). All connected networks by default.
     """
     if clock is None:
         clock = Clock.single_instance_setdefault()
 
     if network is None:
-        network = CanBackend.single_instance_get()
+        networks = connected_networks()
+        default = CanBackend.single_instance_get()
+        if default is not None and all(net is not default for net in networks):
+            networks.append(default)
+
+    elif isinstance(network, CanBackend):
+        networks = [network]
+    else:
+        networks = list(network)
+
+    for net in networks:
+        load = net.estimated_bus_load(_INTERVAL)
+        LOGGER.info('Estimated bus load of %s: %.0f %%', net.channel, 100 * load)
+        if load > MAX_BUS_LOAD:
+            LOGGER.warning(
+                'Estimated bus load of %s is %.0f %%. Consider distributing the motors over more buses',
+                net.channel, 100 * load,
+            )
+
+        if _RECORDER_FILEPATH:
+            register_resource(CanRecorder(net, _RECORDER_FILEPATH.format(channel=net.channel)))
+
+        net.enable_pdo_communication()
 
-    pacemaker = Pacemaker(network)
-    being = Being(blocks, clock, pacemaker, network)
+    pacemaker = Pacemaker(networks)
+    being = Being(blocks, clock, pacemaker, networks)
 
-    if network is not None:
-        network.enable_pdo_communication()
-        if usePacemaker:
-            pacemaker.start()
-            register_resource(pacemaker)
+    if networks and usePacemaker:
+        pacemaker.start()
+        register_resource(pacemaker)
 
     if enableMotors:
         being.enable_motors()
 
     if homeMotors:
-        being.home_motors()
+        being.home_motors(force=False)
 
     try:
         if web:
@@ -18,9 +18,10 @@ Todo:
 """
 import contextlib
 import sys
+import threading
 import time
 import warnings
-from typing import List, Generator, Set
+from typing import Callable, Dict, List, Generator, Optional
 from logging import Logger
 
 try:
@@ -33,8 +34,11 @@ import can
 import canopen
 from canopen.pdo.base import Map
 
-from being.can.cia_402 import CiA402Node
+from being.can.batch import TargetBatch
+from being.can.cia_402 import CiA402Node, State, try_change_states
+from being.can.metrics import BusMetrics, frame_bits
 from being.can.nmt import PRE_OPERATIONAL, OPERATIONAL
+from being.can.pdo import PdoField
 from being.configuration import CONFIG
 from being.logging import get_logger
 from being.rpi_gpio import GPIO
@@ -43,6 +47,7 @@ from being.utils import SingleInstanceCache, filter_by_type
 
 # Look before you leap
 _DEFAULT_CAN_BITRATE = CONFIG['Can']['DEFAULT_CAN_BITRATE']
+_RPDO_REFRESH_CYCLES = CONFIG['Can']['RPDO_REFRESH_CYCLES']
 _INTERVAL = CONFIG['General']['INTERVAL']
 
 # Default system dependent CAN bus parameters
@@ -61,6 +66,94 @@ _CAN_SYNC_MSG: can.Message = can.Message(
 )
 """Ready to send CAN SYNC message."""
 
+MAX_BUS_LOAD = 0.5
+"""Maximum recommended CAN bus load."""
+
+_CONNECTED_NETWORKS: Dict[str, 'CanBackend'] = {}
+"""Currently connected CAN networks by channel."""
+
+_CONNECTED_NETWORKS_LOCK = threading.Lock()
+
+
+def connected_networks() -> List['CanBackend']:
+    """All currently connected CAN networks. Ordered by channel."""
+    with _CONNECTED_NETWORKS_LOCK:
+        return [_CONNECTED_NETWORKS[channel] for channel in sorted(_CONNECTED_NETWORKS)]
+
+
+def find_network(channel: str) -> Optional['CanBackend']:
+    """Find connected CAN network for a given channel (if any)."""
+    with _CONNECTED_NETWORKS_LOCK:
+        return _CONNECTED_NETWORKS.get(channel)
+
+
+class RpdoFrame:
+
+    """Preallocated CAN frame for a RPDO map. Data bytes only get copied over
+    when they changed. For transmitting from another thread the current map
+    data can be staged first (double buffering). The CAN message then gets
+    refreshed from the staged copy while the control cycle already writes the
+    next set-points into the map.
+
+    Attributes:
+        rx: RPDO map.
+        msg: Reusable CAN message.
+        idle: Number of cycles since last transmission.
+        staged: Staged copy of the map data (None if never staged).
+        stagedCobId: Staged CAN id.
+    """
+
+    __slots__ = ('rx', 'msg', 'idle', 'staged', 'stagedCobId')
+
+    def __init__(self, rx: Map):
+        """Args:
+            rx: RPDO map.
+        """
+        self.rx = rx
+        self.msg = can.Message(
+            is_extended_id=rx.cob_id > 0x7FF,
+            arbitration_id=rx.cob_id,
+            data=bytearray(),  # Empty -> First refresh() always counts as change
+            is_remote_frame=False,
+        )
+        self.idle = 0
+        self.staged: Optional[bytearray] = None
+        self.stagedCobId = rx.cob_id
+
+    def stage(self):
+        """Stage current data of RPDO map."""
+        if self.staged is None:
+            self.staged = bytearray()
+
+        self.staged[:] = self.rx.data
+        self.stagedCobId = self.rx.cob_id
+
+    def refresh(self, staged: bool = False) -> bool:
+        """Update CAN message from RPDO map.
+
+        Args:
+            staged (optional): Update from staged copy instead.
+
+        Returns:
+            If frame changed.
+        """
+        if staged:
+            cobId = self.stagedCobId
+            data = self.staged
+        else:
+            cobId = self.rx.cob_id
+            data = self.rx.data
+
+        msg = self.msg
+        if msg.data == data and msg.arbitration_id == cobId:
+            return False
+
+        msg.arbitration_id = cobId
+        msg.is_extended_id = cobId > 0x7FF
+        msg.data[:] = data
+        msg.dlc = len(msg.data)
+        return True
+
 
 class CanBackend(canopen.Network, SingleInstanceCache, contextlib.AbstractContextManager):
 
@@ -77,13 +170,25 @@ class CanBackend(canopen.Network, SingleInstanceCache, contextlib.AbstractContex
             bitrate: int =_DEFAULT_CAN_BITRATE,
             bustype: str =_DEFAULT_BUS_TYPE,
             channel: str =_DEFAULT_CHANNEL,
+            refreshCycles: int = _RPDO_REFRESH_CYCLES,
         ):
         """
         Args:
             bitrate (optional): Bitrate of CAN bus.
             bustype (optional): CAN bus type. Default value is system dependent.
             channel (optional): CAN bus channel. Default value is system dependent.
+            refreshCycles (optional): Unchanged RPDOs get resent every n-th
+                cycle. 1 for sending all RPDOs every cycle.
+        """
+        if refreshCycles < 1:
+            raise ValueError(f'refreshCycles has to be at least 1, not {refreshCycles}!')
+
+        self.setupLock = threading.RLock()
+        """Guards changes of the network setup (nodes, subscriptions, target
+        batch slots) when motors get brought up from multiple threads. Before
+        super().__init__() which already subscribes.
         """
+
         super().__init__(bus=None)
         self.bitrate: str = bitrate
         """CAN bus bit rate."""
@@ -97,8 +202,35 @@ class CanBackend(canopen.Network, SingleInstanceCache, contextlib.AbstractContex
         self.logger: Logger = get_logger('CanBackend')
         """Dedicated logger."""
 
-        self.rpdos: Set[Map] = set()
-        """All registered RPDO maps."""
+        self.refreshCycles: int = refreshCycles
+        """Resend unchanged RPDOs every n-th cycle."""
+
+        self.rpdos: Dict[Map, RpdoFrame] = {}
+        """All registered RPDO maps and their preallocated frames."""
+
+        self.rpdoLock = threading.Lock()
+        """Guards staging / refreshing of the RPDO frames."""
+
+        self.extrapolators: List[Callable[[], None]] = []
+        """Callbacks which extrapolate the set-points of a late main cycle."""
+
+        self.targetBatch: TargetBatch = TargetBatch()
+        """Vectorized target positions of the motors. Get flushed into the RPDO
+        maps before publishing / transmitting.
+        """
+
+        self.recorder = None
+        """Attached CAN traffic recorder (if any). See
+        :class:`being.can.recorder.CanRecorder`.
+        """
+
+        self.metrics: BusMetrics = BusMetrics(bitrate)
+        """Bus metrics."""
+
+        self.pdoCommunication: bool = False
+        """If PDO communication is enabled (NMT OPERATIONAL)."""
+
+        self.listeners.append(self.metrics)
 
     @property
     def drives(self) -> Generator[CiA402Node, None, None]:
@@ -109,41 +241,272 @@ class CanBackend(canopen.Network, SingleInstanceCache, contextlib.AbstractContex
         """
         return filter_by_type(self.values(), CiA402Node)
 
-    def switch_off_drives(self):
-        """Switch off all registered drive nodes."""
-        for drive in self.drives:
-            drive.switch_off()
+    def add_node(self, node, object_dictionary=None, upload_eds=False):
+        with self.setupLock:
+            return super().add_node(node, object_dictionary, upload_eds)
+
+    def subscribe(self, can_id, callback):
+        with self.setupLock:
+            super().subscribe(can_id, callback)
+
+    def unsubscribe(self, can_id, callback=None):
+        with self.setupLock:
+            super().unsubscribe(can_id, callback)
+
+    def notify(self, can_id, data, timestamp):
+        # Subscriptions can change concurrently during bring-up. No membership
+        # test + lookup race.
+        callbacks = self.subscribers.get(can_id)
+        if callbacks:
+            for callback in callbacks:
+                callback(can_id, data, timestamp)
+
+        self.scanner.on_message_received(can_id)
+
+    def switch_off_drives(self, timeout: float = 1.0) -> Dict[int, Optional[State]]:
+        """Switch off all registered drive nodes in parallel. With PDO
+        communication enabled the disable controlwords of all drives go out
+        in one cycle and the statusword TxPDOs get awaited. Drives which did
+        not confirm within half of the time get switched off via SDO. One
+        global deadline for everything.
+
+        Args:
+            timeout (optional): Timeout in seconds.
+
+        Returns:
+            Node id -> final state (None if unknown).
+        """
+        def tick():
+            try:
+                self.transmit_cycle()
+            except (can.CanError, OSError) as err:
+                self.logger.error('Could not send frames (%s)', err)
+
+        startTime = time.perf_counter()
+        drives = list(self.drives)
+        states = {}
+        if self.pdoCommunication and drives:
+            states = try_change_states(
+                drives,
+                State.SWITCH_ON_DISABLED,
+                how='pdo',
+                timeout=.5 * timeout,
+                tick=tick,
+            )
+
+        remaining = [drive for drive in drives if states.get(drive.id) is not State.SWITCH_ON_DISABLED]
+        if remaining:
+            timeLeft = max(0., timeout - (time.perf_counter() - startTime))
+            states.update(try_change_states(remaining, State.SWITCH_ON_DISABLED, timeout=timeLeft))
+
+        failed = sorted(nodeId for nodeId, state in states.items() if state is not State.SWITCH_ON_DISABLED)
+        self.logger.info(
+            'Switched off %d of %d drives in %.3f sec',
+            len(drives) - len(failed), len(drives), time.perf_counter() - startTime,
+        )
+        for nodeId in failed:
+            self.logger.warning('Node %d did not switch off (%s)', nodeId, states[nodeId])
+
+        return states
+
+    def transmit_cycle(self):
+        """Transmit all RPDOs followed by a SYNC. Outside of the regular
+        control cycle.
+        """
+        self.transmit_all_rpdos()
+        self.send_sync()
 
     def enable_pdo_communication(self):
         """Enable PDO communication by setting NMT state to OPERATIONAL."""
         self.logger.debug('Global NMT -> OPERATIONAL')
         self.nmt.state = OPERATIONAL
+        self.pdoCommunication = True
 
     def disable_pdo_communication(self):
         """Disable PDO communication by setting NMT state to PRE-OPERATIONAL."""
         self.logger.debug('Global NMT -> PRE-OPERATIONAL')
         self.nmt.state = PRE_OPERATIONAL
+        self.pdoCommunication = False
+
+    def attach_recorder(self, recorder):
+        """Attach CAN traffic recorder. Records received and sent frames."""
+        if self.recorder is not None:
+            raise RuntimeError(f'{self} already has a recorder attached!')
+
+        if self.notifier is not None:
+            self.notifier.add_listener(recorder)
+        else:
+            self.listeners.append(recorder)
+
+        self.recorder = recorder
+
+    def detach_recorder(self, recorder):
+        """Detach CAN traffic recorder again."""
+        if recorder is not self.recorder:
+            return
+
+        if self.notifier is not None:
+            self.notifier.remove_listener(recorder)
+        else:
+            self.listeners.remove(recorder)
+
+        self.recorder = None
+
+    # Note: Sent frames get recorded right before sending. Their timestamps
+    # then precede the ones of the responses.
+
+    def send_message(self, can_id: int, data: bytes, remote: bool = False):
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(can_id, data, rx=False, remote=remote)
+
+        try:
+            super().send_message(can_id, data, remote)
+        except (can.CanError, OSError):
+            self.metrics.send_failed()
+            raise
+
+        self.metrics.frame_sent(len(data))
 
     def send_sync(self):
         """Send SYNC message over CAN network."""
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record_message(_CAN_SYNC_MSG, rx=False)
+
         # self.send_message(0x80, [])  # send_message() has a lock inside
-        self.bus.send(_CAN_SYNC_MSG)
+        try:
+            self.bus.send(_CAN_SYNC_MSG)
+        except (can.CanError, OSError):
+            self.metrics.send_failed()
+            raise
+
+        self.metrics.sync_sent()
 
     def register_rpdo(self, rx: Map):
         """Register RPDO map to be transmitted repeatedly by sender thread."""
-        self.rpdos.add(rx)
+        with self.rpdoLock:
+            if rx not in self.rpdos:
+                self.rpdos[rx] = RpdoFrame(rx)
+
+    def publish_rpdos(self):
+        """Flush the target batch and stage the current data of all registered
+        RPDO maps. Called by the control cycle once all set-points are written.
+        The pacemaker then sends the staged data with
+        ``transmit_all_rpdos(published=True)``. Until the next publish the
+        previous set-points keep going out.
+        """
+        self.targetBatch.flush()
+        self._stage_rpdos()
+
+    def _stage_rpdos(self):
+        with self.rpdoLock:
+            for frame in self.rpdos.values():
+                frame.stage()
+
+    def send_frames(self, frames: List[can.Message]):
+        """Send multiple CAN frames in one go."""
+        #self.pdo_node.network.send_message(rx.cob_id, rx.data)  # Lock inside
+        recorder = self.recorder
+        if recorder is not None:
+            for msg in frames:
+                recorder.record_message(msg, rx=False)
+
+        send = self.bus.send
+        frameSent = self.metrics.frame_sent
+        try:
+            for msg in frames:
+                send(msg)
+                frameSent(msg.dlc)
+        except (can.CanError, OSError):
+            self.metrics.send_failed()
+            raise
+
+    def extrapolate_set_points(self):
+        """Main cycle is late. Extrapolate the set-points of all registered
+        extrapolators. Called from the pacemaker thread. The extrapolators
+        run with the RPDO lock held and only write into the staged data (see
+        :meth:`CanBackend.stage_value`). The RPDO maps themselves belong to
+        the main cycle which might be writing its next set-points right now.
+        """
+        if not self.extrapolators:
+            return
+
+        with self.rpdoLock:
+            for extrapolate in self.extrapolators:
+                extrapolate()
+
+    def stage_value(self, field: PdoField, value) -> bool:
+        """Overwrite value in the staged data of its RPDO. For extrapolators.
+        Caller has to hold the RPDO lock.
 
-    def transmit_all_rpdos(self):
-        """Transmit all current values of all registered RPDO maps."""
+        Args:
+            field: Direct PDO accessor of the variable.
+            value: New raw value.
+
+        Returns:
+            If the value got staged. Not for never published RPDOs or
+            variables which are not byte aligned.
+        """
+        if not isinstance(field, PdoField):
+            return False
+
+        frame = self.rpdos.get(field.map)
+        if frame is None or frame.staged is None:
+            return False
+
+        field.pack_into(frame.staged, value)
+        return True
+
+    def transmit_all_rpdos(self, published: bool = False):
+        """Transmit all current values of all registered RPDO maps. Changed
+        RPDOs are always sent, unchanged ones only every ``refreshCycles``-th
+        cycle.
+
+        Args:
+            published (optional): Transmit the data staged by
+                :meth:`CanBackend.publish_rpdos` instead of the current map
+                data. Never published RPDOs are skipped.
+        """
+        if not published:
+            self.targetBatch.flush()
+
+        frames = []
+        with self.rpdoLock:
+            for frame in self.rpdos.values():
+                if published and frame.staged is None:
+                    continue
+
+                if frame.refresh(published) or frame.idle + 1 >= self.refreshCycles:
+                    frames.append(frame.msg)
+                    frame.idle = 0
+                else:
+                    frame.idle += 1
+
+        self.send_frames(frames)
+
+    def estimated_bus_load(self, interval: float = _INTERVAL) -> float:
+        """Estimate worst case bus load of the cyclic traffic. SYNC, all
+        registered RPDOs and the synchronous TxPDOs of all drives once per
+        cycle.
+
+        Args:
+            interval (optional): Cycle interval in seconds.
+
+        Returns:
+            Bus load in [0, 1].
+        """
+        bits = frame_bits(0)
         for rx in self.rpdos:
-            #self.pdo_node.network.send_message(rx.cob_id, rx.data)  # Lock inside
-            msg = can.Message(
-                is_extended_id=rx.cob_id > 0x7FF,
-                arbitration_id=rx.cob_id,
-                data=rx.data,
-                is_remote_frame=False,
-            )
-            self.bus.send(msg)
+            bits += frame_bits(len(rx.data))
+
+        for node in self.drives:
+            for tx in node.tpdo.map.values():
+                if tx.enabled and tx.trans_type is not None and 1 <= tx.trans_type <= 240:
+                    length = sum(var.length for var in tx.map)
+                    bits += frame_bits((length + 7) // 8) / tx.trans_type
+
+        return bits / interval / self.bitrate
 
     def scan_for_node_ids(self) -> List[int]:
         """Scan for node ids which are online.
@@ -158,12 +521,46 @@ class CanBackend(canopen.Network, SingleInstanceCache, contextlib.AbstractContex
     def __enter__(self):
         self.connect(bitrate=self.bitrate, bustype=self.bustype, channel=self.channel)
         self.check()
+        with _CONNECTED_NETWORKS_LOCK:
+            _CONNECTED_NETWORKS.setdefault(self.channel, self)
+
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.disable_pdo_communication()
-        self.switch_off_drives()
-        self.disconnect()
+        # Always disconnect, also if the bus went down
+        try:
+            self.switch_off_drives()
+        finally:
+            try:
+                self.disable_pdo_communication()
+            finally:
+                self.disconnect()
+                with _CONNECTED_NETWORKS_LOCK:
+                    if _CONNECTED_NETWORKS.get(self.channel) is self:
+                        del _CONNECTED_NETWORKS[self.channel]
+
+
+def network_for_channel(channel: Optional[str] = None) -> CanBackend:
+    """Get connected network for CAN channel or create a new one. The default
+    channel is served by the single instance network.
+
+    Args:
+        channel (optional): CAN channel. Default channel if omitted.
+
+    Returns:
+        Network for channel. Not necessarily connected yet.
+    """
+    if channel is None:
+        channel = _DEFAULT_CHANNEL
+
+    network = find_network(channel)
+    if network is not None:
+        return network
+
+    if channel == _DEFAULT_CHANNEL:
+        return CanBackend.single_instance_setdefault()
+
+    return CanBackend(channel=channel)
 
 
 class AudioBackend(SingleInstanceCache, contextlib.AbstractContextManager):
@@ -1,7 +1,7 @@
 """Being application core object. Encapsulates the various blocks for a given
 program and defines the single cycle.
 """
-from typing import List, Optional, Iterable, Generator
+from typing import List, Optional, Iterable, Generator, Union
 
 from being.backends import CanBackend
 from being.behavior import Behavior
@@ -15,7 +15,7 @@ from being.graph import Graph, topological_sort
 from being.logging import get_logger
 from being.motion_player import MotionPlayer
 from being.motors.blocks import MotorBlock
-from being.motors.homing import HomingState
+from being.motors.homing import HomingScheduler, HomingState
 from being.pacemaker import Pacemaker
 from being.params import Parameter
 from being.utils import filter_by_type
@@ -61,23 +61,40 @@ class Being:
             blocks: List[Block],
             clock: Clock,
             pacemaker: Pacemaker,
-            network: Optional[CanBackend] = None,
+            network: Union[None, CanBackend, Iterable[CanBackend]] = None,
+            homingScheduler: Optional[HomingScheduler] = None,
         ):
         """
         Args:
             blocks: Blocks (forming a block network) to execute.
             clock: Being clock instance.
-            pacemaker: Pacemaker instance. Thread will not be started but will be used as dummy.
-            network: CanBackend instance (if any, DI).
+            pacemaker: Pacemaker instance. Transmits SYNC and RPDOs if its
+                thread is running. Otherwise only used as dummy.
+            network: CanBackend instance(s) (if any, DI).
+            homingScheduler (optional): Homing scheduler for the motors.
+                Default one from the config otherwise.
         """
+        if network is None:
+            networks = []
+        elif isinstance(network, CanBackend):
+            networks = [network]
+        else:
+            networks = list(network)
+
+        if homingScheduler is None:
+            homingScheduler = HomingScheduler()
+
         self.clock: Clock = clock
         """Being clock."""
 
         self.pacemaker: Pacemaker = pacemaker
         """Being pacemaker."""
 
-        self.network: CanBackend = network
-        """Being CAN backend / network."""
+        self.networks: List[CanBackend] = networks
+        """Being CAN backends / networks. One per bus."""
+
+        self.network: Optional[CanBackend] = networks[0] if networks else None
+        """First CAN backend / network (if any)."""
 
         self.graph: Graph = block_network_graph(blocks)
         """Block network for running program."""
@@ -105,6 +122,14 @@ class Being:
         self.params: List[Parameter] = list(filter_by_type(self.execOrder, Parameter))
         """All parameter blocks."""
 
+        self.homingScheduler: HomingScheduler = homingScheduler
+        """Coordinates the homing jobs of all motors."""
+
+        for motor in self.motors:
+            homing = getattr(motor, 'homing', None)  # Not part of MotorInterface
+            if homing is not None:
+                homingScheduler.add(homing)
+
     def enable_motors(self):
         """Enable all motor blocks."""
         self.logger.info('enable_motors()')
@@ -117,11 +142,17 @@ class Being:
         for motor in self.motors:
             motor.disable()
 
-    def home_motors(self):
-        """Home all motors."""
+    def home_motors(self, force: bool = True):
+        """Home all motors.
+
+        Args:
+            force: Also home motors which are already homed (e.g. resumed
+                from the homing record).
+        """
         self.logger.info('home_motors()')
         for motor in self.motors:
-            motor.home()
+            if force or motor.homing_state() is not HomingState.HOMED:
+                motor.home()
 
     def start_behaviors(self):
         """Start all behaviors."""
@@ -135,16 +166,22 @@ class Being:
 
     def single_cycle(self):
         """Execute single being cycle. Network sync, executing block network,
-        advancing clock.
+        advancing clock. With a running pacemaker the SYNC and RPDOs go out
+        from the pacemaker thread and the cycle only publishes its set-points
+        after the block network executed. Otherwise SYNC and RPDOs get sent
+        directly from here.
         """
-        if self.network:
-            self.network.send_sync()
+        if self.pacemaker.running:
+            execute(self.execOrder)
+            for network in self.networks:
+                network.publish_rpdos()
+        else:
+            for network in self.networks:
+                network.send_sync()
+
+            execute(self.execOrder)
+            for network in self.networks:
+                network.transmit_all_rpdos()
 
         self.pacemaker.tick()
-
-        execute(self.execOrder)
-
-        if self.network:
-            self.network.transmit_all_rpdos()
-
         self.clock.step()
@@ -0,0 +1,189 @@
+"""Compact binary serialization of being objects with MessagePack.
+
+Binary counterpart to :mod:`being.serialization`. Everything the JSON path
+supports round-trips here as well. Being specific types are packed as
+MessagePack extension types so that no nested JSON objects or base64 encoded
+strings are needed. Named tuples and enums still have to be registered with
+:func:`being.serialization.register_named_tuple` and
+:func:`being.serialization.register_enum`. Needs the optional ``msgpack``
+package.
+
+Consumers can pick their codec (see :class:`being.serialization.Codec`):
+
+Example:
+    >>> from being.content import Content
+    ... from being.networking import NetworkOut
+    ... content = Content('content', codec=MSGPACK_CODEC)
+    ... out = NetworkOut(('localhost', 56790), codec=MSGPACK_CODEC)
+"""
+import enum
+import functools
+
+import numpy as np
+from numpy import ndarray
+from scipy.interpolate import PPoly, BPoly
+
+from being.curve import Curve
+from being.serialization import (
+    ENUM_LOOKUP,
+    SPLINE_LOOKUP,
+    SPLINE_TYPES,
+    Codec,
+    _enum_type_qualname,
+    _is_registered_named_tuple,
+    enum_from_dict,
+    named_tuple_from_dict,
+    to_serializable,
+)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class ExtType(enum.IntEnum):
+
+    """MessagePack extension type codes."""
+
+    NDARRAY = 1
+    SPLINE = 2
+    CURVE = 3
+    ENUM = 4
+    NAMED_TUPLE = 5
+    SET = 6
+
+
+def _ext(code: ExtType, payload) -> 'msgpack.ExtType':
+    """Pack payload as extension type."""
+    return msgpack.ExtType(code, packb(payload))
+
+
+@functools.singledispatch
+def to_packable(obj):
+    """Convert being object to something MessagePack can pack. Type dispatch
+    table for the packer. Falls back to the JSON representation
+    (:func:`being.serialization.to_serializable`).
+
+    Raises:
+        TypeError: For unsupported types.
+    """
+    return to_serializable(obj)
+
+
+@to_packable.register(dict)
+def _dict_subclass_to_packable(dct):
+    return dict(dct)
+
+
+@to_packable.register(list)
+@to_packable.register(tuple)
+def _sequence_subclass_to_packable(seq):
+    return list(seq)
+
+
+@to_packable.register(ndarray)
+def _ndarray_to_packable(arr):
+    if arr.dtype.hasobject:
+        return arr.tolist()
+
+    arr = np.ascontiguousarray(arr)
+    return _ext(ExtType.NDARRAY, [arr.dtype.str, arr.shape, arr.data])
+
+
+@to_packable.register(PPoly)
+@to_packable.register(BPoly)
+def _spline_to_packable(spline):
+    cls = type(spline)
+    if cls not in SPLINE_TYPES:
+        raise ValueError(f'Spline type {cls.__name__} not supported!')
+
+    return _ext(ExtType.SPLINE, [
+        SPLINE_TYPES[cls].__name__,
+        spline.extrapolate,
+        spline.axis,
+        spline.x,
+        spline.c,
+    ])
+
+
+@to_packable.register(Curve)
+def _curve_to_packable(curve):
+    return _ext(ExtType.CURVE, curve.splines)
+
+
+@to_packable.register(enum.Enum)
+def _enum_to_packable(enum_):
+    enumType = type(enum_)
+    name = _enum_type_qualname(enumType)
+    if ENUM_LOOKUP.get(name) is not enumType:
+        raise TypeError(f'Enum {enumType.__name__} is not registered!')
+
+    return _ext(ExtType.ENUM, [name, enum_.value])
+
+
+@to_packable.register(set)
+@to_packable.register(frozenset)
+def _set_to_packable(set_):
+    return _ext(ExtType.SET, list(set_))
+
+
+def _default(obj):
+    """Packer default hook. Gets called for all non-native types (including
+    subclasses of native ones).
+    """
+    if _is_registered_named_tuple(obj):
+        return _ext(ExtType.NAMED_TUPLE, [type(obj).__name__, obj._asdict()])
+
+    return to_packable(obj)
+
+
+def _ext_hook(code: int, data: bytes):
+    """Unpacker extension type hook."""
+    payload = unpackb(data)
+    if code == ExtType.NDARRAY:
+        dtype, shape, raw = payload
+        return np.frombuffer(raw, dtype).reshape(shape).copy()
+
+    if code == ExtType.SPLINE:
+        typeName, extrapolate, axis, x, c = payload
+        if typeName not in SPLINE_LOOKUP:
+            raise ValueError(f'Spline type {typeName} not supported!')
+
+        return SPLINE_LOOKUP[typeName](c=c, x=x, extrapolate=extrapolate, axis=axis)
+
+    if code == ExtType.CURVE:
+        return Curve(splines=payload)
+
+    if code == ExtType.ENUM:
+        name, value = payload
+        return enum_from_dict({'type': name, 'value': value})
+
+    if code == ExtType.NAMED_TUPLE:
+        name, fields = payload
+        return named_tuple_from_dict({'type': name, **fields})
+
+    if code == ExtType.SET:
+        return set(payload)
+
+    return msgpack.ExtType(code, data)
+
+
+def packb(obj) -> bytes:
+    """Serialize being object to MessagePack bytes."""
+    if msgpack is None:
+        raise RuntimeError('msgpack is not installed!')
+
+    return msgpack.packb(obj, default=_default, strict_types=True, use_bin_type=True)
+
+
+def unpackb(data: bytes):
+    """Deserialize being object from MessagePack bytes."""
+    if msgpack is None:
+        raise RuntimeError('msgpack is not installed!')
+
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+MSGPACK_CODEC = Codec(dumps=packb, loads=unpackb, binary=True, extension='.msgpack')
+"""MessagePack codec."""
@@ -3,13 +3,25 @@ import pkgutil
 import contextlib
 import io
 import os
+from typing import Optional
 
 from canopen import Network, ObjectDictionary
 from canopen.sdo import SdoClient, SdoCommunicationError, SdoAbortedError
 from canopen.objectdictionary.eds import import_eds
 
 from being.can.definitions import FunctionCode, STORE_EDS
-from being.can.cia_301 import DEVICE_TYPE
+from being.can.cia_301 import (
+    DEVICE_TYPE,
+    IDENTITY_OBJECT,
+    PRODUCT_CODE,
+    REVISION_NUMBER,
+    VENDOR_ID,
+)
+from being.can.od_cache import (
+    OBJECT_DICTIONARY_CACHE,
+    DeviceIdentity,
+    ObjectDictionaryCache,
+)
 
 
 SUPPORTED_DEVICE_TYPES = {
@@ -49,7 +61,7 @@ def sdo_client(network: Network, nodeId: int, od=None):
         yield client
 
     finally:
-        network.unsubscribe(txCob)
+        network.unsubscribe(txCob, client.on_response)
 
 
 def _load_local_eds(deviceType: bytes) -> io.StringIO:
@@ -66,17 +78,44 @@ def _load_local_eds(deviceType: bytes) -> io.StringIO:
     return io.StringIO(data.decode())
 
 
-def load_object_dictionary(network, nodeId: int) -> ObjectDictionary:
+def read_device_identity(client: SdoClient, deviceType: bytes) -> DeviceIdentity:
+    """Read device identity of node. Missing entries of the identity object are
+    zero.
+
+    Args:
+        client: SDO client for node.
+        deviceType: Already read raw device type.
+
+    Returns:
+        Device identity.
+    """
+    values = [int.from_bytes(deviceType, 'little')]
+    for subindex in [VENDOR_ID, PRODUCT_CODE, REVISION_NUMBER]:
+        try:
+            raw = client.upload(IDENTITY_OBJECT, subindex)
+            values.append(int.from_bytes(raw, 'little'))
+        except SdoAbortedError:
+            values.append(0)
+
+    return DeviceIdentity(*values)
+
+
+def load_object_dictionary(network, nodeId: int, cache: Optional[ObjectDictionaryCache] = None) -> ObjectDictionary:
     """Get object dictionary for node. Ping node, try to download EDS from it,
-    see if we have a fallback. RuntimeError otherwise.
+    see if we have a fallback. RuntimeError otherwise. Local EDS files get
+    parsed only once per device identity (see :mod:`being.can.od_cache`).
 
     Args:
         network (Network / CanBackend): Connected CAN network.
         nodeId: Node ID to load object dictionary for.
+        cache (optional): Object dictionary cache. Default cache if omitted.
 
     Returns:
         Object dictionary for node.
     """
+    if cache is None:
+        cache = OBJECT_DICTIONARY_CACHE
+
     with sdo_client(network, nodeId) as client:
         # Ping node
         try:
@@ -93,7 +132,8 @@ def load_object_dictionary(network, nodeId: int) -> ObjectDictionary:
 
         # Try to load local object dictionary
         if deviceType in SUPPORTED_DEVICE_TYPES:
-            filelike = _load_local_eds(deviceType)
-            return import_eds(filelike, nodeId)
+            identity = read_device_identity(client, deviceType)
+            edsData = _load_local_eds(deviceType).getvalue()
+            return cache.object_dictionary(identity, edsData, nodeId)
 
     raise RuntimeError(f'Unknown CANopen node {nodeId}. Could not load object dictionary!')
@@ -0,0 +1,363 @@
+"""Non-blocking SDO client.
+
+The SDO client of canopen blocks the calling thread until the response of the
+remote node arrives. This takes a couple of milliseconds per transfer (up to
+the response timeout) and stalls the whole main cycle. :class:`AsyncSdoClient`
+queues SDO requests per node and drives them from the CAN receive thread. Only
+one request per node is in flight at any time. Every request returns a
+:class:`SdoFuture` which can be polled or waited on from inside a generator
+job.
+
+Only expedited transfers (up to 4 bytes) are supported. This covers all the
+numeric objects which get accessed during operation. Use the blocking client
+for strings and domains.
+
+Both clients talk to the same SDO server of the node which can only handle one
+transfer at a time. :class:`LockedSdoClient` is a drop-in replacement for the
+blocking client of canopen which holds a per node transfer lock for every
+upload / download. The async client holds the very same lock from request until
+response (or timeout). If the lock is taken, requests stay queued and get sent
+once the blocking transfer has finished.
+
+Example:
+    >>> # Fire and forget
+    ... node.asyncSdo.write(TARGET_POSITION, 1000)
+
+    >>> # Inside a generator job
+    ... current = yield from node.asyncSdo.read('Current Actual Value').wait()
+"""
+import collections
+import concurrent.futures
+import contextlib
+import struct
+import threading
+import time
+from typing import Any, Deque, Generator, Optional, Union
+
+from canopen import RemoteNode
+from canopen.objectdictionary import ODVariable
+from canopen.sdo import SdoAbortedError, SdoClient, SdoCommunicationError
+from canopen.sdo.constants import (
+    EXPEDITED,
+    REQUEST_ABORTED,
+    REQUEST_DOWNLOAD,
+    REQUEST_UPLOAD,
+    RESPONSE_ABORTED,
+    RESPONSE_DOWNLOAD,
+    RESPONSE_UPLOAD,
+    SDO_STRUCT,
+    SIZE_SPECIFIED,
+)
+
+from being.logging import get_logger
+
+
+MAX_EXPEDITED_SIZE = 4
+"""Maximum number of data bytes of an expedited transfer."""
+
+UNKNOWN_COMMAND = 0x05040001
+"""SDO abort code for unknown SDO command specifier."""
+
+LOGGER = get_logger(name=__name__, parent=None)
+
+Address = Union[int, str]
+"""Index / subindex or name of an object."""
+
+
+def is_segmented_upload(command: int) -> bool:
+    """Check if response initiates a segmented upload."""
+    return command & 0xE0 == RESPONSE_UPLOAD and not command & EXPEDITED
+
+
+class SdoFuture(concurrent.futures.Future):
+
+    """Future of a single SDO request."""
+
+    def __init__(self, client: 'AsyncSdoClient'):
+        """Args:
+            client: Owning async SDO client.
+        """
+        super().__init__()
+        self.client = client
+
+    def wait(self) -> Generator[None, None, Any]:
+        """Wait for the response inside a generator job. Yields until the
+        request is resolved.
+
+        Returns:
+            Result of the request.
+
+        Raises:
+            SdoError: If the node aborted the transfer or did not respond.
+        """
+        while not self.done():
+            self.client.check_timeout()
+            yield
+
+        return self.result()
+
+
+class Request:
+
+    """Queued SDO request."""
+
+    def __init__(self, var: ODVariable, data: Optional[bytes], future: SdoFuture):
+        """Args:
+            var: Object dictionary variable.
+            data: Data to download. None for uploads.
+            future: Future of the request.
+        """
+        self.var = var
+        self.data = data
+        self.future = future
+        self.deadline = -1
+
+    @property
+    def upload(self) -> bool:
+        """Upload (read) request."""
+        return self.data is None
+
+    def frame(self) -> bytearray:
+        """Request frame data."""
+        request = bytearray(8)
+        if self.upload:
+            command = REQUEST_UPLOAD
+        else:
+            size = len(self.data)
+            command = REQUEST_DOWNLOAD | EXPEDITED | SIZE_SPECIFIED | ((MAX_EXPEDITED_SIZE - size) << 2)
+            request[4:4 + size] = self.data
+
+        SDO_STRUCT.pack_into(request, 0, command, self.var.index, self.var.subindex)
+        return request
+
+
+class LockedSdoClient(SdoClient):
+
+    """Blocking SDO client which serializes its transfers with the
+    :class:`AsyncSdoClient` of the same node. Only :meth:`upload` and
+    :meth:`download` are guarded (this covers all variable accesses). Streams
+    opened directly via :meth:`open` are not.
+
+    Attributes:
+        transferLock: Held for the whole duration of a transfer.
+        asyncClient: Attached async SDO client (if any).
+    """
+
+    def __init__(self, rx_cobid, tx_cobid, od):
+        super().__init__(rx_cobid, tx_cobid, od)
+        self.transferLock = threading.Lock()
+        self.asyncClient: Optional['AsyncSdoClient'] = None
+
+    @contextlib.contextmanager
+    def transfer(self):
+        """Acquire transfer lock for a blocking transfer. Keeps an eye on the
+        in-flight async request in the meantime and resumes the async client
+        afterwards.
+        """
+        while not self.transferLock.acquire(timeout=.01):
+            if self.asyncClient is not None:
+                self.asyncClient.check_timeout()
+
+        try:
+            yield
+        finally:
+            self.transferLock.release()
+            if self.asyncClient is not None:
+                self.asyncClient.resume()
+
+    def upload(self, index: int, subindex: int) -> bytes:
+        with self.transfer():
+            return super().upload(index, subindex)
+
+    def download(self, index: int, subindex: int, data: bytes, force_segment: bool = False):
+        with self.transfer():
+            return super().download(index, subindex, data, force_segment)
+
+
+class AsyncSdoClient:
+
+    """Non-blocking SDO client of a node. Takes over the SDO response
+    subscription of the regular blocking SDO client of the node. Responses
+    which do not belong to the in-flight request get forwarded to it so that
+    both clients can be used side by side. Transfers get serialized with a
+    :class:`LockedSdoClient`. For any other blocking client the async client
+    has to be used exclusively.
+    """
+
+    def __init__(self, node: RemoteNode, timeout: float = SdoClient.RESPONSE_TIMEOUT):
+        """Args:
+            node: Remote node. Has to be connected to a network.
+            timeout (optional): Response timeout in seconds.
+        """
+        self.node = node
+        self.timeout = timeout
+        self.sdo = node.sdo
+        self.network = node.sdo.network
+        self.pending: Deque[Request] = collections.deque()
+        self.current: Optional[Request] = None
+        self.lock = threading.Lock()
+        if isinstance(self.sdo, LockedSdoClient):
+            self.transferLock = self.sdo.transferLock
+            self.sdo.asyncClient = self
+        else:
+            self.transferLock = threading.Lock()
+
+        self.network.unsubscribe(self.sdo.tx_cobid, self.sdo.on_response)
+        self.network.subscribe(self.sdo.tx_cobid, self.on_response)
+
+    def lookup(self, index: Address, subindex: Address = 0) -> ODVariable:
+        """Look up object dictionary variable."""
+        obj = self.node.object_dictionary[index]
+        if isinstance(obj, ODVariable):
+            return obj
+
+        return obj[subindex]
+
+    def read(self, index: Address, subindex: Address = 0) -> SdoFuture:
+        """Read value of object.
+
+        Args:
+            index: Index or name of object.
+            subindex (optional): Subindex or name of sub-object for arrays and
+                records.
+
+        Returns:
+            Future of the decoded value.
+        """
+        var = self.lookup(index, subindex)
+        return self.submit(Request(var, None, SdoFuture(self)))
+
+    def write(self, index: Address, value: Any, subindex: Address = 0) -> SdoFuture:
+        """Write value to object.
+
+        Args:
+            index: Index or name of object.
+            value: Value to write.
+            subindex (optional): Subindex or name of sub-object for arrays and
+                records.
+
+        Returns:
+            Future which resolves to None once the node acknowledged the write.
+        """
+        var = self.lookup(index, subindex)
+        data = var.encode_raw(value)
+        if len(data) > MAX_EXPEDITED_SIZE:
+            raise ValueError(f'{var.name!r} does not fit into an expedited transfer')
+
+        return self.submit(Request(var, data, SdoFuture(self)))
+
+    def submit(self, request: Request) -> SdoFuture:
+        """Queue request and send it right away if nothing is in flight."""
+        self.check_timeout()
+        with self.lock:
+            self.pending.append(request)
+            if self.current is None:
+                self.send_next()
+
+        return request.future
+
+    def resume(self):
+        """Send next pending request if nothing is in flight. Called after a
+        blocking transfer.
+        """
+        with self.lock:
+            if self.current is None:
+                self.send_next()
+
+    def finish_current(self):
+        """Clear in-flight request and release the SDO channel. Caller has to
+        hold the lock.
+        """
+        self.current = None
+        self.transferLock.release()
+
+    def send_next(self):
+        """Send next pending request. Caller has to hold the lock and nothing
+        must be in flight. Stays pending if a blocking transfer is ongoing.
+        """
+        while self.pending:
+            if not self.transferLock.acquire(blocking=False):
+                return
+
+            request = self.pending.popleft()
+            if not request.future.set_running_or_notify_cancel():
+                self.transferLock.release()
+                continue
+
+            request.deadline = time.perf_counter() + self.timeout
+            self.current = request
+            try:
+                self.network.send_message(self.sdo.rx_cobid, request.frame())
+                return
+            except Exception as err:
+                self.finish_current()
+                request.future.set_exception(err)
+
+    def check_timeout(self):
+        """Fail in-flight request if its response did not arrive in time."""
+        with self.lock:
+            request = self.current
+            if request is None or time.perf_counter() < request.deadline:
+                return
+
+            self.finish_current()
+            self.send_next()
+
+        LOGGER.warning('No SDO response from node %d for %r', self.node.id, request.var.name)
+        request.future.set_exception(SdoCommunicationError('No SDO response received'))
+
+    def pending_requests(self) -> int:
+        """Number of unresolved requests (including the one in flight)."""
+        with self.lock:
+            return len(self.pending) + (self.current is not None)
+
+    def resolve(self, request: Request, command: int, data: bytes):
+        """Resolve request with response frame."""
+        specifier = command & 0xE0
+        if specifier == RESPONSE_ABORTED:
+            code, = struct.unpack_from('<L', data, 4)
+            request.future.set_exception(SdoAbortedError(code))
+        elif request.upload and specifier == RESPONSE_UPLOAD:
+            if is_segmented_upload(command):
+                request.future.set_exception(SdoCommunicationError(
+                    f'Segmented transfer of {request.var.name!r} is not supported'
+                ))
+                return
+
+            size = MAX_EXPEDITED_SIZE
+            if command & SIZE_SPECIFIED:
+                size -= (command >> 2) & 0x3
+
+            request.future.set_result(request.var.decode_raw(data[4:4 + size]))
+        elif not request.upload and specifier == RESPONSE_DOWNLOAD:
+            request.future.set_result(None)
+        else:
+            request.future.set_exception(SdoCommunicationError(
+                f'Unexpected SDO response 0x{command:02X} for {request.var.name!r}'
+            ))
+
+    def abort(self, request: Request, code: int):
+        """Abort transfer on the node side."""
+        frame = bytearray(8)
+        SDO_STRUCT.pack_into(frame, 0, REQUEST_ABORTED, request.var.index, request.var.subindex)
+        struct.pack_into('<L', frame, 4, code)
+        self.network.send_message(self.sdo.rx_cobid, frame)
+
+    def on_response(self, canId: int, data: bytes, timestamp: float):
+        """SDO response callback. Called from the CAN receive thread."""
+        command, index, subindex = SDO_STRUCT.unpack_from(data)
+        with self.lock:
+            request = self.current
+            if request is None or (index, subindex) != (request.var.index, request.var.subindex):
+                request = None
+            else:
+                if is_segmented_upload(command):
+                    self.abort(request, UNKNOWN_COMMAND)
+
+                self.finish_current()
+                self.send_next()
+
+        if request is None:
+            self.sdo.on_response(canId, data, timestamp)
+        else:
+            self.resolve(request, command, data)
@@ -7,12 +7,15 @@ operation. Also added support for CYCLIC_SYNCHRONOUS_POSITION mode.
 import collections
 import contextlib
 import enum
+import threading
 import time
 from typing import (
     Any,
+    Callable,
     Dict,
     ForwardRef,
     Generator,
+    Iterable,
     List,
     NamedTuple,
     Optional,
@@ -21,11 +24,16 @@ from typing import (
     Union,
 )
 
+from can import CanError
 from canopen import RemoteNode
+from canopen.sdo.exceptions import SdoError
 
 from being.bitmagic import check_bit
+from being.can.async_sdo import AsyncSdoClient, LockedSdoClient, SdoFuture
 from being.can.cia_301 import MANUFACTURER_DEVICE_NAME
 from being.can.definitions import TransmissionType
+from being.can.pdo import PdoField, pdo_field
+from being.can.settings_sync import maybe_int, sync_settings
 from being.constants import FORWARD, BACKWARD
 from being.logging import get_logger
 
@@ -42,8 +50,10 @@ POSITION_WINDOW = 0x6067
 POSITION_WINDOW_TIME = 0x6068
 VELOCITY_DEMAND_VALUE = 0x606B
 VELOCITY_ACTUAL_VALUE = 0x606C
+CURRENT_ACTUAL_VALUE = 0x6078
 TARGET_POSITION = 0x607A
 POSITION_RANGE_LIMIT = 0x607B
+HOME_OFFSET = 0x607C
 SOFTWARE_POSITION_LIMIT = 0x607D
 MIN_POSITION_LIMIT = 1
 MAX_POSITION_LIMIT = 2
@@ -57,6 +67,10 @@ HOMING_SPEEDS = 0x6099
 SPEED_FOR_SWITCH_SEARCH = 1
 SPEED_FOR_ZERO_SEARCH = 2
 HOMING_ACCELERATION = 0x609A
+VELOCITY_OFFSET = 0x60B1
+INTERPOLATION_TIME_PERIOD = 0x60C2
+INTERPOLATION_TIME_PERIOD_VALUE = 1
+INTERPOLATION_TIME_INDEX = 2
 DIGITAL_INPUTS = 0x60FD
 TARGET_VELOCITY = 0x60FF
 SUPPORTED_DRIVE_MODES = 0x6502
@@ -203,6 +217,15 @@ VALID_OP_MODE_CHANGE_STATES: Set[State] = {
 }
 """Not every state support switching of operation mode."""
 
+MAX_PDO_LENGTH = 64
+"""Maximum payload of a PDO in bits."""
+
+MAX_PDO_ENTRIES = 8
+"""Maximum number of mapped objects per PDO."""
+
+TXPDO_NUMBERS = [1, 2, 3, 4]
+"""Transmission PDOs used for process data."""
+
 STATUSWORD_2_STATE = [
     (0b1001111, 0b0000000, State.NOT_READY_TO_SWITCH_ON),
     (0b1001111, 0b1000000, State.SWITCH_ON_DISABLED),
@@ -375,43 +398,172 @@ def target_reached(statusword: int) -> bool:
     return bool(statusword & SW.TARGET_REACHED)
 
 
-def maybe_int(string: str) -> Union[int, str]:
-    """Try to cast string to int.
+WHERE_TO_GO_NEXT: Dict[Edge, State] = {}
+"""Lookup for the next intermediate state for a given state transition."""
+
+for _src in State:
+    for _dst in State:
+        _shortest = find_shortest_state_path(_src, _dst)
+        if _shortest:
+            WHERE_TO_GO_NEXT[(_src, _dst)] = _shortest[1]
+
+
+STATE_POLLING_INTERVAL: float = 0.010
+"""Maximum wait in seconds between two steps when blocking on state switching
+jobs. Jobs get stepped earlier when a statusword arrives.
+"""
+
+
+class StateNotifier:
+
+    """Wakes up threads which block on state switching jobs. Gets notified from
+    the CAN receive thread whenever a statusword arrives (SDO response or
+    changed TxPDO value).
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+        """Number of notifications so far."""
+
+    def notify(self):
+        """Wake up all waiting threads."""
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation: int, timeout: float) -> bool:
+        """Wait for the next notification.
+
+        Args:
+            generation: Last seen generation. Returns immediately if there
+                were notifications since then.
+            timeout: Timeout in seconds.
+
+        Returns:
+            False if the timeout expired.
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: self.generation != generation, timeout)
+
+
+STATE_NOTIFIER = StateNotifier()
+"""Global state notifier for all nodes."""
+
+
+def drive_state_switching_jobs(
+        jobs: Iterable[StateSwitching],
+        interval: float = STATE_POLLING_INTERVAL,
+    ) -> List[State]:
+    """Drive multiple state switching jobs in lock step until all of them are
+    done. Blocking. All nodes share the same wait which ends as soon as a
+    statusword arrives.
 
     Args:
-        string: Input string.
+        jobs: State switching jobs.
+        interval (optional): Maximum wait in seconds between two steps.
 
     Returns:
-        Maybe an int. Pass on input string otherwise.
+        Final states of each job.
+    """
+    jobs = list(jobs)
+    states = [None] * len(jobs)
+    pending = set(range(len(jobs)))
+    while True:
+        generation = STATE_NOTIFIER.generation
+        for nr in sorted(pending):
+            try:
+                states[nr] = next(jobs[nr])
+            except StopIteration:
+                pending.discard(nr)
+
+        if not pending:
+            return states
+
+        STATE_NOTIFIER.wait(generation, interval)
+
+
+def change_states(
+        nodes: Iterable['CiA402Node'],
+        target: State,
+        how: str = 'sdo',
+        timeout: float = 1.0,
+    ) -> List[State]:
+    """Change multiple nodes to the same target state in parallel. Blocking.
+    Via SDO all nodes have their requests in flight at the same time.
 
-    Example:
-        >>> maybe_int('123')
-        123
+    Args:
+        nodes: CiA 402 nodes.
+        target: Target state to switch to.
+        how (optional): Communication channel. 'sdo' (default) or 'pdo'.
+        timeout (optional): Timeout value in seconds for each node.
 
-        >>> maybe_int('  0x7b')
-        123
+    Returns:
+        Final states of each node.
     """
-    string = string.strip()
-    if string.isnumeric():
-        return int(string)
+    jobs = [node.state_switching_job(target, how, timeout) for node in nodes]
+    return drive_state_switching_jobs(jobs)
+
+
+def try_change_states(
+        nodes: Iterable['CiA402Node'],
+        target: State,
+        how: str = 'sdo',
+        timeout: float = 1.0,
+        tick: Optional[Callable[[], None]] = None,
+        interval: float = STATE_POLLING_INTERVAL,
+    ) -> Dict[int, Optional[State]]:
+    """Change multiple nodes to the same target state in parallel. Blocking.
+    Unlike :func:`change_states` failing nodes do not abort the others. They
+    get logged and keep their last known state.
 
-    if string.startswith('0x'):
-        return int(string, base=16)
+    Args:
+        nodes: CiA 402 nodes.
+        target: Target state to switch to.
+        how (optional): Communication channel. 'sdo' (default) or 'pdo'.
+        timeout (optional): Timeout in seconds. Same deadline for all nodes.
+        tick (optional): Called once per round before waiting (e.g. to send
+            RPDOs and SYNC for PDO communication).
+        interval (optional): Maximum wait in seconds between two steps.
 
-    if string.startswith('0b'):
-        return int(string, base=2)
+    Returns:
+        Node id -> final state (None if unknown).
+    """
+    nodes = list(nodes)
+    deadline = time.perf_counter() + timeout
+    jobs = {node.id: node.state_switching_job(target, how, timeout) for node in nodes}
+    states = dict.fromkeys(jobs)
+    while jobs:
+        generation = STATE_NOTIFIER.generation
+        if time.perf_counter() > deadline:
+            for node in nodes:
+                if node.id in jobs:
+                    node.logger.warning('Could not change to %s in %.3f sec', target.name, timeout)
 
-    return string
+            break
 
+        for node in nodes:
+            job = jobs.get(node.id)
+            if job is None:
+                continue
 
-WHERE_TO_GO_NEXT: Dict[Edge, State] = {}
-"""Lookup for the next intermediate state for a given state transition."""
+            try:
+                states[node.id] = next(job)
+            except StopIteration:
+                del jobs[node.id]
+            except (TimeoutError, SdoError, CanError, OSError) as err:
+                node.logger.warning('Could not change to %s (%s)', target.name, err)
+                del jobs[node.id]
 
-for _src in State:
-    for _dst in State:
-        _shortest = find_shortest_state_path(_src, _dst)
-        if _shortest:
-            WHERE_TO_GO_NEXT[(_src, _dst)] = _shortest[1]
+        if not jobs:
+            break
+
+        if tick is not None:
+            tick()
+
+        STATE_NOTIFIER.wait(generation, interval)
+
+    return states
 
 
 class CiA402Node(RemoteNode):
@@ -427,6 +579,18 @@ class CiA402Node(RemoteNode):
         self.logger = get_logger(str(self))
 
         network.add_node(self, objectDictionary)
+        self.asyncSdo = AsyncSdoClient(self)
+
+        # Direct PDO accessors. See update_pdo_fields()
+        self.pdoFields: Dict[Tuple[int, int], PdoField] = {}
+        self.statuswordField = None
+        self.controlwordField = None
+        self.actualPositionField = None
+        self.targetPositionField = None
+        self.actualVelocityField = None
+        self.targetVelocityField = None
+        self.velocityOffsetField = None
+        self.lastStatusword = None
 
         # Configure PDOs
         self.pdo.read()  # Load both node.tpdo and node.rpdo
@@ -450,6 +614,11 @@ class CiA402Node(RemoteNode):
         self.setup_txpdo(3, VELOCITY_ACTUAL_VALUE)
         self.setup_txpdo(4, enabled=False)
 
+        self.processData = {}
+        for nr in TXPDO_NUMBERS:
+            for var in self.tpdo[nr].map:
+                self.processData[var.index, var.subindex] = var
+
         self.setup_rxpdo(1, CONTROLWORD)
         self.setup_rxpdo(2, TARGET_POSITION)
         self.setup_rxpdo(3, TARGET_VELOCITY)
@@ -459,6 +628,17 @@ class CiA402Node(RemoteNode):
         network.register_rpdo(self.rpdo[2])
         network.register_rpdo(self.rpdo[3])
 
+    def add_sdo(self, rx_cobid, tx_cobid):
+        """Add SDO channel. Blocking transfers get serialized with the ones of
+        :attr:`asyncSdo`.
+        """
+        client = LockedSdoClient(rx_cobid, tx_cobid, self.object_dictionary)
+        self.sdo_channels.append(client)
+        if self.has_network():
+            self.network.subscribe(client.tx_cobid, client.on_response)
+
+        return client
+
     def setup_txpdo(self,
             nr: int,
             *variables: CanOpenRegister,
@@ -494,6 +674,7 @@ class CiA402Node(RemoteNode):
             tx.event_timer = event_timer
 
         tx.save()
+        self.update_pdo_fields()
 
     def setup_rxpdo(self,
             nr: int,
@@ -524,6 +705,142 @@ class CiA402Node(RemoteNode):
         rx.enabled = enabled
         rx.trans_type = trans_type
         rx.save()
+        self.update_pdo_fields()
+
+    def update_pdo_fields(self):
+        """Precompute direct accessors (byte offset and struct) for all mapped
+        PDO objects. Has to be called after every PDO remapping.
+        """
+        fields = {}
+        for pdoMaps in [self.rpdo, self.tpdo]:
+            for pdoMap in pdoMaps.map.values():
+                for var in pdoMap.map:
+                    fields.setdefault((var.index, var.subindex), pdo_field(var))
+
+        self.pdoFields = fields
+        self.statuswordField = fields.get((STATUSWORD, 0))
+        self.controlwordField = fields.get((CONTROLWORD, 0))
+        self.actualPositionField = fields.get((POSITION_ACTUAL_VALUE, 0))
+        self.targetPositionField = fields.get((TARGET_POSITION, 0))
+        self.actualVelocityField = fields.get((VELOCITY_ACTUAL_VALUE, 0))
+        self.targetVelocityField = fields.get((TARGET_VELOCITY, 0))
+        self.velocityOffsetField = fields.get((VELOCITY_OFFSET, 0))
+        for pdoMap in self.tpdo.map.values():
+            mapped = any(var.index == STATUSWORD for var in pdoMap.map)
+            if mapped and self.on_statusword_pdo not in pdoMap.callbacks:
+                pdoMap.add_callback(self.on_statusword_pdo)
+
+    def on_statusword_pdo(self, pdoMap):
+        """TxPDO callback. Notify waiting state switching jobs about changed
+        statuswords. Runs in the CAN receive thread.
+        """
+        statusword = self.statuswordField.raw
+        if statusword != self.lastStatusword:
+            self.lastStatusword = statusword
+            STATE_NOTIFIER.notify()
+
+    def pdo_field(self, key: CanOpenRegister) -> Optional[PdoField]:
+        """Direct accessor of a mapped PDO object (or None if not mapped).
+
+        Args:
+            key: Object index or name.
+
+        Returns:
+            Object with a ``raw`` attribute.
+        """
+        od = self.object_dictionary[key]
+        return self.pdoFields.get((od.index, getattr(od, 'subindex', 0)))
+
+    def add_process_data(self, *variables: CanOpenRegister) -> List[CanOpenRegister]:
+        """Map additional objects into free space of the synchronous TxPDOs.
+        Has to be called before PDO communication gets enabled. Objects which
+        do not fit or are not PDO mappable fall back to SDO access.
+
+        Args:
+            *variables: Objects to receive with every SYNC.
+
+        Returns:
+            Objects which could not be mapped.
+        """
+        unmapped = []
+        changed = set()
+        for key in variables:
+            try:
+                od = self.object_dictionary[key]
+            except KeyError:
+                self.logger.warning('No %r in object dictionary', key)
+                unmapped.append(key)
+                continue
+
+            if not getattr(od, 'pdo_mappable', False):
+                self.logger.info('%r is not PDO mappable. Falling back to SDO', od.name)
+                unmapped.append(key)
+                continue
+
+            if (od.index, od.subindex) in self.processData:
+                continue
+
+            for nr in TXPDO_NUMBERS:
+                tx = self.tpdo[nr]
+                length = sum(len(var.od) for var in tx.map)
+                if length + len(od) <= MAX_PDO_LENGTH and len(tx.map) < MAX_PDO_ENTRIES:
+                    var = tx.add_variable(od.index, od.subindex)
+                    self.processData[od.index, od.subindex] = var
+                    changed.add(nr)
+                    break
+            else:
+                self.logger.info('No free TxPDO space for %r. Falling back to SDO', od.name)
+                unmapped.append(key)
+
+        for nr in sorted(changed):
+            self.logger.debug('Remapping TxPDO%d', nr)
+            tx = self.tpdo[nr]
+            tx.enabled = True
+            tx.trans_type = TransmissionType.SYNCHRONOUS_CYCLIC
+            tx.save()
+
+        if changed:
+            self.update_pdo_fields()
+
+        return unmapped
+
+    def process_variable(self, key: CanOpenRegister):
+        """Get TxPDO variable of mapped object (or None if not mapped)."""
+        od = self.object_dictionary[key]
+        return self.processData.get((od.index, getattr(od, 'subindex', 0)))
+
+    def get_process_value(self, key: CanOpenRegister) -> Any:
+        """Get current value of process data object. From the last received
+        TxPDO if mapped. Blocking SDO read otherwise.
+
+        Args:
+            key: Object index or name.
+
+        Returns:
+            Current value.
+        """
+        var = self.process_variable(key)
+        if var is None:
+            return self.sdo[key].raw
+
+        return var.raw
+
+    def process_value_job(self, key: CanOpenRegister) -> Generator[None, None, Any]:
+        """Non-blocking variant of :meth:`CiA402Node.get_process_value`.
+        Returns immediately if mapped. Yields while waiting for the SDO
+        response otherwise.
+
+        Args:
+            key: Object index or name.
+
+        Returns:
+            Current value.
+        """
+        var = self.process_variable(key)
+        if var is None:
+            return (yield from self.asyncSdo.read(key).wait())
+
+        return var.raw
 
     def get_state(self, how: str = 'sdo') -> State:
         """Get current node state.
@@ -536,7 +853,7 @@ class CiA402Node(RemoteNode):
             Current CiA 402 state.
         """
         if how == 'pdo':
-            return which_state(self.pdo[STATUSWORD].raw)  # This takes approx. 0.027 ms
+            return which_state(self.statuswordField.raw)
         elif how == 'sdo':
             return which_state(self.sdo[STATUSWORD].raw)  # This takes approx. 2.713 ms
         else:
@@ -561,12 +878,91 @@ class CiA402Node(RemoteNode):
 
         cw = TRANSITION_COMMANDS[edge]
         if how == 'pdo':
-            self.pdo[CONTROLWORD].raw = cw
+            self.controlwordField.raw = cw
         elif how == 'sdo':
             self.sdo[CONTROLWORD].raw = cw
         else:
             raise ValueError(f'Unknown how {how!r}')
 
+    def request_statusword(self, how: str = 'sdo') -> Optional[SdoFuture]:
+        """Request the statusword without blocking. Via SDO the request goes
+        out right away and the response notifies :data:`STATE_NOTIFIER`.
+
+        Args:
+            how (optional): Communication channel. 'sdo' (default) or 'pdo'.
+
+        Returns:
+            Future of the statusword. None for 'pdo' (read on arrival).
+        """
+        if how == 'pdo':
+            return None
+        elif how == 'sdo':
+            future = self.asyncSdo.read(STATUSWORD)
+            future.add_done_callback(lambda future: STATE_NOTIFIER.notify())
+            return future
+        else:
+            raise ValueError(f'Unknown how {how!r}')
+
+    def state_job(self,
+            request: Optional[SdoFuture],
+            current: Optional[State] = None,
+        ) -> Generator[Optional[State], None, State]:
+        """Wait for a requested state. Yields the last known state while
+        waiting for the SDO response.
+
+        Args:
+            request: Statusword request from
+                :meth:`CiA402Node.request_statusword`.
+            current (optional): Last known state.
+
+        Returns:
+            Current CiA 402 state.
+
+        Raises:
+            TimeoutError: If the statusword could not be read.
+        """
+        if request is None:
+            return which_state(self.statuswordField.raw)
+
+        while not request.done():
+            self.asyncSdo.check_timeout()
+            yield current
+
+        try:
+            statusword = request.result()
+        except SdoError as err:
+            raise TimeoutError(f'Could not read statusword of node {self.id} ({err})') from err
+
+        return which_state(statusword)
+
+    def send_state_command(self, current: State, target: State, how: str = 'sdo'):
+        """Send controlword for a single state transition without blocking.
+
+        Args:
+            current: Current state.
+            target: Neighboring target state.
+            how (optional): Communication channel. 'sdo' (default) or 'pdo'.
+        """
+        cw = TRANSITION_COMMANDS[current, target]
+        if how == 'pdo':
+            self.controlwordField.raw = cw
+        elif how == 'sdo':
+            future = self.asyncSdo.write(CONTROLWORD, cw)
+            future.add_done_callback(self.log_controlword_failure)
+        else:
+            raise ValueError(f'Unknown how {how!r}')
+
+    def log_controlword_failure(self, future: SdoFuture):
+        """Done callback for fire and forget controlword writes. The state
+        switching job only notices the missing transition later on.
+        """
+        if future.cancelled():
+            return
+
+        err = future.exception()
+        if err is not None:
+            self.logger.error('Could not write controlword (%s)', err)
+
     def state_switching_job(self,
             target: State,
             how: str = 'sdo',
@@ -576,7 +972,7 @@ class CiA402Node(RemoteNode):
         current state during each cycle and steer the state machine towards the
         desired target state (traversing necessary intermediate accordingly).
         Implemented as generator so that multiple nodes can be switched in
-        parallel.
+        parallel. Never blocks, also not via SDO.
 
         Args:
             target: Target state to switch to.
@@ -588,25 +984,31 @@ class CiA402Node(RemoteNode):
         """
         self.logger.debug('state_switching_job(%s, %s, %s)', target, how, timeout)
         endTime = time.perf_counter() + timeout
-        initial = current = self.get_state(how)
+        initial = current = yield from self.state_job(self.request_statusword(how))
         lastPlanned = None
         while True:
+            if current is not target:
+                if time.perf_counter() > endTime:
+                    raise TimeoutError(f'Could not transition from {initial.name} to {target.name} in {timeout:.3f} sec!')
+
+                if current is not lastPlanned:
+                    lastPlanned = current
+                    intermediate = WHERE_TO_GO_NEXT[(current, target)]
+                    self.logger.debug('Setting state to %s (%s)', intermediate, how)
+                    self.send_state_command(current, intermediate, how)
+
+                # Next statusword is already on its way while yielding
+                request = self.request_statusword(how)
+            else:
+                # Do not keep blocking callers waiting for the last step
+                STATE_NOTIFIER.notify()
+
             yield current
 
             if current is target:
                 return
 
-            #self.logger.debug('Still in %s (not in %s)', current.name, target.name)
-
-            if time.perf_counter() > endTime:
-                raise TimeoutError(f'Could not transition from {initial.name} to {target.name} in {timeout:.3f} sec!')
-
-            if current is not lastPlanned:
-                lastPlanned = current
-                intermediate = WHERE_TO_GO_NEXT[(current, target)]
-                self.set_state(intermediate, how)
-
-            current = self.get_state(how)
+            current = yield from self.state_job(request, current)
 
     def change_state(self,
             target: State,
@@ -626,18 +1028,20 @@ class CiA402Node(RemoteNode):
         """
         self.logger.debug('change_state(%s, %s, %s)', target, how, timeout)
         job = self.state_switching_job(target, how, timeout)
-        state = None
-        for state in job:
-            time.sleep(0.050)
-
+        state, = drive_state_switching_jobs([job])
         return state
 
     def get_operation_mode(self) -> OperationMode:
-        """Get current operation mode."""
+        """Get current operation mode. Blocking SDO read, not for the main
+        cycle.
+        """
         return OperationMode(self.sdo[MODES_OF_OPERATION_DISPLAY].raw)
 
     def set_operation_mode(self, op: OperationMode):
-        """Set operation mode.
+        """Set operation mode. Blocking SDO transfers. Meant for setting up
+        the node (e.g. when constructing a controller in a bring-up worker
+        thread). Inside the main cycle use
+        :meth:`CiA402Node.operation_mode_switching_job`.
 
         Args:
             op: New target mode of operation.
@@ -658,6 +1062,30 @@ class CiA402Node(RemoteNode):
 
         self.sdo[MODES_OF_OPERATION].raw = op
 
+    def operation_mode_switching_job(self, op: OperationMode) -> Generator[None, None, None]:
+        """Non-blocking variant of :meth:`CiA402Node.set_operation_mode`.
+        Yields while waiting for the SDO responses.
+
+        Args:
+            op: New target mode of operation.
+        """
+        self.logger.debug('Switching to %s', op)
+        current = yield from self.asyncSdo.read(MODES_OF_OPERATION_DISPLAY).wait()
+        if current == op:
+            self.logger.debug('Already %s', op)
+            return
+
+        statusword = yield from self.asyncSdo.read(STATUSWORD).wait()
+        state = which_state(statusword)
+        if state not in VALID_OP_MODE_CHANGE_STATES:
+            raise RuntimeError(f'Can not change to {op} when in {state}')
+
+        sdm = yield from self.asyncSdo.read(SUPPORTED_DRIVE_MODES).wait()
+        if op not in supported_operation_modes(sdm):
+            raise RuntimeError(f'This drive does not support {op!r}!')
+
+        yield from self.asyncSdo.write(MODES_OF_OPERATION, op).wait()
+
     @contextlib.contextmanager
     def restore_states_and_operation_mode(self, how='sdo', timeout: float = 2.0):
         """Restore NMT state, CiA 402 state and operation mode. Implemented as
@@ -713,75 +1141,139 @@ class CiA402Node(RemoteNode):
 
     def set_target_position(self, pos):
         """Set target position in device units."""
-        self.pdo[TARGET_POSITION].raw = pos
+        self.targetPositionField.raw = pos
 
     def get_actual_position(self):
         """Get actual position in device units."""
-        return self.pdo[POSITION_ACTUAL_VALUE].raw
+        return self.actualPositionField.raw
 
     def set_target_velocity(self, vel):
         """Set target velocity in device units."""
-        self.pdo[TARGET_VELOCITY].raw = vel
+        self.targetVelocityField.raw = vel
+
+    def set_velocity_offset(self, vel):
+        """Set velocity offset (feed-forward) in device units."""
+        self.velocityOffsetField.raw = vel
+
+    def enable_velocity_feed_forward(self) -> bool:
+        """Map the velocity offset next to the target position into RxPDO2.
+        For velocity feed-forward in cyclic synchronous position mode.
+
+        Returns:
+            If the drive supports it.
+        """
+        if VELOCITY_OFFSET not in self.object_dictionary:
+            return False
+
+        self.setup_rxpdo(2, TARGET_POSITION, VELOCITY_OFFSET)
+        return True
+
+    def set_interpolation_time_period(self, interval: float) -> bool:
+        """Tell the drive the interval of the cyclic set-points so that it can
+        interpolate in between.
+
+        Args:
+            interval: Set-point interval in seconds.
+
+        Returns:
+            If the drive supports it.
+        """
+        if INTERPOLATION_TIME_PERIOD not in self.object_dictionary:
+            return False
+
+        period = self.sdo[INTERPOLATION_TIME_PERIOD]
+        period[INTERPOLATION_TIME_PERIOD_VALUE].raw = round(interval * 1000)
+        period[INTERPOLATION_TIME_INDEX].raw = -3  # Milliseconds
+        return True
 
     def get_actual_velocity(self):
         """Get actual velocity in device units."""
-        return self.pdo[VELOCITY_ACTUAL_VALUE].raw
+        return self.actualVelocityField.raw
+
+    def write_async(self, index: int, value: Any) -> SdoFuture:
+        """Write value via the asynchronous SDO client. Failures get logged.
+
+        Args:
+            index: Index of object.
+            value: Value to write.
+
+        Returns:
+            Future of the write request.
+        """
+        def log_failure(future):
+            err = None if future.cancelled() else future.exception()
+            if err is not None:
+                self.logger.error('Writing 0x%04X failed (%s)', index, err)
+
+        future = self.asyncSdo.write(index, value)
+        future.add_done_callback(log_failure)
+        return future
 
     def move_to(self,
             position: int,
             velocity: Optional[int] = None,
             acceleration: Optional[int] = None,
             immediately: bool = True,
-        ):
-        """Move to position. For OperationMode.PROFILED_POSITION.
+        ) -> SdoFuture:
+        """Move to position. For OperationMode.PROFILED_POSITION. Does not
+        block. SDO writes get queued.
 
         Args:
             position: Target position.
             velocity: Profile velocity (if any).
             acceleration: Profile acceleration / deceleration (if any).
             immediately: If True overwrite ongoing command.
+
+        Returns:
+            Future of the final controlword write.
         """
         self.logger.debug('move_to(%s, velocity=%s, acceleration=%s)', position, velocity, acceleration)
-        self.sdo[CONTROLWORD].raw = Command.ENABLE_OPERATION
-        self.sdo[TARGET_POSITION].raw = position
+        self.write_async(CONTROLWORD, Command.ENABLE_OPERATION)
+        self.write_async(TARGET_POSITION, position)
         if velocity is not None:
-            self.sdo[PROFILE_VELOCITY].raw = velocity
+            self.write_async(PROFILE_VELOCITY, velocity)
 
         if acceleration is not None:
-            self.sdo[PROFILE_ACCELERATION].raw = acceleration
-            self.sdo[PROFILE_DECELERATION].raw = acceleration
+            self.write_async(PROFILE_ACCELERATION, acceleration)
+            self.write_async(PROFILE_DECELERATION, acceleration)
 
+        cw = Command.ENABLE_OPERATION | CW.NEW_SET_POINT
         if immediately:
-            self.sdo[CONTROLWORD].raw = Command.ENABLE_OPERATION | CW.NEW_SET_POINT | CW.CHANGE_SET_IMMEDIATELY
-        else:
-            self.sdo[CONTROLWORD].raw = Command.ENABLE_OPERATION | CW.NEW_SET_POINT
+            cw |= CW.CHANGE_SET_IMMEDIATELY
+
+        return self.write_async(CONTROLWORD, cw)
 
     def move_with(self,
             velocity: int,
             acceleration: Optional[int] = None,
             immediately: bool = True,
-        ):
-        """Move with velocity. For OperationMode.PROFILE_VELOCITY.
+        ) -> SdoFuture:
+        """Move with velocity. For OperationMode.PROFILE_VELOCITY. Does not
+        block. SDO writes get queued.
 
         Args:
             velocity: Target velocity.
             acceleration: Profile acceleration / deceleration (if any).
             immediately: If True overwrite ongoing command.
+
+        Returns:
+            Future of the final controlword write.
         """
         self.logger.debug('move_with(%s, acceleration=%s)', velocity, acceleration)
-        self.sdo[CONTROLWORD].raw = Command.ENABLE_OPERATION
-        self.sdo[PROFILE_VELOCITY].raw = velocity
+        self.write_async(CONTROLWORD, Command.ENABLE_OPERATION)
+        self.write_async(PROFILE_VELOCITY, velocity)
         if acceleration is not None:
-            self.sdo[PROFILE_ACCELERATION].raw = acceleration
-            self.sdo[PROFILE_DECELERATION].raw = acceleration
+            self.write_async(PROFILE_ACCELERATION, acceleration)
+            self.write_async(PROFILE_DECELERATION, acceleration)
 
+        cw = Command.ENABLE_OPERATION | CW.NEW_SET_POINT
         if immediately:
-            self.sdo[CONTROLWORD].raw = Command.ENABLE_OPERATION | CW.NEW_SET_POINT | CW.CHANGE_SET_IMMEDIATELY
-        else:
-            self.sdo[CONTROLWORD].raw = Command.ENABLE_OPERATION | CW.NEW_SET_POINT
+            cw |= CW.CHANGE_SET_IMMEDIATELY
+
+        return self.write_async(CONTROLWORD, cw)
 
     def _get_info(self) -> dict:
-        """Get the current states."""
+        """Get the current states. Blocking SDO reads, for debugging only."""
         return {
             'nmt': self.nmt.state,
             'state': self.get_state(),
@@ -792,21 +1284,19 @@ class CiA402Node(RemoteNode):
         """Get manufacturer device name."""
         return self.sdo[MANUFACTURER_DEVICE_NAME].raw
 
-    def apply_settings(self, settings: Dict[str, Any]):
-        """Apply settings to CANopen node.
+    def apply_settings(self, settings: Dict[str, Any], store: bool = False) -> int:
+        """Apply settings to CANopen node. Only changed values get written (see
+        :func:`being.can.settings_sync.sync_settings`).
 
         Args:
             settings: Settings to apply. Addresses (path syntax) -> value
                 entries.
+            store (optional): Store settings in non-volatile memory of node.
+
+        Returns:
+            Number of written settings.
         """
-        for name, value in settings.items():
-            *path, last = map(maybe_int, name.split('/'))
-            sdo = self.sdo
-            for key in path:
-                sdo = sdo[key]
-
-            self.logger.debug('Applying %r = %s', name, value)
-            sdo[last].raw = value
+        return sync_settings(self, settings, store)
 
     def __str__(self):
         return f'{type(self).__name__}(id: {self.id})'
@@ -0,0 +1,193 @@
+"""CAN bus metrics. Bus load, SYNC to TPDO latencies, PDO ages and error
+counters of a :class:`being.backends.CanBackend`.
+
+Counters get updated with very little overhead from the sending threads and
+the CAN receive thread. :meth:`BusMetrics.sample` condenses them into a
+snapshot for the time window since the last sample. The most recent
+snapshots are kept in a ring buffer.
+"""
+import collections
+import time
+from typing import Callable, Deque, Dict, Optional
+
+import can
+
+from being.can.definitions import FunctionCode
+from being.configuration import CONFIG
+
+
+HISTORY_SIZE: int = CONFIG['Can']['METRICS_HISTORY_SIZE']
+"""Number of metric snapshots to keep."""
+
+TPDO_FUNCTION_CODES = {
+    FunctionCode.PDO1tx,
+    FunctionCode.PDO2tx,
+    FunctionCode.PDO3tx,
+    FunctionCode.PDO4tx,
+}
+"""Function codes of transmission PDOs."""
+
+FUNCTION_CODE_MASK = 0x780
+NODE_ID_MASK = 0x7F
+
+
+def frame_bits(dlc: int) -> int:
+    """Worst case number of bits on the wire of a standard CAN frame with
+    bit stuffing.
+
+    Args:
+        dlc: Number of data bytes.
+
+    Returns:
+        Number of bits.
+    """
+    stuffable = 34 + 8 * dlc  # SOF, arbitration, control, data and CRC fields
+    return stuffable + (stuffable - 1) // 4 + 13  # CRC delimiter, ACK, EOF, IFS
+
+
+FRAME_BITS = [frame_bits(dlc) for dlc in range(9)]
+"""Lookup of frame bits by DLC."""
+
+
+class NodeMetrics:
+
+    """Metrics of a single node."""
+
+    __slots__ = ('lastTpdo', 'answered', 'latency', 'maxLatency', 'latencySum', 'latencyCount', 'emergencies')
+
+    def __init__(self):
+        self.lastTpdo = None
+        self.answered = False
+        self.latency = None
+        self.maxLatency = 0.
+        self.latencySum = 0.
+        self.latencyCount = 0
+        self.emergencies = 0
+
+
+class BusMetrics(can.Listener):
+
+    """Metrics of a single CAN bus. Listens for received frames. Sent frames,
+    SYNC messages, send errors and pacemaker interventions get reported by the
+    network.
+    """
+
+    def __init__(self,
+            bitrate: int,
+            historySize: int = HISTORY_SIZE,
+            clock: Callable[[], float] = time.perf_counter,
+        ):
+        """Args:
+            bitrate: Bit rate of CAN bus.
+            historySize (optional): Number of snapshots to keep.
+            clock (optional): Time function.
+        """
+        self.bitrate = bitrate
+        self.clock = clock
+        self.history: Deque[dict] = collections.deque(maxlen=historySize)
+        self.nodes: Dict[int, NodeMetrics] = collections.defaultdict(NodeMetrics)
+        self.lastSync: Optional[float] = None
+        self.lastSample = clock()
+
+        # Counters of current window
+        self.rxFrames = 0
+        self.txFrames = 0
+        self.bits = 0
+        self.syncs = 0
+        self.sendErrors = 0
+        self.pacemakerInterventions = 0
+
+        # Totals
+        self.totalSendErrors = 0
+        self.totalPacemakerInterventions = 0
+
+    def on_message_received(self, msg: can.Message):
+        """Listener callback. Called from the CAN receive thread."""
+        self.rxFrames += 1
+        self.bits += FRAME_BITS[min(msg.dlc, 8)]
+        canId = msg.arbitration_id
+        nodeId = canId & NODE_ID_MASK
+        code = canId & FUNCTION_CODE_MASK
+        if code in TPDO_FUNCTION_CODES:
+            now = self.clock()
+            node = self.nodes[nodeId]
+            node.lastTpdo = now
+            if not node.answered and self.lastSync is not None:
+                node.answered = True
+                latency = now - self.lastSync
+                node.latency = latency
+                node.maxLatency = max(node.maxLatency, latency)
+                node.latencySum += latency
+                node.latencyCount += 1
+
+        elif code == FunctionCode.EMERGENCY and nodeId:
+            self.nodes[nodeId].emergencies += 1
+
+    def sync_sent(self):
+        """SYNC message went out. Starts latency measurement."""
+        self.lastSync = self.clock()
+        self.syncs += 1
+        self.txFrames += 1
+        self.bits += FRAME_BITS[0]
+        for node in self.nodes.values():
+            node.answered = False
+
+    def frame_sent(self, dlc: int):
+        """Single frame went out."""
+        self.txFrames += 1
+        self.bits += FRAME_BITS[min(dlc, 8)]
+
+    def send_failed(self):
+        """Sending a frame failed (e.g. ENOBUFS of a full send queue)."""
+        self.sendErrors += 1
+        self.totalSendErrors += 1
+
+    def pacemaker_stepped_in(self):
+        """Pacemaker had to send SYNC / RPDOs because the main cycle was late."""
+        self.pacemakerInterventions += 1
+        self.totalPacemakerInterventions += 1
+
+    def sample(self) -> dict:
+        """Take snapshot of the current window and start a new one.
+
+        Returns:
+            Snapshot. Also appended to history.
+        """
+        now = self.clock()
+        duration = max(now - self.lastSample, 1e-9)
+        nodes = []
+        for nodeId, node in sorted(self.nodes.items()):
+            meanLatency = None
+            if node.latencyCount:
+                meanLatency = node.latencySum / node.latencyCount
+
+            nodes.append({
+                'nodeId': nodeId,
+                'latency': node.latency,
+                'meanLatency': meanLatency,
+                'maxLatency': node.maxLatency if node.latencyCount else None,
+                'pdoAge': None if node.lastTpdo is None else now - node.lastTpdo,
+                'emergencies': node.emergencies,
+            })
+            node.maxLatency = node.latencySum = 0.
+            node.latencyCount = 0
+
+        snapshot = {
+            'timestamp': time.time(),
+            'duration': duration,
+            'rxFrameRate': self.rxFrames / duration,
+            'txFrameRate': self.txFrames / duration,
+            'syncRate': self.syncs / duration,
+            'busLoad': self.bits / duration / self.bitrate,
+            'sendErrors': self.sendErrors,
+            'totalSendErrors': self.totalSendErrors,
+            'pacemakerInterventions': self.pacemakerInterventions,
+            'totalPacemakerInterventions': self.totalPacemakerInterventions,
+            'nodes': nodes,
+        }
+        self.history.append(snapshot)
+
+        self.lastSample = now
+        self.rxFrames = self.txFrames = self.bits = self.syncs = 0
+        self.sendErrors = self.pacemakerInterventions = 0
+        return snapshot
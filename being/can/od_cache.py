@@ -0,0 +1,186 @@
+"""Cache for parsed object dictionaries.
+
+Parsing an EDS file with :func:`canopen.objectdictionary.eds.import_eds` takes
+a considerable amount of time (especially on a Raspberry Pi) and has to be
+done for every node. Nodes of the same kind share the same object dictionary
+except for the node id dependent default values (COB-IDs). Therefore EDS files
+only get parsed once per device identity into a node id agnostic template.
+The pickled templates are kept in memory and on disk. A new object dictionary
+for a given node id is then unpickled from the template and relabeled.
+
+Cache files are keyed by device identity and the hash of the EDS content.
+Changing the EDS file invalidates the cached template.
+"""
+import hashlib
+import io
+import os
+import pickle
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from canopen import ObjectDictionary
+from canopen.objectdictionary import ODVariable
+from canopen.objectdictionary.eds import import_eds
+
+from being.configuration import CONFIG
+from being.logging import get_logger
+
+
+DIRECTORY: Optional[str] = CONFIG['Can']['OD_CACHE_DIRECTORY']
+"""Default cache directory. No on-disk caching if None.
+
+Warning:
+    Cached templates get unpickled. Unpickling can execute arbitrary code.
+    Anybody who can write to this directory can run code as the being user.
+    Use a directory which only that user can write to.
+"""
+
+TEMPLATE_NODE_ID = 0
+"""Node id of the object dictionary templates."""
+
+LOGGER = get_logger(name=__name__, parent=None)
+
+
+class DeviceIdentity(NamedTuple):
+
+    """CANopen device identity. Device type (0x1000) and identity object
+    (0x1018).
+    """
+
+    deviceType: int
+    vendorId: int = 0
+    productCode: int = 0
+    revisionNumber: int = 0
+
+
+def eds_hash(edsData: str) -> str:
+    """Short hash of EDS content."""
+    return hashlib.sha1(edsData.encode()).hexdigest()[:16]
+
+
+def cache_filename(identity: DeviceIdentity, edsHash: str) -> str:
+    """Cache filename for device identity and EDS hash."""
+    prefix = '_'.join(f'{value:08x}' for value in identity)
+    return f'{prefix}_{edsHash}.pickle'
+
+
+def relabel(od: ObjectDictionary, nodeId: int):
+    """Relabel object dictionary template to a given node id. Node id relative
+    default values (``$NODEID`` in EDS) get shifted by the node id. Inplace.
+
+    Args:
+        od: Object dictionary template (node id 0).
+        nodeId: New node id.
+    """
+    if od.node_id is not None:
+        od.node_id = nodeId
+
+    for obj in od.values():
+        variables = [obj] if isinstance(obj, ODVariable) else obj.values()
+        for var in variables:
+            if var.relative and var.default is not None:
+                var.default += nodeId
+
+            if var.value is not None and '$NODEID' in getattr(var, 'value_raw', '').upper():
+                var.value += nodeId
+
+
+class ObjectDictionaryCache:
+
+    """Parsed object dictionary templates. In memory and optionally on disk."""
+
+    def __init__(self, directory: Optional[str] = DIRECTORY):
+        """Args:
+            directory (optional): Cache directory. Only in memory caching if
+                None.
+        """
+        if directory is not None:
+            directory = os.path.expanduser(directory)
+
+        self.directory = directory
+        self.templates: Dict[tuple, bytes] = {}
+        self.lock = threading.Lock()
+
+    def load_template(self, fp: str) -> Optional[bytes]:
+        """Load pickled template from disk."""
+        try:
+            with open(fp, 'rb') as f:
+                data = f.read()
+
+            pickle.loads(data)  # Validate
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            LOGGER.warning('Could not load cached object dictionary %r (%s)', fp, err)
+            return None
+
+    def save_template(self, fp: str, data: bytes):
+        """Save pickled template to disk and remove outdated ones for the same
+        device identity.
+        """
+        prefix = os.path.basename(fp).rsplit('_', maxsplit=1)[0]
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for fn in os.listdir(self.directory):
+                if fn.startswith(prefix + '_'):
+                    os.remove(os.path.join(self.directory, fn))
+
+            tmp = fp + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+
+            os.replace(tmp, fp)
+        except OSError as err:
+            LOGGER.warning('Could not cache object dictionary %r (%s)', fp, err)
+
+    def template(self, identity: DeviceIdentity, edsData: str) -> bytes:
+        """Get pickled object dictionary template. Parse EDS if not cached.
+
+        Args:
+            identity: Device identity.
+            edsData: EDS file content.
+
+        Returns:
+            Pickled object dictionary for node id 0.
+        """
+        edsHash = eds_hash(edsData)
+        key = (identity, edsHash)
+        with self.lock:
+            if key in self.templates:
+                return self.templates[key]
+
+            fp = None
+            data = None
+            if self.directory is not None:
+                fp = os.path.join(self.directory, cache_filename(identity, edsHash))
+                data = self.load_template(fp)
+
+            if data is None:
+                LOGGER.info('Parsing EDS for %s', identity)
+                od = import_eds(io.StringIO(edsData), TEMPLATE_NODE_ID)
+                data = pickle.dumps(od, protocol=pickle.HIGHEST_PROTOCOL)
+                if fp is not None:
+                    self.save_template(fp, data)
+
+            self.templates[key] = data
+            return data
+
+    def object_dictionary(self, identity: DeviceIdentity, edsData: str, nodeId: int) -> ObjectDictionary:
+        """Get object dictionary for a node.
+
+        Args:
+            identity: Device identity.
+            edsData: EDS file content.
+            nodeId: Node id.
+
+        Returns:
+            New object dictionary instance.
+        """
+        od = pickle.loads(self.template(identity, edsData))
+        relabel(od, nodeId)
+        return od
+
+
+OBJECT_DICTIONARY_CACHE = ObjectDictionaryCache()
+"""Default object dictionary cache."""
@@ -0,0 +1,96 @@
+"""Direct PDO byte access. Precomputed byte offsets and structs for mapped PDO
+variables. Bypasses the name lookups and the encode / decode machinery of the
+canopen variables on the hot path.
+"""
+import struct
+from typing import Union
+
+from canopen.pdo.base import PdoVariable
+
+
+def pdo_struct(var: PdoVariable) -> struct.Struct:
+    """Struct for a byte aligned PDO variable.
+
+    Args:
+        var: PDO variable.
+
+    Returns:
+        Struct of the data type.
+
+    Raises:
+        ValueError: If the variable is not byte aligned.
+    """
+    if var.offset is None or var.offset % 8 or var.length % 8:
+        raise ValueError(f'PDO variable {var.name} is not byte aligned')
+
+    try:
+        return var.od.STRUCT_TYPES[var.od.data_type]
+    except KeyError:
+        raise ValueError(f'PDO variable {var.name} has no fixed size data type') from None
+
+
+class PdoField:
+
+    """Direct byte access to a byte aligned PDO variable. Drop-in for the
+    ``raw`` attribute of canopen PDO variables. Reads from / writes into the
+    current data of the PDO map.
+
+    Attributes:
+        map (canopen.pdo.base.PdoMap): PDO map of the variable.
+        offset (int): Byte offset inside the PDO map data.
+        struct (struct.Struct): Data type struct.
+        cast (type): int or float.
+        name (str): Variable name.
+    """
+
+    __slots__ = ('map', 'offset', 'struct', 'cast', 'name')
+
+    def __init__(self, var: PdoVariable):
+        """Args:
+            var: Mapped PDO variable.
+        """
+        self.struct = pdo_struct(var)
+        self.map = var.pdo_parent
+        self.offset = var.offset >> 3
+        self.cast = float if self.struct.format[-1] in 'fd' else int
+        self.name = var.name
+
+    @property
+    def raw(self) -> Union[int, float]:
+        """Raw value."""
+        return self.struct.unpack_from(self.map.data, self.offset)[0]
+
+    @raw.setter
+    def raw(self, value: Union[int, float]):
+        try:
+            self.struct.pack_into(self.map.data, self.offset, self.cast(value))
+        except struct.error:
+            raise ValueError(f'Value {value} does not fit into {self.name}') from None
+
+    def pack_into(self, buffer: bytearray, value: Union[int, float]):
+        """Write value into another buffer with the layout of the PDO map data
+        (e.g. a staged copy).
+        """
+        try:
+            self.struct.pack_into(buffer, self.offset, self.cast(value))
+        except struct.error:
+            raise ValueError(f'Value {value} does not fit into {self.name}') from None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.name!r}, offset={self.offset})'
+
+
+def pdo_field(var: PdoVariable) -> Union[PdoField, PdoVariable]:
+    """Direct accessor for a PDO variable. Falls back to the canopen variable
+    itself for variables which are not byte aligned.
+
+    Args:
+        var: Mapped PDO variable.
+
+    Returns:
+        Object with a ``raw`` attribute.
+    """
+    try:
+        return PdoField(var)
+    except ValueError:
+        return var
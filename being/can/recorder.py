@@ -0,0 +1,314 @@
+"""CAN traffic recorder and replay.
+
+:class:`CanRecorder` captures all received and sent frames of a
+:class:`being.backends.CanBackend` into a memory-mapped ring file. Recording
+only appends to an in-memory queue. A background thread writes the frames to
+the file so that the main cycle never waits for disk I/O. The ring file always
+holds the most recent frames and survives a crash of the process.
+
+Ring file layout (little endian). A header followed by fixed size records.
+
+- Header: magic (8 bytes), version (uint32), record size (uint32), total
+  number of written records (uint64).
+- Record: timestamp (double), arbitration id (uint32), flags (uint8), DLC
+  (uint8), padding (2 bytes), data (8 bytes).
+
+Recordings can be exported to the ``.blf`` / ``.asc`` formats of python-can
+(:func:`export_recording`) and replayed offline with :class:`CanReplay`.
+
+Example:
+    >>> with CanRecorder(network, 'show.canrec'):
+    ...     pass  # Run show
+
+    >>> frames = read_recording('show.canrec')
+    ... export_recording('show.canrec', 'show.blf')
+"""
+import collections
+import contextlib
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Deque, Generator, Iterable, List, Optional, Set, Tuple
+
+import can
+
+from being.can.definitions import FunctionCode
+from being.logging import get_logger
+
+
+MAGIC = b'BEINGCAN'
+"""Magic bytes of ring file."""
+
+VERSION = 1
+"""Ring file format version."""
+
+HEADER = struct.Struct('<8sIIQ')
+"""Ring file header. Magic, version, record size and total number of written
+records.
+"""
+
+RECORD = struct.Struct('<dIBB2x8s')
+"""Single frame record. Timestamp, arbitration id, flags, DLC and data."""
+
+DEFAULT_CAPACITY = 2 ** 16
+"""Default ring file capacity in number of frames."""
+
+FLUSH_INTERVAL = 0.050
+"""Interval of the background writer in seconds."""
+
+RX = 0x1
+"""Received frame flag."""
+
+EXTENDED_ID = 0x2
+"""Extended arbitration id flag."""
+
+REMOTE_FRAME = 0x4
+"""Remote frame flag."""
+
+LOGGER = get_logger(name=__name__, parent=None)
+
+Frame = Tuple[float, int, int, bytes]
+"""Timestamp, arbitration id, flags and data of a frame."""
+
+
+def ring_file_size(capacity: int) -> int:
+    """Size of ring file in bytes for a given capacity."""
+    return HEADER.size + capacity * RECORD.size
+
+
+class CanRecorder(can.Listener, contextlib.AbstractContextManager):
+
+    """Records the CAN traffic of a network into a memory-mapped ring file."""
+
+    def __init__(self,
+            network,
+            filepath: str,
+            capacity: int = DEFAULT_CAPACITY,
+            flushInterval: float = FLUSH_INTERVAL,
+        ):
+        """Args:
+            network (CanBackend): Network to record.
+            filepath: Ring file path. Gets overwritten.
+            capacity (optional): Number of frames the ring file can hold.
+            flushInterval (optional): Interval of the background writer.
+        """
+        if capacity < 1:
+            raise ValueError(f'capacity has to be at least 1, not {capacity}!')
+
+        self.network = network
+        self.filepath = os.path.expanduser(filepath)
+        self.capacity = capacity
+        self.flushInterval = flushInterval
+        self.queue: Deque[Frame] = collections.deque(maxlen=capacity)
+        self.written = 0
+        self.file = None
+        self.mm: Optional[mmap.mmap] = None
+        self.running = False
+        self.thread = None
+        self.stopEvent = threading.Event()
+
+    def record(self, arbitrationId: int, data: bytes, rx: bool, timestamp: Optional[float] = None, remote: bool = False):
+        """Record a single frame. Thread safe and non-blocking.
+
+        Args:
+            arbitrationId: CAN id of frame.
+            data: Frame data.
+            rx: Received (True) or sent (False) frame.
+            timestamp (optional): Unix timestamp. Now if omitted.
+            remote (optional): Remote frame.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        flags = RX if rx else 0
+        if arbitrationId > 0x7FF:
+            flags |= EXTENDED_ID
+
+        if remote:
+            flags |= REMOTE_FRAME
+
+        self.queue.append((timestamp, arbitrationId, flags, bytes(data)))
+
+    def record_message(self, msg: can.Message, rx: bool):
+        """Record python-can message."""
+        self.record(msg.arbitration_id, msg.data, rx, msg.timestamp or None, msg.is_remote_frame)
+
+    def on_message_received(self, msg: can.Message):
+        """Listener callback for received frames. Called from the notifier
+        thread.
+        """
+        self.record_message(msg, rx=True)
+
+    def flush(self):
+        """Write queued frames to ring file."""
+        mm = self.mm
+        queue = self.queue
+        while queue:
+            timestamp, arbitrationId, flags, data = queue.popleft()
+            offset = HEADER.size + (self.written % self.capacity) * RECORD.size
+            RECORD.pack_into(mm, offset, timestamp, arbitrationId, flags, len(data), data)
+            self.written += 1
+
+        HEADER.pack_into(mm, 0, MAGIC, VERSION, RECORD.size, self.written)
+
+    def _run(self):
+        while not self.stopEvent.wait(self.flushInterval):
+            self.flush()
+
+        self.flush()
+
+    def start(self):
+        """Create ring file, attach to network and start background writer."""
+        if self.running:
+            raise RuntimeError('Recorder already running!')
+
+        LOGGER.info('Recording %s to %r', self.network.channel, self.filepath)
+        os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+        self.file = open(self.filepath, 'w+b')
+        self.file.truncate(ring_file_size(self.capacity))
+        self.mm = mmap.mmap(self.file.fileno(), ring_file_size(self.capacity))
+        self.written = 0
+        HEADER.pack_into(self.mm, 0, MAGIC, VERSION, RECORD.size, self.written)
+
+        self.running = True
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name='CanRecorder')
+        self.thread.start()
+        self.network.attach_recorder(self)
+
+    def stop(self):
+        """Detach from network, write remaining frames and close ring file."""
+        if not self.running:
+            raise RuntimeError('No recorder running!')
+
+        self.network.detach_recorder(self)
+        self.running = False
+        self.stopEvent.set()
+        self.thread.join()
+        self.mm.flush()
+        self.mm.close()
+        self.file.close()
+        self.mm = self.file = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def read_recording(filepath: str) -> List[can.Message]:
+    """Read frames from ring file. Oldest first.
+
+    Args:
+        filepath: Ring file path.
+
+    Returns:
+        Recorded frames. ``is_rx`` marks received frames.
+    """
+    with open(os.path.expanduser(filepath), 'rb') as f:
+        buf = f.read()
+
+    magic, version, recordSize, written = HEADER.unpack_from(buf)
+    if magic != MAGIC or version != VERSION or recordSize != RECORD.size:
+        raise ValueError(f'{filepath!r} is not a CAN recording')
+
+    capacity = (len(buf) - HEADER.size) // RECORD.size
+    count = min(written, capacity)
+    start = written - count
+    frames = []
+    for nr in range(start, written):
+        offset = HEADER.size + (nr % capacity) * RECORD.size
+        timestamp, arbitrationId, flags, dlc, data = RECORD.unpack_from(buf, offset)
+        frames.append(can.Message(
+            timestamp=timestamp,
+            arbitration_id=arbitrationId,
+            is_extended_id=bool(flags & EXTENDED_ID),
+            is_remote_frame=bool(flags & REMOTE_FRAME),
+            is_rx=bool(flags & RX),
+            dlc=dlc,
+            data=data[:dlc],
+        ))
+
+    return frames
+
+
+def export_recording(filepath: str, outpath: str):
+    """Export ring file for other tools. Format by file extension (``.blf``,
+    ``.asc``, ... everything :class:`can.Logger` supports).
+
+    Args:
+        filepath: Ring file path.
+        outpath: Output file path.
+    """
+    with can.Logger(outpath) as logger:
+        for msg in read_recording(filepath):
+            logger.on_message_received(msg)
+
+
+def is_sdo_response(arbitrationId: int) -> bool:
+    """Check if CAN id belongs to a SDO response."""
+    return FunctionCode.SDOtx < arbitrationId <= FunctionCode.SDOtx + 0x7F
+
+
+class CanReplay:
+
+    """Replay recorded traffic offline. Received frames (TPDOs, EMCY,
+    heartbeats) get fed back into a network cycle by cycle. The cycles are
+    delimited by the recorded SYNC messages. SDO responses are skipped by
+    default since there are no matching requests.
+    """
+
+    def __init__(self,
+            frames: Iterable[can.Message],
+            network,
+            cobIds: Optional[Set[int]] = None,
+            skipSdo: bool = True,
+        ):
+        """Args:
+            frames: Recorded frames (see :func:`read_recording`). Get ordered
+                by timestamp.
+            network (canopen.Network): Network with the nodes to feed.
+            cobIds (optional): Only replay these CAN ids.
+            skipSdo (optional): Skip SDO responses.
+        """
+        self.network = network
+        self.cycles: List[List[can.Message]] = [[]]
+        for msg in sorted(frames, key=lambda msg: msg.timestamp):
+            if not msg.is_rx:
+                if msg.arbitration_id == FunctionCode.SYNC:
+                    self.cycles.append([])
+
+                continue
+
+            if cobIds is not None and msg.arbitration_id not in cobIds:
+                continue
+
+            if skipSdo and is_sdo_response(msg.arbitration_id):
+                continue
+
+            self.cycles[-1].append(msg)
+
+    def __len__(self):
+        return len(self.cycles)
+
+    def feed(self, cycle: int):
+        """Feed received frames of a given cycle into the network."""
+        notify = self.network.notify
+        for msg in self.cycles[cycle]:
+            notify(msg.arbitration_id, msg.data, msg.timestamp)
+
+    def replay(self) -> Generator[int, None, None]:
+        """Feed cycle after cycle. Yields the cycle number after feeding so
+        that the caller can run its main cycle in between.
+
+        Example:
+            >>> for _ in replay.replay():
+            ...     being.single_cycle()
+        """
+        for cycle in range(len(self)):
+            self.feed(cycle)
+            yield cycle
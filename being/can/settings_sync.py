@@ -0,0 +1,242 @@
+"""Apply settings to CANopen nodes with as few SDO transfers as possible.
+
+Most drives keep their configuration. Instead of writing every setting on
+every start the current values get read in one go, compared with the desired
+ones and only the differences get written. The read phase queues all
+expedited uploads at once on the non-blocking SDO client of the node (see
+:mod:`being.can.async_sdo`). The requests then go out back to back from the
+CAN receive thread without waking the caller for every single transfer.
+CANopen has no multi-object upload, so this is one SDO transfer per object.
+Optionally the settings get stored to the non-volatile memory of the drive
+(CiA 301 *Store parameters*). In this case a checksum of the settings is recorded locally per drive (node id,
+vendor, product code and serial number) and the next time both, the read and
+the write phase, can be skipped entirely if nothing changed.
+
+Settings are address -> value mappings. Addresses use the path syntax with
+slash '/' separators for nested entries. Subindices can also be given as
+numbers.
+
+Example:
+    >>> settings = {
+    ...     'Max Profile Velocity': 1000,
+    ...     'Software Position Limit/Minimum Position Limit': -1e7,
+    ...     'Configuration of digital inputs/1': 0,
+    ... }
+    ... sync_settings(node, settings, store=True)
+"""
+import collections
+import concurrent.futures
+import hashlib
+from typing import Any, Dict, Optional, Tuple, Union
+
+from canopen import RemoteNode
+from canopen.sdo import SdoAbortedError, SdoCommunicationError, SdoVariable
+
+from being.can.async_sdo import MAX_EXPEDITED_SIZE
+from being.can.cia_301 import IDENTITY_OBJECT, PRODUCT_CODE, SERIAL_NUMBER, VENDOR_ID
+from being.configuration import CONFIG
+from being.logging import get_logger
+from being.records import JsonRecord, shared_record
+
+
+RECORD_FILEPATH: Optional[str] = CONFIG['Can']['SETTINGS_RECORD_FILEPATH']
+"""Default filepath for recorded settings checksums. Only in memory if None."""
+
+STORE_PARAMETERS = 0x1010
+SAVE_ALL_PARAMETERS = 1
+
+SAVE_SIGNATURE = int.from_bytes(b'save', 'little')
+"""Signature for triggering storing of parameters."""
+
+LOGGER = get_logger(name=__name__, parent=None)
+
+Address = Tuple[int, int]
+"""Index and subindex of object."""
+
+
+def maybe_int(string: str) -> Union[int, str]:
+    """Try to cast string to int.
+
+    Args:
+        string: Input string.
+
+    Returns:
+        Maybe an int. Pass on input string otherwise.
+
+    Example:
+        >>> maybe_int('123')
+        123
+
+        >>> maybe_int('  0x7b')
+        123
+    """
+    string = string.strip()
+    if string.isnumeric():
+        return int(string)
+
+    if string.startswith('0x'):
+        return int(string, base=16)
+
+    if string.startswith('0b'):
+        return int(string, base=2)
+
+    return string
+
+
+def resolve_settings(sdo, settings: Dict[str, Any]) -> Dict[Address, Tuple[SdoVariable, bytes]]:
+    """Resolve settings addresses and encode values. Duplicate entries for the
+    same object are reduced to the last one. Entries which do not resolve to a
+    variable get skipped.
+
+    Args:
+        sdo: SDO client of node.
+        settings: Settings to resolve. Addresses (path syntax) -> value.
+
+    Returns:
+        Ordered address -> (variable, raw data) mapping.
+    """
+    resolved = collections.OrderedDict()
+    for name, value in settings.items():
+        *path, last = map(maybe_int, name.split('/'))
+        var = sdo
+        for key in path:
+            var = var[key]
+
+        var = var[last]
+        if not isinstance(var, SdoVariable):
+            LOGGER.debug('Skipping %r. Not a variable', name)
+            continue
+
+        address = (var.index, var.subindex)
+        resolved.pop(address, None)
+        resolved[address] = (var, var.od.encode_raw(value))
+
+    return resolved
+
+
+def read_current_data(node: RemoteNode, resolved: Dict[Address, Tuple[SdoVariable, bytes]]) -> Dict[Address, Optional[bytes]]:
+    """Read the current raw data of all readable resolved settings. Expedited
+    uploads get queued all at once on the async SDO client of the node (if
+    any). Everything else falls back to blocking uploads.
+
+    Args:
+        node: CANopen node.
+        resolved: Resolved settings.
+
+    Returns:
+        Address -> current raw data. None if unknown (not readable or the
+        upload failed).
+    """
+    current = dict.fromkeys(resolved)
+    asyncSdo = getattr(node, 'asyncSdo', None)
+    futures = {}
+    for address, (var, data) in resolved.items():
+        if not var.od.readable:
+            continue
+
+        if asyncSdo is not None and len(data) <= MAX_EXPEDITED_SIZE:
+            futures[address] = asyncSdo.read(*address)
+        else:
+            try:
+                current[address] = var.data
+            except (SdoAbortedError, SdoCommunicationError) as err:
+                LOGGER.debug('Could not read %r (%s)', var.name, err)
+
+    pending = set(futures.values())
+    while pending:
+        _, pending = concurrent.futures.wait(pending, timeout=asyncSdo.timeout)
+        asyncSdo.check_timeout()
+
+    for address, future in futures.items():
+        var, _ = resolved[address]
+        try:
+            current[address] = var.od.encode_raw(future.result())
+        except (SdoAbortedError, SdoCommunicationError) as err:
+            LOGGER.debug('Could not read %r (%s)', var.name, err)
+
+    return current
+
+
+def settings_checksum(resolved: Dict[Address, Tuple[SdoVariable, bytes]]) -> str:
+    """Checksum of resolved settings."""
+    hasher = hashlib.sha1()
+    for (index, subindex), (_, data) in resolved.items():
+        hasher.update(b'%d:%d:%s;' % (index, subindex, data.hex().encode()))
+
+    return hasher.hexdigest()
+
+
+def drive_key(node: RemoteNode) -> str:
+    """Key identifying a physical drive at a given node id."""
+    identity = node.sdo[IDENTITY_OBJECT]
+    parts = [node.id]
+    for subindex in [VENDOR_ID, PRODUCT_CODE, SERIAL_NUMBER]:
+        try:
+            parts.append(identity[subindex].raw)
+        except (KeyError, SdoAbortedError):
+            parts.append(0)
+
+    return '_'.join(f'{part:08x}' for part in parts)
+
+
+def store_parameters(node: RemoteNode):
+    """Store all parameters to non-volatile memory of node."""
+    LOGGER.info('Storing parameters of node %d', node.id)
+    node.sdo[STORE_PARAMETERS][SAVE_ALL_PARAMETERS].raw = SAVE_SIGNATURE
+
+
+class SettingsRecord(JsonRecord):
+
+    """Settings checksums of drives which got their settings stored. Drive key
+    -> checksum. JSON file backed.
+    """
+
+
+def sync_settings(
+        node: RemoteNode,
+        settings: Dict[str, Any],
+        store: bool = False,
+        record: Optional[SettingsRecord] = None,
+    ) -> int:
+    """Apply settings to node. Only write the values which differ from the
+    current ones.
+
+    Args:
+        node: CANopen node.
+        settings: Settings to apply. Addresses (path syntax) -> value.
+        store (optional): Store settings to non-volatile memory of the node
+            and record checksum. Unchanged drives get skipped next time.
+        record (optional): Settings record. Shared record of
+            :data:`RECORD_FILEPATH` if omitted.
+
+    Returns:
+        Number of written settings.
+    """
+    resolved = resolve_settings(node.sdo, settings)
+    if store:
+        if record is None:
+            record = shared_record(RECORD_FILEPATH, SettingsRecord)
+
+        checksum = settings_checksum(resolved)
+        key = drive_key(node)
+        if record.get(key) == checksum:
+            LOGGER.debug('Settings of node %d are up to date', node.id)
+            return 0
+
+    # Read everything first, then write the differences
+    current = read_current_data(node, resolved)
+    changed = [
+        (var, data)
+        for address, (var, data) in resolved.items()
+        if current[address] != data
+    ]
+    for var, data in changed:
+        LOGGER.debug('Applying %r = %s', var.name, var.od.decode_raw(data))
+        var.data = data
+
+    LOGGER.info('Node %d: %d of %d settings changed', node.id, len(changed), len(resolved))
+    if store:
+        store_parameters(node)
+        record.set(key, checksum)
+
+    return len(changed)
@@ -0,0 +1,575 @@
+"""Virtual CiA 402 drives for testing without hardware.
+
+:class:`SimulatedDrive` is a local CANopen node (SDO server, NMT slave, EMCY
+producer) built from the bundled EDS files. It emulates the parts of a
+Faulhaber MCLM3002 or Maxon EPOS4 that being relies on: the CiA 402 state
+machine, modes of operation, dynamic PDO mapping and SYNC triggered PDO
+exchange. Movement is simulated with simple kinematics in device units (no
+motor model, velocities are in position units per second). Optionally with
+hard stops, RPDO timeouts and homing.
+
+:class:`DriveSimulator` puts multiple simulated drives on a python-can bus.
+With the in-process ``'virtual'`` bus type the whole being stack, from
+:class:`being.backends.CanBackend` down to the controllers, can be exercised in
+CI. A ``'socketcan'`` channel (e.g. ``vcan0``) works as well.
+
+Example:
+    >>> with DriveSimulator(channel='being') as simulator:
+    ...     simulator.add_drive(nodeId=1)
+    ...     simulator.add_drive(nodeId=2, profile=EPOS4)
+    ...     with CanBackend(bustype='virtual', channel='being') as network:
+    ...         node = CiA402Node(1, load_object_dictionary(network, 1), network)
+"""
+import contextlib
+import io
+import math
+import pkgutil
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from canopen import LocalNode, Network
+from canopen.objectdictionary import (
+    NUMBER_TYPES,
+    ODVariable,
+    ObjectDictionary,
+    VISIBLE_STRING,
+)
+from canopen.objectdictionary.eds import import_eds
+
+from being.bitmagic import check_bit_mask
+from being.can.cia_301 import DEVICE_TYPE, ERROR_REGISTER, MANUFACTURER_DEVICE_NAME
+from being.can.cia_402 import (
+    CONTROLWORD,
+    CURRENT_ACTUAL_VALUE,
+    CW,
+    MODES_OF_OPERATION,
+    MODES_OF_OPERATION_DISPLAY,
+    OperationMode,
+    POSITION_ACTUAL_VALUE,
+    PROFILE_VELOCITY,
+    STATUSWORD,
+    SUPPORTED_DRIVE_MODES,
+    SW,
+    State,
+    TARGET_POSITION,
+    TARGET_VELOCITY,
+    VELOCITY_ACTUAL_VALUE,
+)
+from being.can.definitions import FunctionCode
+from being.can.nmt import OPERATIONAL, PRE_OPERATIONAL
+from being.logging import get_logger
+
+
+HEARTBEAT_TIME = 0x1017
+RPDO_COMMUNICATION = 0x1400
+RPDO_MAPPING = 0x1600
+TPDO_COMMUNICATION = 0x1800
+TPDO_MAPPING = 0x1A00
+PDO_CONFIGURATION_END = 0x1C00
+MAX_PDOS = 512
+
+COB_ID_INVALID = (1 << 31)
+"""Bit in PDO COB-ID entry marking PDO as not existing / disabled."""
+
+RPDO_TIMEOUT_EMCY_CODE = 0x8250
+"""EMCY error code for RPDO timeout (same as EPOS4)."""
+
+COMMUNICATION_ERROR = (1 << 4)
+"""Communication error bit in error register."""
+
+MAX_TIME_STEP = 0.1
+"""Maximum simulation time step in seconds between two SYNCs."""
+
+
+class DeviceProfile(NamedTuple):
+
+    """Identity of a simulated device."""
+
+    edsFile: str
+    """Bundled EDS file (relative to :mod:`being.can`)."""
+
+    deviceType: int
+    """Device type (0x1000)."""
+
+    deviceName: str
+    """Manufacturer device name (0x1008)."""
+
+    supportedDriveModes: int = 0x1A5
+    """Supported drive modes (0x6502). PP, PV, HM, CSP and CSV by default."""
+
+
+MCLM3002 = DeviceProfile('eds_files/MCLM3002P-CO.eds', 0x00420192, 'MCLM3002P-CO')
+"""Faulhaber MCLM3002 motion controller."""
+
+EPOS4 = DeviceProfile('eds_files/maxon_EPOS4_50-5.eds', 0x00020192, 'EPOS4')
+"""Maxon EPOS4 motion controller."""
+
+
+class PdoConfig(NamedTuple):
+
+    """Parsed PDO communication and mapping parameters."""
+
+    cobId: int
+    transType: int
+    entries: List[Tuple[int, int, int]]
+    """Mapped objects (index, subindex, number of bytes)."""
+
+
+def next_state(state: State, controlword: int) -> State:
+    """Device side CiA 402 state machine. Without the fault reset which needs
+    the rising edge of the controlword bit.
+
+    Args:
+        state: Current state.
+        controlword: Received controlword.
+
+    Returns:
+        Next state.
+    """
+    if state in {State.FAULT, State.FAULT_REACTION_ACTIVE, State.START, State.NOT_READY_TO_SWITCH_ON}:
+        return state
+
+    if not check_bit_mask(controlword, CW.ENABLE_VOLTAGE):
+        # Disable voltage: 7, 9, 10, 12
+        return State.SWITCH_ON_DISABLED
+
+    if not check_bit_mask(controlword, CW.QUICK_STOP):
+        # Quick stop: 7, 10, 11
+        if state in {State.OPERATION_ENABLED, State.QUICK_STOP_ACTIVE}:
+            return State.QUICK_STOP_ACTIVE
+
+        return State.SWITCH_ON_DISABLED
+
+    if not check_bit_mask(controlword, CW.SWITCH_ON):
+        # Shut down: 2, 6, 8
+        if state in {State.SWITCH_ON_DISABLED, State.SWITCHED_ON, State.OPERATION_ENABLED}:
+            return State.READY_TO_SWITCH_ON
+
+        return state
+
+    if not check_bit_mask(controlword, CW.ENABLE_OPERATION):
+        # Switch on: 3, disable operation: 5
+        if state in {State.READY_TO_SWITCH_ON, State.OPERATION_ENABLED}:
+            return State.SWITCHED_ON
+
+        return state
+
+    # Enable operation: 4, 16. Switch on + enable operation: 3 + 4
+    if state in {State.READY_TO_SWITCH_ON, State.SWITCHED_ON, State.QUICK_STOP_ACTIVE}:
+        return State.OPERATION_ENABLED
+
+    return state
+
+
+STATE_2_STATUSWORD: Dict[State, int] = {
+    State.NOT_READY_TO_SWITCH_ON: 0b0000000,
+    State.SWITCH_ON_DISABLED: 0b1000000,
+    State.READY_TO_SWITCH_ON: 0b0110001,
+    State.SWITCHED_ON: 0b0110011,
+    State.OPERATION_ENABLED: 0b0110111,
+    State.QUICK_STOP_ACTIVE: 0b0010111,
+    State.FAULT_REACTION_ACTIVE: 0b0001111,
+    State.FAULT: 0b0001000,
+}
+"""Statusword state bits (including voltage enabled) for each state."""
+
+
+def _pdo_indices(od: ObjectDictionary, communication: int, mapping: int):
+    """Iterate over communication and mapping indices of all PDOs in object
+    dictionary.
+    """
+    for nr in range(MAX_PDOS):
+        if communication + nr not in od or mapping + nr not in od:
+            return
+
+        yield communication + nr, mapping + nr
+
+
+class SimulatedDrive(LocalNode):
+
+    """Simulated CiA 402 drive node."""
+
+    def __init__(self,
+            nodeId: int,
+            profile: DeviceProfile = MCLM3002,
+            travel: Tuple[float, float] = (-math.inf, math.inf),
+            maxVelocity: float = math.inf,
+            stallCurrent: int = 1000,
+            homingDuration: float = 0.1,
+            rpdoTimeout: Optional[float] = None,
+            clock=time.perf_counter,
+        ):
+        """Args:
+            nodeId: Node ID.
+            profile (optional): Simulated device. MCLM3002 by default.
+            travel (optional): Position range in device units. Hard stops at
+                both ends. Unlimited by default.
+            maxVelocity (optional): Maximum velocity in device units per second.
+            stallCurrent (optional): Actual current value when pushing against
+                a hard stop.
+            homingDuration (optional): Duration of the homing procedure in
+                seconds.
+            rpdoTimeout (optional): Go to FAULT and send an EMCY message if no
+                RPDO arrives for this long while enabled. Disabled by default.
+            clock (optional): Time function.
+        """
+        data = pkgutil.get_data('being.can', profile.edsFile)
+        od = import_eds(io.StringIO(data.decode()), nodeId)
+        super().__init__(nodeId, od)
+        self.profile = profile
+        self.travel = travel
+        self.maxVelocity = maxVelocity
+        self.stallCurrent = stallCurrent
+        self.homingDuration = homingDuration
+        self.rpdoTimeout = rpdoTimeout
+        self.clock = clock
+        self.logger = get_logger(str(self))
+
+        self.state: State = State.SWITCH_ON_DISABLED
+        """Current CiA 402 state."""
+
+        self.position: float = 0.
+        """Actual position in device units."""
+
+        self.velocity: float = 0.
+        """Actual velocity in device units per second."""
+
+        self.current: int = 0
+        """Actual current."""
+
+        self.controlword: int = 0
+        self.targetReached = True
+        self.homingAttained = False
+        self.homingEnd: Optional[float] = None
+        self.profileTarget: Optional[float] = None
+        self.lastSync: Optional[float] = None
+        self.lastRpdo: Optional[float] = None
+        self.syncCounter = 0
+
+        self.pdoConfigDirty = True
+        self.rpdoConfigs: Dict[int, PdoConfig] = {}
+        self.tpdoConfigs: List[PdoConfig] = []
+        self.pendingRpdos: Dict[int, bytes] = {}
+        self.lastTpdos: Dict[int, bytes] = {}
+
+        self.seed_data_store()
+        self.add_read_callback(self.on_read)
+        self.add_write_callback(self.on_write)
+
+    def seed_data_store(self):
+        """Fill in values for all objects without EDS default value and set the
+        device identity.
+        """
+        od = self.object_dictionary
+        for obj in od.values():
+            variables = [obj] if isinstance(obj, ODVariable) else obj.values()
+            for var in variables:
+                if var.value is not None or var.default is not None:
+                    continue
+
+                if var.data_type in NUMBER_TYPES:
+                    value = 0 if var.min is None else max(var.min, 0)
+                    self.data_store.setdefault(var.index, {})[var.subindex] = var.encode_raw(value)
+                elif var.data_type == VISIBLE_STRING:
+                    self.data_store.setdefault(var.index, {})[var.subindex] = b''
+
+        identity = {
+            DEVICE_TYPE: self.profile.deviceType,
+            MANUFACTURER_DEVICE_NAME: self.profile.deviceName,
+            SUPPORTED_DRIVE_MODES: self.profile.supportedDriveModes,
+            HEARTBEAT_TIME: 0,
+        }
+        for index, value in identity.items():
+            if index in od:
+                self.data_store.setdefault(index, {})[0] = od[index].encode_raw(value)
+
+    def get_value(self, index: int, subindex: int = 0):
+        """Get decoded value from data store."""
+        obj = self._find_object(index, subindex)
+        return obj.decode_raw(self.get_data(index, subindex))
+
+    @property
+    def statusword(self) -> int:
+        """Current statusword."""
+        sw = STATE_2_STATUSWORD[self.state] | SW.REMOTE
+        if self.targetReached:
+            sw |= SW.TARGET_REACHED
+
+        if self.homingAttained:
+            sw |= SW.HOMING_ATTAINED
+
+        return sw
+
+    @property
+    def operationMode(self) -> int:
+        """Current mode of operation."""
+        return self.get_value(MODES_OF_OPERATION)
+
+    def on_read(self, index, subindex, od):
+        """Read callback for the live values."""
+        if index == STATUSWORD:
+            return self.statusword
+
+        if index == MODES_OF_OPERATION_DISPLAY:
+            return self.operationMode
+
+        if index == POSITION_ACTUAL_VALUE:
+            return int(round(self.position))
+
+        if index == VELOCITY_ACTUAL_VALUE:
+            return int(round(self.velocity))
+
+        if index == CURRENT_ACTUAL_VALUE:
+            return self.current
+
+        return None
+
+    def on_write(self, index, subindex, od, data):
+        """Write callback. Controlword and PDO configuration."""
+        if index == CONTROLWORD:
+            self.process_controlword(od.decode_raw(data))
+        elif RPDO_COMMUNICATION <= index < PDO_CONFIGURATION_END:
+            self.pdoConfigDirty = True
+
+    def process_controlword(self, controlword: int):
+        """Apply new controlword to state machine and mode of operation."""
+        rising = controlword & ~self.controlword
+        self.controlword = controlword
+        if self.state is State.FAULT:
+            if check_bit_mask(rising, CW.FAULT_RESET):
+                self.logger.debug('Fault reset')
+                self.set_state(State.SWITCH_ON_DISABLED)
+                self.set_data(ERROR_REGISTER, 0, bytes([0]))
+
+            return
+
+        self.set_state(next_state(self.state, controlword))
+        if self.state is not State.OPERATION_ENABLED:
+            return
+
+        if check_bit_mask(rising, CW.NEW_SET_POINT):
+            mode = self.operationMode
+            if mode == OperationMode.PROFILE_POSITION:
+                self.profileTarget = self.get_value(TARGET_POSITION)
+                self.targetReached = False
+            elif mode == OperationMode.HOMING:
+                self.homingEnd = self.clock() + self.homingDuration
+                self.homingAttained = False
+                self.targetReached = False
+
+    def set_state(self, state: State):
+        """Switch to new CiA 402 state."""
+        if state is self.state:
+            return
+
+        self.logger.debug('%s -> %s', self.state.name, state.name)
+        self.state = state
+        if state is not State.OPERATION_ENABLED:
+            self.velocity = 0.
+            self.homingEnd = None
+            self.profileTarget = None
+
+    def fault(self, code: int, register: int = COMMUNICATION_ERROR):
+        """Go to FAULT state and send EMCY message."""
+        self.logger.warning('Fault 0x%04x', code)
+        self.set_state(State.FAULT)
+        self.set_data(ERROR_REGISTER, 0, bytes([register]))
+        if self.has_network():
+            self.emcy.send(code, register)
+
+    def step(self, dt: float):
+        """Advance simulation by one time step.
+
+        Args:
+            dt: Time step in seconds.
+        """
+        if self.state is not State.OPERATION_ENABLED:
+            self.velocity = 0.
+            self.current = 0
+            return
+
+        mode = self.operationMode
+        halt = check_bit_mask(self.controlword, CW.HALT)
+        target = self.position
+        if mode in {OperationMode.PROFILE_VELOCITY, OperationMode.CYCLIC_SYNCHRONOUS_VELOCITY}:
+            vel = 0. if halt else self.get_value(TARGET_VELOCITY)
+            target = self.position + vel * dt
+        elif mode == OperationMode.CYCLIC_SYNCHRONOUS_POSITION:
+            target = self.get_value(TARGET_POSITION)
+        elif mode == OperationMode.PROFILE_POSITION and self.profileTarget is not None and not halt:
+            maxStep = (self.get_value(PROFILE_VELOCITY) or math.inf) * dt
+            delta = self.profileTarget - self.position
+            target = self.position + min(max(delta, -maxStep), maxStep)
+        elif mode == OperationMode.HOMING and self.homingEnd is not None:
+            if self.clock() >= self.homingEnd:
+                self.logger.debug('Homing done')
+                self.homingEnd = None
+                self.position = target = 0.
+                self.homingAttained = True
+                self.targetReached = True
+
+        self.move_to(target, dt)
+        if self.profileTarget is not None and self.position == self.profileTarget:
+            self.profileTarget = None
+            self.targetReached = True
+
+    def move_to(self, target: float, dt: float):
+        """Move towards target position within velocity and travel limits."""
+        if dt > 0:
+            maxStep = self.maxVelocity * dt
+            target = min(max(target, self.position - maxStep), self.position + maxStep)
+
+        lower, upper = self.travel
+        clipped = min(max(target, lower), upper)
+        self.current = self.stallCurrent if clipped != target else 0
+        self.velocity = (clipped - self.position) / dt if dt > 0 else 0.
+        self.position = clipped
+
+    def update_pdo_configs(self):
+        """Parse PDO configuration from data store and subscribe to the RPDO
+        COB-IDs.
+        """
+        for cobId in self.rpdoConfigs:
+            self.network.unsubscribe(cobId, self.on_rpdo)
+
+        self.rpdoConfigs = {
+            cfg.cobId: cfg
+            for cfg in self.read_pdo_configs(RPDO_COMMUNICATION, RPDO_MAPPING)
+        }
+        self.tpdoConfigs = list(self.read_pdo_configs(TPDO_COMMUNICATION, TPDO_MAPPING))
+        for cobId in self.rpdoConfigs:
+            self.network.subscribe(cobId, self.on_rpdo)
+
+        self.pendingRpdos.clear()
+        self.lastTpdos.clear()
+        self.pdoConfigDirty = False
+
+    def read_pdo_configs(self, communication: int, mapping: int):
+        """Read all valid PDO configurations from the data store."""
+        for comIdx, mapIdx in _pdo_indices(self.object_dictionary, communication, mapping):
+            cobId = self.get_value(comIdx, 1)
+            if cobId & COB_ID_INVALID:
+                continue
+
+            entries = []
+            for subindex in range(1, self.get_value(mapIdx, 0) + 1):
+                entry = self.get_value(mapIdx, subindex)
+                entries.append((entry >> 16, (entry >> 8) & 0xFF, (entry & 0xFF) // 8))
+
+            yield PdoConfig(cobId & 0x7FF, self.get_value(comIdx, 2), entries)
+
+    def apply_rpdo(self, data: bytes, cfg: PdoConfig):
+        """Write RPDO data to mapped objects."""
+        offset = 0
+        for index, subindex, size in cfg.entries:
+            self.set_data(index, subindex, data[offset:offset + size])
+            offset += size
+
+    def on_rpdo(self, cobId: int, data: bytearray, timestamp: float):
+        """Receive RPDO. Synchronous ones get applied with the next SYNC."""
+        if self.nmt.state != OPERATIONAL or cobId not in self.rpdoConfigs:
+            return
+
+        self.lastRpdo = self.clock()
+        cfg = self.rpdoConfigs[cobId]
+        if cfg.transType <= 240:
+            self.pendingRpdos[cobId] = bytes(data)
+        else:
+            self.apply_rpdo(data, cfg)
+
+    def on_sync(self, cobId: int, data: bytearray, timestamp: float):
+        """SYNC received. Apply RPDOs, advance simulation and send TPDOs."""
+        if self.pdoConfigDirty:
+            self.update_pdo_configs()
+
+        now = self.clock()
+        dt = 0. if self.lastSync is None else min(now - self.lastSync, MAX_TIME_STEP)
+        self.lastSync = now
+        if self.nmt.state != OPERATIONAL:
+            return
+
+        for cobId, data in self.pendingRpdos.items():
+            self.apply_rpdo(data, self.rpdoConfigs[cobId])
+
+        self.pendingRpdos.clear()
+        timedOut = (
+            self.rpdoTimeout is not None
+            and self.lastRpdo is not None
+            and now - self.lastRpdo > self.rpdoTimeout
+        )
+        if timedOut and self.state is State.OPERATION_ENABLED:
+            self.fault(RPDO_TIMEOUT_EMCY_CODE)
+
+        self.step(dt)
+        self.syncCounter += 1
+        self.send_tpdos()
+
+    def send_tpdos(self):
+        """Send synchronous TPDOs. Cyclic ones every n-th SYNC, acyclic and
+        event driven ones when their data changed.
+        """
+        for cfg in self.tpdoConfigs:
+            data = b''.join(self.get_data(index, subindex)[:size] for index, subindex, size in cfg.entries)
+            if 1 <= cfg.transType <= 240:
+                if self.syncCounter % cfg.transType:
+                    continue
+            elif self.lastTpdos.get(cfg.cobId) == data:
+                continue
+
+            self.lastTpdos[cfg.cobId] = data
+            self.network.send_message(cfg.cobId, data)
+
+    def __str__(self):
+        return f'{type(self).__name__}(nodeId: {self.id}, {self.profile.deviceName})'
+
+
+class DriveSimulator(contextlib.AbstractContextManager):
+
+    """Simulated CAN bus segment with multiple virtual drives. Has its own
+    CANopen network on a python-can bus.
+    """
+
+    def __init__(self, channel: str = 'being', bustype: str = 'virtual'):
+        """Args:
+            channel (optional): CAN channel.
+            bustype (optional): python-can bus type. In-process 'virtual' by
+                default.
+        """
+        self.channel = channel
+        self.bustype = bustype
+        self.network = Network()
+        self.drives: Dict[int, SimulatedDrive] = {}
+        self.network.subscribe(FunctionCode.SYNC, self.on_sync)
+
+    def add_drive(self, nodeId: int, profile: DeviceProfile = MCLM3002, **kwargs) -> SimulatedDrive:
+        """Add new simulated drive.
+
+        Args:
+            nodeId: Node ID.
+            profile (optional): Simulated device.
+            **kwargs: Simulation parameters. See :class:`SimulatedDrive`.
+
+        Returns:
+            New drive.
+        """
+        if nodeId in self.drives:
+            raise ValueError(f'Node ID {nodeId} is already taken!')
+
+        drive = self.drives[nodeId] = SimulatedDrive(nodeId, profile, **kwargs)
+        self.network.add_node(drive)
+        drive.nmt.state = PRE_OPERATIONAL
+        return drive
+
+    def on_sync(self, cobId: int, data: bytearray, timestamp: float):
+        for drive in self.drives.values():
+            drive.on_sync(cobId, data, timestamp)
+
+    def __getitem__(self, nodeId: int) -> SimulatedDrive:
+        return self.drives[nodeId]
+
+    def __enter__(self):
+        self.network.connect(bustype=self.bustype, channel=self.channel)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.network.disconnect()
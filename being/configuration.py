@@ -14,6 +14,18 @@ CONFIG: dict = {
     },
     'Can': {
         'DEFAULT_CAN_BITRATE': 1000000,  # Default bitrate (bit / sec) for CAN interface.
+        'RPDO_REFRESH_CYCLES': 1,  # Resend unchanged RPDOs every n-th cycle. 1 -> Send every cycle. Has to stay below RPDO timeout of the drives.
+        'BRING_UP_WORKERS': 16,  # Maximum number of motors which get initialized concurrently.
+        'HOMING_BATCH_SIZE': 8,  # Maximum number of concurrent homing jobs. None for no limit.
+        'HOMING_SDO_STEPS_PER_CYCLE': 4,  # Maximum number of homing steps per cycle which start SDO transfers.
+        'HOMING_RECORD_FILEPATH': '~/.cache/being/homings.json',  # Homing results per drive. Homed drives which kept their position skip homing on the next start. None for no on-disk record.
+        'HOMING_POSITION_TOLERANCE': 100,  # Maximum position deviation (device units) for a recorded homing to stay valid.
+        'HOMING_MARKER': None,  # Writable object (name or index) which the drives do not keep over a power cycle. Proves that a recorded CiA 402 homing is still valid. None -> Only crude homings get resumed.
+        'OD_CACHE_DIRECTORY': '~/.cache/being/object_dictionaries',  # Cache directory for parsed EDS files. None for no on-disk caching. Cached files get unpickled, only use a directory writable by the being user alone.
+        'SETTINGS_RECORD_FILEPATH': '~/.cache/being/drive_settings.json',  # Checksums of stored drive settings. Drives with unchanged settings get skipped.
+        'METRICS_INTERVAL': 1.0,  # Sampling interval of the bus metrics in seconds.
+        'METRICS_HISTORY_SIZE': 600,  # Number of bus metrics samples to keep.
+        'RECORDER_FILEPATH': None,  # Record CAN traffic to this ring file (e.g. 'being_{channel}.canrec'). None for no recording.
     },
     'Web': {
         'HOST': None,  # Host name of web server
@@ -21,6 +33,8 @@ CONFIG: dict = {
         'API_PREFIX': '/api',  # API route prefix.
         'WEB_SOCKET_ADDRESS': '/stream',  # Web socket URL.
         'INTERVAL': .050,  # Web socket stream interval in seconds.
+        'MOTOR_UPDATE_INTERVAL': .250,  # Minimum interval between two front-end updates of the same motor in seconds.
+        'COMPRESSION_THRESHOLD': 1024,  # Minimum size in bytes for gzip compressing API responses.
     },
     'Logging': {
         'LEVEL': logging.WARNING,
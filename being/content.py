@@ -3,13 +3,13 @@ import collections
 import glob
 import os
 from collections import OrderedDict
-from typing import Generator
+from typing import Generator, Optional
 
 from being.configuration import CONFIG
 from being.curve import Curve
 from being.logging import get_logger
 from being.pubsub import PubSub
-from being.serialization import loads, dumps
+from being.serialization import JSON_CODEC, Codec, loads, dumps
 from being.spline import BPoly, split_spline
 from being.utils import SingleInstanceCache, read_file, rootname, write_file
 
@@ -32,24 +32,30 @@ def stripext(p):
     return root
 
 
-def upgrade_splines_to_curves(directory, logger=None):
-    """Go through each JSON file inside directory and upgrade every serialized
-    spline to a curve.
+def upgrade_splines_to_curves(directory, logger=None, codec: Codec = JSON_CODEC, ext: Optional[str] = None):
+    """Go through each serialized file inside directory and upgrade every
+    serialized spline to a curve.
 
     Args:
         directory: Folder to check.
+        logger (optional): Logger instance.
+        codec (optional): Serialization codec of the files.
+        ext (optional): File extension. Codec's file extension by default.
     """
     if logger is None:
         logger = get_logger('upgrade_splines_to_curves()')
 
-    for fp in glob.iglob(directory + '/*.json'):
-        obj = loads(read_file(fp))
+    if ext is None:
+        ext = codec.extension
+
+    for fp in glob.iglob(directory + '/*' + ext):
+        obj = codec.loads(read_file(fp, binary=codec.binary))
         if isinstance(obj, Curve):
             pass
         elif isinstance(obj, BPoly):
             curve = Curve(split_spline(obj))
             logger.info('Upgrading spline to curve %r', fp)
-            write_file(fp, dumps(curve))
+            write_file(fp, codec.dumps(curve))
         else:
             logger.warning('Do not know what to do with obj', obj)
 
@@ -63,19 +69,22 @@ class Files(collections.MutableMapping):
         directory: Directory to manage.
         loads: Serialization loader function
         dumps: Serialization dumper function
+        binary: If files are binary.
     """
 
-    def __init__(self, directory: str, loads=loads, dumps=dumps):
+    def __init__(self, directory: str, loads=loads, dumps=dumps, binary: bool = False):
         """Args:
             directory: Directory to manage.
 
         Kwargs:
             loads: Serialization loader function.
             dumps: Serialization dumper function.
+            binary: If loads / dumps work with bytes instead of str.
         """
         self.directory = directory
         self.loads = loads
         self.dumps = dumps
+        self.binary = binary
         os.makedirs(self.directory, exist_ok=True)
 
     def _fullpath(self, path: str) -> str:
@@ -93,7 +102,7 @@ class Files(collections.MutableMapping):
 
     def __getitem__(self, path: str) -> Generator[str, None, None]:
         fp = self._fullpath(path)
-        return self.loads(read_file(fp))
+        return self.loads(read_file(fp, binary=self.binary))
 
     def __setitem__(self, path: str, value: object):
         fp = self._fullpath(path)
@@ -125,15 +134,26 @@ class Content(PubSub, SingleInstanceCache):
     # TODO: Extend for all kind of files, subfolders.
     # TODO: NestedDict?
 
-    def __init__(self, directory=DEFAULT_DIRECTORY, data=None, ext='.json'):
+    def __init__(
+            self,
+            directory=DEFAULT_DIRECTORY,
+            data=None,
+            ext: Optional[str] = None,
+            codec: Codec = JSON_CODEC,
+        ):
         """Kwargs:
             directory: Directory to manage. Default content directory from
                 configuration by default.
             data: Data container.
-            ext: File extensions. name + ext = path.
+            ext: File extensions. name + ext = path. Codec's file extension
+                by default.
+            codec: Serialization codec for the curve files.
         """
+        if ext is None:
+            ext = codec.extension
+
         if data is None:
-            data = Files(directory)
+            data = Files(directory, codec.loads, codec.dumps, codec.binary)
         else:
             directory = None
 
@@ -141,10 +161,11 @@ class Content(PubSub, SingleInstanceCache):
         self.directory = directory
         self.data = data
         self.ext = ext
+        self.codec = codec
         self.logger = get_logger(str(self))
 
         if self.directory is not None:
-            upgrade_splines_to_curves(self.directory, self.logger)
+            upgrade_splines_to_curves(self.directory, self.logger, codec, ext)
 
     def curve_exists(self, name: str) -> bool:
         """Check if motion curve exists.
@@ -1,6 +1,6 @@
 """Mathematical helper functions."""
 import math
-from typing import Tuple, NamedTuple
+from typing import List, Tuple, NamedTuple
 
 from being.constants import TAU
 
@@ -9,6 +9,12 @@ from numpy import ndarray
 import scipy.optimize
 
 
+SPIRAL_LUT_SIZE = 4096
+"""Number of entries of the arc length -> angle lookup table of
+:class:`SpiralMapping`.
+"""
+
+
 def clip(number: float, lower: float, upper: float) -> float:
     """Clip `number` to the closed interval [`lower`, `upper`].
 
@@ -133,3 +139,83 @@ class ArchimedeanSpiral(NamedTuple):
         x0 = [0.0, phi0]
         bEst, phiEst = scipy.optimize.fsolve(func, x0)
         return cls(a, b=bEst), phiEst
+
+    def mapping(self, maxAngle: float, size: int = SPIRAL_LUT_SIZE) -> 'SpiralMapping':
+        """Angle <-> arc length mapping for the range [0, maxAngle]."""
+        return SpiralMapping(self, maxAngle, size)
+
+
+class SpiralMapping:
+
+    """Fast angle <-> arc length mapping of an Archimedean spiral within
+    [0, maxAngle]. Inputs get clipped to the valid range.
+
+    Angle -> arc length is the closed form of
+    :meth:`ArchimedeanSpiral.arc_length`. Arc length -> angle uses a
+    precomputed lookup table which is uniform in arc length (constant time
+    index calculation) followed by a single Newton step. Scalar methods avoid
+    any NumPy overhead, the ``*s`` variants map whole arrays.
+    """
+
+    def __init__(self, spiral: ArchimedeanSpiral, maxAngle: float, size: int = SPIRAL_LUT_SIZE):
+        """Args:
+            spiral: Archimedean spiral.
+            maxAngle: Maximum angle.
+            size (optional): Size of lookup table.
+        """
+        if size < 2:
+            raise ValueError(f'size has to be at least 2, not {size}!')
+
+        self.spiral = spiral
+        self.maxAngle = maxAngle
+        self.maxArcLength = spiral.arc_length(maxAngle)
+        self.step = self.maxArcLength / (size - 1)
+
+        # Dense sampling of the monotonic angle -> arc length relation, inverted
+        # onto a uniform arc length grid
+        denseAngles = np.linspace(0., maxAngle, 8 * size)
+        arcLengths = np.linspace(0., self.maxArcLength, size)
+        self.lut: List[float] = np.interp(arcLengths, self.arc_lengths(denseAngles), denseAngles).tolist()
+
+    def arc_length(self, angle: float) -> float:
+        """Arc length for an angle."""
+        angle = min(max(angle, 0.), self.maxAngle)
+        a, b = self.spiral
+        root = math.sqrt(1. + angle * angle)
+        return .5 * b * (angle * root + math.asinh(angle)) + a * angle
+
+    def angle(self, arcLength: float) -> float:
+        """Angle for an arc length."""
+        if arcLength <= 0.:
+            return 0.
+
+        if arcLength >= self.maxArcLength:
+            return self.maxAngle
+
+        lut = self.lut
+        pos = arcLength / self.step
+        idx = min(int(pos), len(lut) - 2)  # Rounding right below maxArcLength
+        frac = pos - idx
+        phi = lut[idx] + frac * (lut[idx + 1] - lut[idx])
+
+        # Newton refinement
+        a, b = self.spiral
+        root = math.sqrt(1. + phi * phi)
+        err = .5 * b * (phi * root + math.asinh(phi)) + a * phi - arcLength
+        return phi - err / (a + b * root)
+
+    def arc_lengths(self, angles: ndarray) -> ndarray:
+        """Vectorized :meth:`SpiralMapping.arc_length`."""
+        angles = np.clip(angles, 0., self.maxAngle)
+        a, b = self.spiral
+        root = np.sqrt(1. + angles ** 2)
+        return .5 * b * (angles * root + np.arcsinh(angles)) + a * angles
+
+    def angles(self, arcLengths: ndarray) -> ndarray:
+        """Vectorized :meth:`SpiralMapping.angle`."""
+        arcLengths = np.clip(arcLengths, 0., self.maxArcLength)
+        phi = np.interp(arcLengths / self.step, np.arange(len(self.lut)), self.lut)
+        a, b = self.spiral
+        root = np.sqrt(1. + phi ** 2)
+        err = .5 * b * (phi * root + np.arcsinh(phi)) + a * phi - arcLengths
+        return phi - err / (a + b * root)
@@ -7,14 +7,14 @@ We do not use asyncio because we want to keep the core async free for now.
 """
 import abc
 import itertools
+import threading
 from typing import Optional, Dict, Any, Union
 
-import numpy as np
-
-from being.backends import CanBackend
+from being.backends import CanBackend, network_for_channel
+from being.can.batch import TargetBatch
 from being.block import Block
 from being.can import load_object_dictionary
-from being.can.cia_402 import CiA402Node, OperationMode
+from being.can.cia_402 import POSITION_ACTUAL_VALUE, TARGET_POSITION, CiA402Node, OperationMode
 from being.configuration import CONFIG
 from being.constants import TAU
 from being.kinematics import kinematic_filter, State as KinematicState
@@ -22,7 +22,7 @@ from being.logging import get_logger
 from being.math import ArchimedeanSpiral
 from being.motors.controllers import Controller, Mclm3002, Epos4
 from being.motors.definitions import MotorState, MotorEvent, MotorInterface
-from being.motors.homing import DummyHoming, HomingState
+from being.motors.homing import DummyHoming, HomingBase, HomingState
 from being.motors.motors import get_motor, Motor
 from being.resources import register_resource
 
@@ -30,6 +30,11 @@ from being.resources import register_resource
 INTERVAL = CONFIG['General']['INTERVAL']
 """General delta t interval."""
 
+_DEFAULT_NETWORK_LOCK = threading.Lock()
+"""Guards creation of the shared CAN networks when motors get initialized
+from multiple threads.
+"""
+
 CONTROLLER_TYPES: Dict[str, Controller] = {
     'MCLM3002P-CO': Mclm3002,
     'EPOS4': Epos4,
@@ -184,9 +189,17 @@ class CanMotor(MotorBlock):
     ...
     ... motor.subscribe(MotorEvent.ERROR, error_callback)
 
+    Target positions of plain cyclic position controllers go through the
+    vectorized target batch of the network (see
+    :class:`being.can.batch.TargetBatch`). Controllers which stop being
+    vectorizable later on (set-point generator, ...) fall back to the scalar
+    path, see :meth:`CanMotor.batched`.
+
     Attributes:
         controller (Controller): Motor controller.
         logger (Logger): CanMotor logger.
+        batch (Optional[TargetBatch]): Target batch of the network (if any).
+        slot (int): Slot in target batch.
     """
 
     def __init__(self,
@@ -199,6 +212,7 @@ class CanMotor(MotorBlock):
              node: Optional[CiA402Node] = None,
              objectDictionary=None,
              network: Optional[CanBackend] = None,
+             channel: Optional[str] = None,
              settings: Optional[Dict[str, Any]] = None,
              **controllerKwargs,
          ):
@@ -218,6 +232,8 @@ class CanMotor(MotorBlock):
             objectDictionary: Object dictionary for CAN node. If will be tried
                 to identified from known EDS files.
             network: External CAN network (dependency injection).
+            channel: CAN channel of the motor (e.g. 'can1') if not on the
+                default bus. Every channel gets its own network.
             settings: Motor settings. Dict of EDS variables -> Raw value to set.
                 EDS variable with path syntax (slash '/' separator) for nested
                 settings. Will be forwarded to the controller initialization
@@ -228,8 +244,9 @@ class CanMotor(MotorBlock):
         self.add_message_input('positionProfile')
 
         if network is None:
-            network = CanBackend.single_instance_setdefault()
-            register_resource(network, duplicates=False)
+            with _DEFAULT_NETWORK_LOCK:
+                network = network_for_channel(channel)
+                register_resource(network, duplicates=False)
 
         if node is None:
             if objectDictionary is None:
@@ -270,6 +287,43 @@ class CanMotor(MotorBlock):
         self.controller.subscribe(MotorEvent.ERROR, lambda msg: self.publish(MotorEvent.ERROR, msg))
         self.controller.subscribe(MotorEvent.HOMING_CHANGED, lambda: self.publish(MotorEvent.STATE_CHANGED))
 
+        self.batch = None
+        self.slot = -1
+        if self.controller.vectorizable:
+            self.init_batch(node.network.targetBatch)
+
+    def init_batch(self, batch: TargetBatch):
+        """Register controller in target batch."""
+        controller = self.controller
+        try:
+            with controller.node.network.setupLock:
+                self.slot = batch.add(
+                    target=controller.node.pdo[TARGET_POSITION],
+                    actual=controller.node.pdo[POSITION_ACTUAL_VALUE],
+                    factor=self.multiplier * controller.position_si_2_device,
+                    lower=controller.lower,
+                    upper=controller.upper,
+                    active=controller.homing.homed,
+                )
+        except (KeyError, ValueError) as err:
+            self.logger.warning('Falling back to scalar target positions (%s)', err)
+            return
+
+        self.batch = batch
+
+    def batched(self) -> bool:
+        """If the target position of this cycle goes through the target batch.
+        The controller gets re-checked every cycle. Otherwise the slot gets
+        deactivated so that the flush does not overwrite the scalar target
+        position. Only homed motors take target positions.
+        """
+        if self.batch is None:
+            return False
+
+        vectorizable = self.controller.vectorizable
+        self.batch.active[self.slot] = vectorizable and self.controller.homing.homed
+        return vectorizable
+
     def enable(self, publish: bool = False):
         self.controller.enable()
 
@@ -279,6 +333,11 @@ class CanMotor(MotorBlock):
     def motor_state(self):
         return self.controller.motor_state()
 
+    @property
+    def homing(self) -> HomingBase:
+        """Homing of the controller."""
+        return self.controller.homing
+
     def home(self):
         self.controller.home()
         super().home()
@@ -294,8 +353,12 @@ class CanMotor(MotorBlock):
         for profile in self.positionProfile.receive():
             self.controller.play_position_profile(profile)
 
-        self.controller.set_target_position(self.multiplier * self.targetPosition.value)
-        self.output.value = self.controller.get_actual_position() / self.multiplier
+        if self.batched():
+            self.batch.targets[self.slot] = self.targetPosition.value
+            self.output.value = self.batch.actual_position(self.slot)
+        else:
+            self.controller.set_target_position(self.multiplier * self.targetPosition.value)
+            self.output.value = self.controller.get_actual_position() / self.multiplier
 
     def to_dict(self):
         dct = super().to_dict()
@@ -403,21 +466,26 @@ class WindupMotor(CanMotor):
         super().__init__(nodeId, motor, length=phiEst, **kwargs)
         self.length = length  # Overwrite length (=phiEst) sine we are doing our own transformation
 
-        # xp, yp for linear position <-> angle target position interpolation
-        self.angles = np.linspace(0, phiEst, 100)
-        self.positions = np.array([spiral.arc_length(phi) for phi in self.angles])
+        self.mapping = spiral.mapping(phiEst)
+        """Arc length <-> angle mapping."""
 
     def update(self):
         self.controller.update()
         for profile in self.positionProfile.receive():
-            adjustedPos = np.interp(profile.position, self.positions, self.angles)
+            adjustedPos = self.mapping.angle(profile.position)
             adjustedProfile = profile._replace(position=adjustedPos)
             self.controller.play_position_profile(adjustedProfile)
 
-        pos = np.interp(self.targetPosition.value, self.positions, self.angles)
-        self.controller.set_target_position(pos)
-        actual = np.interp(self.controller.get_actual_position(), self.angles, self.positions)
-        self.output.value = actual
+        angle = self.mapping.angle(self.targetPosition.value)
+        if self.batched():
+            # Batch factor includes the multiplier. Angles do not
+            self.batch.targets[self.slot] = angle / self.multiplier
+            actual = self.multiplier * self.batch.actual_position(self.slot)
+        else:
+            self.controller.set_target_position(angle)
+            actual = self.controller.get_actual_position()
+
+        self.output.value = self.mapping.arc_length(actual)
 
     def to_dict(self):
         dct = super().to_dict()
@@ -0,0 +1,71 @@
+"""Concurrent bring-up of many CAN motors.
+
+Setting up a single :class:`being.motors.blocks.CanMotor` takes a few hundred
+blocking SDO round trips (object dictionary, PDO maps, settings, error
+history, state changes). Done one motor after the other this adds up for
+larger pieces. SDO transfers to different nodes are independent of each other
+so all motors can be brought up at the same time. Each motor gets configured
+in its own worker thread and the SDO requests to the different node ids get
+interleaved on the bus. Changes of the shared network setup (nodes,
+subscriptions, target batch) are guarded by
+:attr:`being.backends.CanBackend.setupLock`.
+
+Example:
+    >>> motors = bring_up(
+    ...     functools.partial(LinearMotor, nodeId, length=0.100)
+    ...     for nodeId in network.scan_for_node_ids()
+    ... )
+"""
+import concurrent.futures
+from typing import Callable, Iterable, List, Optional
+
+from being.configuration import CONFIG
+from being.logging import get_logger
+from being.motors.blocks import CanMotor
+
+
+MAX_WORKERS: int = CONFIG['Can']['BRING_UP_WORKERS']
+"""Maximum number of motors brought up at the same time."""
+
+LOGGER = get_logger(name=__name__, parent=None)
+
+
+def bring_up(
+        factories: Iterable[Callable[[], CanMotor]],
+        maxWorkers: int = MAX_WORKERS,
+        ignoreErrors: bool = False,
+    ) -> List[Optional[CanMotor]]:
+    """Create multiple CAN motors concurrently. Each factory gets called in a
+    worker thread.
+
+    Args:
+        factories: Motor factories. Typically motor block classes with bound
+            arguments.
+        maxWorkers (optional): Maximum number of concurrent bring-ups.
+        ignoreErrors (optional): If True log failed bring-ups and return None
+            for them instead of raising the first error.
+
+    Returns:
+        Motors in the same order as the factories.
+    """
+    factories = list(factories)
+    if not factories:
+        return []
+
+    LOGGER.info('Bringing up %d motors', len(factories))
+    workers = max(1, min(maxWorkers, len(factories)))
+    with concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='BringUp') as executor:
+        futures = [executor.submit(factory) for factory in factories]
+
+    motors = []
+    for future in futures:
+        err = future.exception()
+        if err is None:
+            motors.append(future.result())
+        elif ignoreErrors:
+            LOGGER.error('Bring-up failed: %s', err)
+            motors.append(None)
+        else:
+            raise err
+
+    return motors
@@ -2,19 +2,24 @@
 import abc
 import sys
 import warnings
-from typing import Optional, Set, List
+from typing import Dict, Iterable, List, Optional, Set, Union
 
 from canopen.emcy import EmcyError
 
 from being.bitmagic import clear_bit, set_bit
-from being.can.cia_402 import CiA402Node, HOMING_METHOD, OperationMode, State, StateSwitching
+from being.can.cia_402 import (
+    CiA402Node, HOMING_METHOD, MAX_PROFILE_VELOCITY, PROFILE_ACCELERATION, OperationMode, State,
+    StateSwitching,
+)
 from being.configuration import CONFIG
-from being.constants import FORWARD
+from being.constants import FORWARD, INF
 from being.logging import get_logger
 from being.math import clip
 from being.motors.definitions import MotorInterface, MotorState, MotorEvent, PositionProfile, VelocityProfile
 from being.motors.homing import CiA402Homing, CrudeHoming, default_homing_method
 from being.motors.motors import Motor
+from being.motors.setpoints import SetPointGenerator
+from being.records import JsonRecord, shared_record
 from being.motors.vendor import (
     FAULHABER_EMERGENCY_DESCRIPTIONS,
     FAULHABER_SUPPORTED_HOMING_METHODS,
@@ -22,10 +27,14 @@ from being.motors.vendor import (
     MAXON_SUPPORTED_HOMING_METHODS,
     MaxonDigitalInput,
 )
+from being.resources import add_callback
 from being.utils import merge_dicts
 
 
 INTERVAL = CONFIG['General']['INTERVAL']
+HOMING_RECORD_FILEPATH = CONFIG['Can']['HOMING_RECORD_FILEPATH']
+"""Homing results per drive. Only in memory if None."""
+
 LOGGER = get_logger(name=__name__, parent=None)
 
 
@@ -92,6 +101,8 @@ class Controller(MotorInterface):
         upper (int): Upper clipping value for target position in device units.
         lastState (being.can.cia_402.State): Last receive state of motor controller.
         switchJob (Optional[StateSwitching]): Ongoing state switching job.
+        setPoints (Optional[SetPointGenerator]): Set-point generator (if any).
+        velocityFeedForward (bool): Velocity feed-forward via velocity offset.
     """
 
     EMERGENCY_DESCRIPTIONS: List[tuple] = []
@@ -109,6 +120,10 @@ class Controller(MotorInterface):
             direction: int = FORWARD,
             settings: Optional[dict] = None,
             operationMode: OperationMode = OperationMode.CYCLIC_SYNCHRONOUS_POSITION,
+            storeSettings: bool = False,
+            processData: Iterable[Union[int, str]] = (),
+            setPointGenerator: bool = False,
+            homingRecord: Optional[JsonRecord] = None,
             **homingKwargs,
         ):
         """Args:
@@ -118,12 +133,26 @@ class Controller(MotorInterface):
             direction: Movement direction.
             settings: Motor settings.
             operationMode: Operation mode for node.
+            storeSettings: Store settings in non-volatile memory of the node.
+                Drives with unchanged settings get skipped on the next start.
+            processData: Additional objects to receive via TxPDO with every
+                SYNC (e.g. 'Digital Inputs'). See
+                :meth:`being.can.cia_402.CiA402Node.add_process_data`.
+            setPointGenerator: Send set-points with velocity feed-forward and
+                extrapolate them when the main cycle is late. Only for cyclic
+                synchronous position mode.
+            homingRecord: Homing record for resuming homings on the next
+                start. Shared record of :data:`HOMING_RECORD_FILEPATH` by
+                default.
             **homingKwargs: Homing parameters.
         """
         # Defaults
         if settings is None:
             settings = {}
 
+        if homingRecord is None:
+            homingRecord = shared_record(HOMING_RECORD_FILEPATH)
+
         super().__init__()
 
         # Attrs
@@ -140,23 +169,36 @@ class Controller(MotorInterface):
         self.upper = length * self.position_si_2_device
         self.lastState = node.get_state()
         self.switchJob = None
+        self.operationMode = operationMode
+        self.setPoints = None
+        self.velocityFeedForward = False
+        self.homingRecord = homingRecord
 
         # Prepare settings
         self.settings = merge_dicts(self.motor.defaultSettings, settings)
 
         self.init_homing(**homingKwargs)
+        if self.lastState is State.FAULT:
+            self.homing.invalidate()
+        else:
+            self.homing.resume()
+
+        add_callback(self.homing.persist)
+        self.node.add_process_data(*processData)
 
         # Possible fault reset
         self.node.change_state(State.SWITCH_ON_DISABLED, 'sdo')
 
         # Configure node
         self.apply_motor_direction(direction)
-        self.node.apply_settings(self.settings)
+        self.node.apply_settings(self.settings, store=storeSettings)
         for errMsg in self.error_history_messages():
             self.logger.error(errMsg)
 
         self.disable()
         self.node.set_operation_mode(operationMode)
+        if setPointGenerator and operationMode is OperationMode.CYCLIC_SYNCHRONOUS_POSITION:
+            self.init_set_point_generator()
 
     def disable(self):
         self.switchJob = self.node.state_switching_job(State.READY_TO_SWITCH_ON, how='pdo')
@@ -192,9 +234,23 @@ class Controller(MotorInterface):
         if method not in self.SUPPORTED_HOMING_METHODS:
             raise ValueError(f'Homing method {method} not supported for controller {self}')
 
-        self.homing = CiA402Homing(self.node)
+        self.homing = CiA402Homing(self.node, record=self.homingRecord)
         self.node.sdo[HOMING_METHOD].raw = method
 
+    def init_set_point_generator(self):
+        """Setup set-point generator with the kinematic limits of the drive.
+        Velocity feed-forward and drive side interpolation where supported.
+        """
+        maxVelocity = self.node.sdo[MAX_PROFILE_VELOCITY].raw or INF
+        maxAcceleration = self.node.sdo[PROFILE_ACCELERATION].raw or INF
+        self.setPoints = SetPointGenerator(
+            maxVelocity=maxVelocity * self.position_si_2_device / self.velocity_si_2_device,
+            maxAcceleration=maxAcceleration * self.position_si_2_device / self.acceleration_si_2_device,
+        )
+        self.velocityFeedForward = self.node.enable_velocity_feed_forward()
+        self.node.set_interpolation_time_period(INTERVAL)
+        self.node.network.extrapolators.append(self.extrapolate_set_point)
+
     @abc.abstractmethod
     def apply_motor_direction(self, direction: float):
         """Configure direction or orientation of controller / motor."""
@@ -214,12 +270,63 @@ class Controller(MotorInterface):
             code = int.from_bytes(raw[:2], 'little')
             yield format_error_code(code, self.EMERGENCY_DESCRIPTIONS)
 
+    def plain_set_points(self) -> bool:
+        """If the set-points are plain clipped target positions (cyclic
+        synchronous position mode without set-point generator).
+        """
+        return self.operationMode is OperationMode.CYCLIC_SYNCHRONOUS_POSITION and self.setPoints is None
+
+    @property
+    def vectorizable(self) -> bool:
+        """If the target positions can go through the vectorized target batch
+        of the network. Only for plain set-points and only if
+        :meth:`Controller.set_target_position` is not overridden (subclasses
+        have to opt in again). Gets re-checked every cycle.
+        """
+        return type(self).set_target_position is Controller.set_target_position and self.plain_set_points()
+
+    def write_set_point(self, position: float, velocity: float = 0.):
+        """Write position set-point and velocity feed-forward in device
+        (position) units.
+        """
+        self.node.set_target_position(position)
+        if self.velocityFeedForward:
+            self.node.set_velocity_offset(velocity * self.velocity_si_2_device / self.position_si_2_device)
+
+    def send_set_point(self, position: float):
+        """Send position set-point in device units. Through the set-point
+        generator if enabled.
+        """
+        if self.setPoints is None:
+            self.node.set_target_position(position)
+        else:
+            self.write_set_point(*self.setPoints.set_target(position))
+
+    def extrapolate_set_point(self):
+        """Extrapolate set-point for a late main cycle. Called from the
+        pacemaker thread (RPDO lock held). Goes directly into the staged RPDO
+        data, the main cycle might be writing the RPDO maps at the same time.
+        """
+        if self.lastState is not State.OPERATION_ENABLED or not self.homing.homed:
+            return
+
+        setPoint = self.setPoints.extrapolate()
+        if setPoint is None:
+            return
+
+        position, velocity = setPoint
+        network = self.node.network
+        network.stage_value(self.node.targetPositionField, clip(position, self.lower, self.upper))
+        if self.velocityFeedForward:
+            velocity *= self.velocity_si_2_device / self.position_si_2_device
+            network.stage_value(self.node.velocityOffsetField, velocity)
+
     def set_target_position(self, targetPosition):
         """Set target position in SI units."""
         if self.homing.homed:
             dev = targetPosition * self.position_si_2_device
             clipped = clip(dev, self.lower, self.upper)
-            self.node.set_target_position(clipped)
+            self.send_set_point(clipped)
 
     def get_actual_position(self) -> float:
         """Get actual position in SI units."""
@@ -278,6 +385,11 @@ class Controller(MotorInterface):
         state = self.node.get_state('pdo')
         if self.state_changed(state):
             self.publish(MotorEvent.STATE_CHANGED)
+            if self.setPoints is not None:
+                self.setPoints.reset()
+
+            if state is State.FAULT:
+                self.homing.invalidate()
 
         if state is State.FAULT:
             self.publish_errors()
@@ -332,7 +444,13 @@ class Mclm3002(Controller):
         if method in self.HARD_STOP_HOMING:
             minWidth = self.position_si_2_device * self.length
             currentLimit = self.settings['Current Control Parameter Set/Continuous Current Limit']
-            self.homing = CrudeHoming(self.node, minWidth, homingMethod=method, currentLimit=currentLimit)
+            self.homing = CrudeHoming(
+                self.node,
+                minWidth,
+                homingMethod=method,
+                currentLimit=currentLimit,
+                record=self.homingRecord,
+            )
         else:
             super().init_homing(homingMethod=method)
 
@@ -364,6 +482,15 @@ class Epos4(Controller):
     EMERGENCY_DESCRIPTIONS = MAXON_EMERGENCY_DESCRIPTIONS
     SUPPORTED_HOMING_METHODS = MAXON_SUPPORTED_HOMING_METHODS
 
+    DIGITAL_INPUTS_NONE: Dict[str, int] = {
+        f'Configuration of digital inputs/{subindex}': MaxonDigitalInput.NONE
+        for subindex in range(1, 9)
+    }
+    """Settings for unsetting all digital inputs. Since a settings dictionary
+    can not have two entries for the same input (e.g. unset and then set to
+    HOME_SWITCH) user settings get merged on top of these.
+    """
+
     def __init__(self,
             node: CiA402Node,
             *args,
@@ -388,7 +515,8 @@ class Epos4(Controller):
             )
             operationMode = OperationMode.CYCLIC_SYNCHRONOUS_VELOCITY
 
-        self.set_all_digital_inputs_to_none(node)  # Before apply_settings_to_node
+        # Reset all digital inputs. Entries in settings take precedence
+        kwargs['settings'] = merge_dicts(self.DIGITAL_INPUTS_NONE, kwargs.get('settings') or {})
         super().__init__(node, *args, operationMode=operationMode, **kwargs)
         self.usePositionController = usePositionController
         self.recoverRpdoTimeoutError = recoverRpdoTimeoutError
@@ -423,20 +551,33 @@ class Epos4(Controller):
 
     @staticmethod
     def set_all_digital_inputs_to_none(node):
-        """Set all digital inputs of Epos4 controller to none by default.
-        Reason: Because of settings dictionary it is not possible to have two
-        entries. E.g. unset and then set to HOME_SWITCH.
+        """Set all digital inputs of Epos4 controller to none.
+
+        Warning:
+            Deprecated! Digital inputs get reset through the settings now (see
+            :attr:`Epos4.DIGITAL_INPUTS_NONE`).
         """
+        msg = (
+            'Epos4.set_all_digital_inputs_to_none() is deprecated. Digital'
+            ' inputs get reset via the settings (Epos4.DIGITAL_INPUTS_NONE).'
+        )
+        warnings.warn(msg, DeprecationWarning, stacklevel=2)
         for subindex in range(1, 9):
             node.sdo['Configuration of digital inputs'][subindex].raw = MaxonDigitalInput.NONE
 
+    @property
+    def vectorizable(self) -> bool:
+        # Same set-points as Controller.set_target_position() with the drive's
+        # position controller
+        return self.usePositionController and self.plain_set_points()
+
     def set_target_position(self, targetPosition):
         if self.homing.homed:
             dev = targetPosition * self.position_si_2_device
             posSoll = clip(dev, self.lower, self.upper)
 
             if self.usePositionController:
-                self.node.set_target_position(posSoll)
+                self.send_set_point(posSoll)
             else:
                 posIst = self.node.get_actual_position()
                 self.node.set_target_position(posSoll)
@@ -1,36 +1,66 @@
 """Homing procedures and definitions."""
 import abc
+import collections
 import enum
 import itertools
 import random
 import time
-from typing import Generator, Callable, Optional
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Set, Union
 
+from canopen.sdo.exceptions import SdoError
 from canopen.variable import Variable
 
 from being.bitmagic import check_bit_mask
 from being.can.cia_402 import (
-    CONTROLWORD,
     CW,
+    CURRENT_ACTUAL_VALUE,
     Command,
+    HOME_OFFSET,
     MODES_OF_OPERATION,
+    MODES_OF_OPERATION_DISPLAY,
     NEGATIVE,
     OperationMode,
+    POSITION_ACTUAL_VALUE,
     POSITIVE,
-    STATUSWORD,
     SW,
     State as CiA402State,
     UNDEFINED,
     determine_homing_method
 )
+from being.can.pdo import PdoField
+from being.can.settings_sync import drive_key
+from being.configuration import CONFIG
 from being.constants import INF
 from being.logging import get_logger
+from being.records import JsonRecord
 from being.serialization import register_enum
 from being.utils import toss_coin
 
 
 LOGGER = get_logger(name=__name__, parent=None)
 
+RawVariable = Union[Variable, PdoField]
+"""canopen variable or direct PDO accessor."""
+
+INTERVAL = CONFIG['General']['INTERVAL']
+"""General delta t interval."""
+
+HOMING_BATCH_SIZE = CONFIG['Can']['HOMING_BATCH_SIZE']
+"""Maximum number of concurrent homing jobs."""
+
+HOMING_SDO_STEPS_PER_CYCLE = CONFIG['Can']['HOMING_SDO_STEPS_PER_CYCLE']
+"""Maximum number of homing steps per cycle which start SDO transfers."""
+
+POSITION_TOLERANCE = CONFIG['Can']['HOMING_POSITION_TOLERANCE']
+"""Maximum position deviation in device units for a recorded homing to stay
+valid.
+"""
+
+HOMING_MARKER = CONFIG['Can']['HOMING_MARKER']
+"""Volatile object of the drives which proves that they were not power cycled
+since the homing got recorded. The home offset alone does not, it survives a
+power cycle.
+"""
 
 class HomingState(enum.Enum):
 
@@ -70,11 +100,11 @@ def default_homing_method(
             return determine_homing_method(direction=NEGATIVE, hardStop=True, indexPulse=indexPulse)
 
 
-def start_homing(controlword: Variable) -> Generator:
+def start_homing(controlword: RawVariable) -> Generator:
     """Start homing procedure for node.
 
     Args:
-        controlword: canopen control word variable.
+        controlword: Control word variable.
     """
     LOGGER.info('start_homing()')
     # Controlword bit 4 has to go from 0 -> 1
@@ -83,11 +113,11 @@ def start_homing(controlword: Variable) -> Generator:
     controlword.raw = Command.ENABLE_OPERATION | CW.START_HOMING_OPERATION
 
 
-def stop_homing(controlword: Variable) -> Generator:
+def stop_homing(controlword: RawVariable) -> Generator:
     """Stop homing procedure for node.
 
     Args:
-        controlword: canopen control word variable.
+        controlword: Control word variable.
     """
     LOGGER.info('stop_homing()')
     # Controlword bit has to go from 1 -> 0
@@ -96,29 +126,29 @@ def stop_homing(controlword: Variable) -> Generator:
     controlword.raw = Command.ENABLE_OPERATION
 
 
-def homing_started(statusword: Variable) -> bool:
+def homing_started(statusword: RawVariable) -> bool:
     """Check if homing procedure has started.
 
     Args:
-        statusword: canopen status word variable.
+        statusword: Status word variable.
     """
     sw = statusword.raw
     started = not check_bit_mask(sw, SW.HOMING_ATTAINED) and not check_bit_mask(sw, SW.TARGET_REACHED)
     return started
 
 
-def homing_ended(statusword: Variable) -> bool:
+def homing_ended(statusword: RawVariable) -> bool:
     """Check if homing procedure has ended.
 
     Args:
-        statusword: canopen status word variable.
+        statusword: Status word variable.
     """
     sw = statusword.raw
     ended = check_bit_mask(sw, SW.HOMING_ATTAINED) and check_bit_mask(sw, SW.TARGET_REACHED)
     return ended
 
 
-def homing_reference_run(statusword: Variable) -> Generator:
+def homing_reference_run(statusword: RawVariable) -> Generator:
     """Travel down homing road.
 
     Args:
@@ -133,12 +163,30 @@ def homing_reference_run(statusword: Variable) -> Generator:
 
 class HomingBase(abc.ABC):
 
-    """Abstract homing base class."""
+    """Abstract homing base class.
 
-    def __init__(self):
+    Attributes:
+        priority: Scheduling priority. Homings with higher priority start
+            first.
+        dependencies: Other homings which have to be done before this one
+            can start.
+        scheduler: Homing scheduler (if any). Unscheduled homings start
+            right away.
+        record: Homing record for persisting the homing results (if any).
+    """
+
+    def __init__(self, record: Optional[JsonRecord] = None):
+        """Args:
+            record (optional): Homing record. Successful homings get persisted
+                and can be resumed on the next start.
+        """
         self.state = HomingState.UNHOMED
         self.job = None
         self.logger = get_logger('Homing')
+        self.priority: int = 0
+        self.dependencies: Set['HomingBase'] = set()
+        self.scheduler: Optional['HomingScheduler'] = None
+        self.record = record
 
     @property
     def ongoing(self) -> bool:
@@ -150,6 +198,74 @@ class HomingBase(abc.ABC):
         """True if homing in progress."""
         return self.state is HomingState.HOMED
 
+    def record_key(self) -> Optional[str]:
+        """Key of the homing in the homing record. None if the homing can not
+        be persisted.
+        """
+        return None
+
+    def snapshot(self) -> dict:
+        """Homing results to persist."""
+        return {}
+
+    def verify(self, snapshot: dict) -> bool:
+        """Check if persisted homing results are still valid. Apply them if
+        so.
+
+        Args:
+            snapshot: Recorded homing results.
+        """
+        return False
+
+    def persist(self):
+        """Record the homing results of a homed homing."""
+        if self.record is None or not self.homed:
+            return
+
+        key = self.record_key()
+        if key is not None:
+            self.record.set(key, self.snapshot())
+
+    def invalidate(self):
+        """Forget the recorded homing results."""
+        if self.record is None:
+            return
+
+        key = self.record_key()
+        if key is not None and self.record.get(key) is not None:
+            self.record.set(key, None)
+
+    def resume(self) -> bool:
+        """Resume from the recorded homing results if the drive retained its
+        position since they got recorded.
+
+        Returns:
+            True if homed.
+        """
+        if self.record is None:
+            return False
+
+        key = self.record_key()
+        snapshot = None if key is None else self.record.get(key)
+        if snapshot is None:
+            return False
+
+        if not self.verify(snapshot):
+            self.logger.info('Recorded homing is no longer valid')
+            self.invalidate()
+            return False
+
+        self.logger.info('Resuming recorded homing')
+        self.state = HomingState.HOMED
+        return True
+
+    def sdo_slot(self) -> Generator:
+        """Wait for the scheduler to permit the next SDO transfer. Has to
+        precede every homing step which talks SDO.
+        """
+        if self.scheduler:
+            yield from self.scheduler.sdo_slot()
+
     def teardown(self) -> Generator:
         """Tear down logic. Will be used to abort an ongoing homing job."""
         return
@@ -168,19 +284,38 @@ class HomingBase(abc.ABC):
         else:
             self.job = self.homing_job()
 
+        self.invalidate()
         self.state = HomingState.ONGOING
+        if self.scheduler:
+            self.scheduler.enqueue(self)
 
     def update(self):
-        """Tick homing one step further."""
+        """Tick homing one step further. Scheduled homings wait until the
+        scheduler admits them.
+        """
+        if self.scheduler and not self.scheduler.admitted(self):
+            return
+
         if self.job:
             try:
                 next(self.job)
             except StopIteration:
                 self.job = None
-            except TimeoutError as err:
+            except (TimeoutError, SdoError) as err:
                 self.job = None
+                self.state = HomingState.FAILED
                 self.logger.exception(err)
 
+            if self.job is None:
+                if self.homed:
+                    try:
+                        self.persist()
+                    except Exception as err:
+                        self.logger.error('Could not persist homing (%s)', err)
+
+                if self.scheduler:
+                    self.scheduler.release(self)
+
     def __str__(self):
         return f'{type(self).__name__}({self.state})'
 
@@ -225,32 +360,153 @@ class DummyHoming(HomingBase):
 
 class CiA402Homing(HomingBase):
 
-    """CiA 402 by the book."""
+    """CiA 402 by the book.
 
-    def __init__(self, node, timeout=10.0, **kwargs):
-        super().__init__()
+    Recorded homings only get resumed with positive proof that the drive was
+    not power cycled in the meantime. At the end of a successful homing job a
+    random nonce gets written to a volatile marker object of the drive (see
+    :data:`HOMING_MARKER`) which is recorded as well. On resume the marker has
+    to match. It gets overwritten with a fresh nonce right away so that a
+    stored copy (e.g. by storing the settings) can not fake the proof later on.
+
+    The drive gets identified once when constructing the homing (blocking SDO
+    reads). Afterwards persisting and invalidating do not talk to the drive.
+    """
+
+    RESUME_WITHOUT_MARKER = False
+    """If recorded homings can be resumed without marker object."""
+
+    def __init__(self,
+            node,
+            timeout=10.0,
+            record: Optional[JsonRecord] = None,
+            marker: Union[None, int, str] = HOMING_MARKER,
+            **kwargs,
+        ):
+        super().__init__(record)
         self.node = node
         self.timeout = timeout
+        self.marker = marker
         self.homingMethod = default_homing_method(**kwargs)
 
         self.logger = get_logger(f'CiA402Homing(nodeId: {node.id})')
-        self.statusword = node.pdo[STATUSWORD]
-        self.controlword = node.pdo[CONTROLWORD]
+        self.statusword = node.statuswordField
+        self.controlword = node.controlwordField
         self.oldState = None
         self.oldOp = None
         self.endTime = -1
+        self.homeOffset = None
+        self.nonce: Optional[int] = None
+        self.recordKey = None if record is None else self.identify_drive()
+
+    def identify_drive(self) -> Optional[str]:
+        """Determine record key of the drive. None if the drive can not be
+        identified.
+        """
+        try:
+            return drive_key(self.node)
+        except SdoError as err:
+            self.logger.warning('Could not identify drive (%s)', err)
+            return None
+
+    def record_key(self):
+        return self.recordKey
+
+    def snapshot(self):
+        return {
+            'position': int(self.node.get_actual_position()),
+            'homeOffset': self.homeOffset,
+            'marker': self.nonce,
+        }
+
+    def mark(self) -> Generator:
+        """Write a fresh nonce to the marker object (if any). Last step of a
+        successful homing job. The nonce gets recorded with the next snapshot.
+        """
+        self.nonce = None
+        if self.marker is None:
+            return
+
+        nonce = random.randint(1, 0x7FFF)
+        yield from self.sdo_slot()
+        try:
+            yield from self.node.asyncSdo.write(self.marker, nonce).wait()
+        except (KeyError, SdoError) as err:
+            self.logger.warning('Could not write homing marker (%s)', err)
+            return
+
+        self.nonce = nonce
+
+    def write_marker(self) -> Optional[int]:
+        """Write a fresh nonce to the marker object (if any). Blocking, only
+        for resuming.
+
+        Returns:
+            Nonce. None if there is no marker.
+        """
+        if self.marker is None:
+            return None
+
+        nonce = random.randint(1, 0x7FFF)
+        try:
+            self.node.sdo[self.marker].raw = nonce
+        except (KeyError, SdoError) as err:
+            self.logger.warning('Could not write homing marker (%s)', err)
+            return None
+
+        return nonce
+
+    def verify_marker(self, snapshot: dict) -> bool:
+        """Check that the drive was not power cycled since the snapshot."""
+        nonce = snapshot.get('marker')
+        if nonce is None:
+            return self.RESUME_WITHOUT_MARKER
+
+        try:
+            valid = self.node.sdo[self.marker].raw == nonce
+        except (KeyError, SdoError) as err:
+            self.logger.warning('Could not read homing marker (%s)', err)
+            return False
+
+        self.nonce = self.write_marker()  # Single use
+        return valid
+
+    def verify(self, snapshot):
+        if not self.verify_marker(snapshot):
+            return False
+
+        try:
+            position = self.node.sdo[POSITION_ACTUAL_VALUE].raw
+            homeOffset = self.read_home_offset()
+        except SdoError as err:
+            self.logger.warning('Could not verify recorded homing (%s)', err)
+            return False
+
+        return (
+            abs(position - snapshot['position']) <= POSITION_TOLERANCE
+            and homeOffset == snapshot['homeOffset']
+        )
+
+    def read_home_offset(self) -> Optional[int]:
+        """Read home offset of node via SDO (if any)."""
+        if HOME_OFFSET not in self.node.object_dictionary:
+            return None
+
+        return self.node.sdo[HOME_OFFSET].raw
 
     def change_state(self, target) -> Generator:
         """Change to node's state job."""
         return self.node.state_switching_job(target, how='pdo')
 
-    def capture(self):
+    def capture(self) -> Generator:
         """Capture current node's state and operation mode."""
         self.logger.debug('capture()')
         self.oldState = self.node.get_state('pdo')
-        self.oldOp = self.node.get_operation_mode()
+        yield from self.sdo_slot()
+        op = yield from self.node.asyncSdo.read(MODES_OF_OPERATION_DISPLAY).wait()
+        self.oldOp = OperationMode(op)
 
-    def restore(self):
+    def restore(self) -> Generator:
         """Restore node's state and operation mode."""
         self.logger.debug('restore()')
         if self.oldState is None or self.oldOp is None:
@@ -259,7 +515,8 @@ class CiA402Homing(HomingBase):
         self.logger.debug('Restoring oldState: %s, oldOp: %s', self.oldState, self.oldOp)
         yield from self.change_state(CiA402State.SWITCHED_ON)
         self.logger.debug('Setting operation mode %s', self.oldOp)
-        self.node.sdo[MODES_OF_OPERATION].raw = self.oldOp
+        yield from self.sdo_slot()
+        yield from self.node.asyncSdo.write(MODES_OF_OPERATION, self.oldOp).wait()
         yield from self.change_state(self.oldState)
         self.oldState = self.oldOp = None
         self.logger.debug('Done with restoring')
@@ -281,10 +538,11 @@ class CiA402Homing(HomingBase):
         self.logger.debug('homing_job()')
         startTime = time.perf_counter()
         self.endTime = startTime + self.timeout
-        self.capture()
+        yield from self.capture()
         yield from self.change_state(CiA402State.SWITCHED_ON)
         self.logger.debug('Setting operation mode %s', OperationMode.HOMING)
-        self.node.sdo[MODES_OF_OPERATION].raw = OperationMode.HOMING
+        yield from self.sdo_slot()
+        yield from self.node.asyncSdo.write(MODES_OF_OPERATION, OperationMode.HOMING).wait()
         yield from start_homing(self.controlword)
         self.final = HomingState.UNHOMED
         self.logger.debug('homing reference run')
@@ -298,6 +556,13 @@ class CiA402Homing(HomingBase):
             final = HomingState.HOMED
 
         yield from self.teardown()
+        if final is HomingState.HOMED:
+            if HOME_OFFSET in self.node.object_dictionary:
+                yield from self.sdo_slot()
+                self.homeOffset = yield from self.node.asyncSdo.read(HOME_OFFSET).wait()
+
+            yield from self.mark()
+
         self.state = final
 
     def __str__(self):
@@ -311,10 +576,13 @@ class CrudeHoming(CiA402Homing):
         speed: Speed for homing in device units.
     """
 
+    RESUME_WITHOUT_MARKER = True
+
     def __init__(self, node, minWidth, currentLimit, *args, **kwargs):
         super().__init__(node, *args, **kwargs)
         self.minWidth = minWidth
         self.currentLimit = currentLimit
+        node.add_process_data(CURRENT_ACTUAL_VALUE)
         self.lower = INF
         self.upper = -INF
 
@@ -323,6 +591,20 @@ class CrudeHoming(CiA402Homing):
         """Current homing width in device units."""
         return self.upper - self.lower
 
+    def snapshot(self):
+        snapshot = super().snapshot()
+        snapshot['lower'] = self.lower
+        snapshot['upper'] = self.upper
+        return snapshot
+
+    def verify(self, snapshot):
+        if not super().verify(snapshot):
+            return False
+
+        self.lower = snapshot['lower']
+        self.upper = snapshot['upper']
+        return True
+
     def reset_range(self):
         """Reset homing range."""
         self.lower = INF
@@ -349,9 +631,11 @@ class CrudeHoming(CiA402Homing):
         self.controlword.raw = Command.ENABLE_OPERATION | CW.NEW_SET_POINT
         yield
 
-    def on_the_wall(self) -> bool:
-        """Check if motor is on the wall."""
-        current = self.node.sdo['Current Actual Value'].raw
+    def on_the_wall(self) -> Generator[None, None, bool]:
+        """Check if motor is on the wall. Yields until the current value
+        arrived.
+        """
+        current = yield from self.node.process_value_job(CURRENT_ACTUAL_VALUE)
         return current > self.currentLimit  # Todo: Add percentage threshold?
 
     def teardown(self):
@@ -363,7 +647,6 @@ class CrudeHoming(CiA402Homing):
         self.lower = INF
         self.upper = -INF
         node = self.node
-        sdo = self.node.sdo
         if self.homingMethod in {-1, -3}:
             # Forward direction
             velocities = [speed, -speed]
@@ -371,17 +654,20 @@ class CrudeHoming(CiA402Homing):
             # Backward direction
             velocities = [-speed, speed]
 
-        self.capture()
+        yield from self.capture()
 
         yield from self.change_state(CiA402State.READY_TO_SWITCH_ON)
-        sdo['Home Offset'].raw = 0
-        node.set_operation_mode(OperationMode.PROFILE_VELOCITY)
+        yield from self.sdo_slot()
+        yield from node.asyncSdo.write(HOME_OFFSET, 0).wait()
+        self.homeOffset = 0
+        yield from self.sdo_slot()
+        yield from node.operation_mode_switching_job(OperationMode.PROFILE_VELOCITY)
 
         for vel in velocities:
             yield from self.halt_drive()
             yield from self.move_drive(vel)
             self.logger.debug('Driving towards the wall')
-            while not self.on_the_wall():
+            while not (yield from self.on_the_wall()):
                 self.expand_range(node.get_actual_position())
                 yield
 
@@ -406,6 +692,171 @@ class CrudeHoming(CiA402Homing):
             self.lower += margin
             self.upper -= margin
 
-            sdo['Home Offset'].raw = self.lower
+            yield from self.sdo_slot()
+            yield from node.asyncSdo.write(HOME_OFFSET, self.lower).wait()
+            self.homeOffset = int(self.lower)
+            yield from self.mark()
 
         self.state = final
+
+
+class HomingScheduler:
+
+    """Coordinates the homing jobs of many motors. Queued homings get admitted
+    in priority order (FIFO for equal priorities) once all their dependencies
+    are done. At most :attr:`batchSize` homings run concurrently (e.g. to keep
+    hard stop runs from overloading the power supply), as soon as one finishes
+    the next one starts. SDO steps of the running jobs are throttled to
+    :attr:`sdoStepsPerCycle` per cycle.
+    """
+
+    def __init__(self,
+            batchSize: Optional[int] = HOMING_BATCH_SIZE,
+            sdoStepsPerCycle: Optional[int] = HOMING_SDO_STEPS_PER_CYCLE,
+            interval: float = INTERVAL,
+            time_func: Callable = time.perf_counter,
+        ):
+        """Args:
+            batchSize: Maximum number of concurrent homings. None for no
+                limit.
+            sdoStepsPerCycle: Maximum number of SDO steps per cycle. None for
+                no limit.
+            interval: Cycle interval.
+            time_func: Timing function.
+        """
+        self.batchSize = batchSize or INF
+        self.sdoStepsPerCycle = sdoStepsPerCycle or INF
+        self.interval = interval
+        self.time_func = time_func
+        self.homings: List[HomingBase] = []
+        """All scheduled homings."""
+
+        self.pending: List[HomingBase] = []
+        """Queued homings waiting to be admitted."""
+
+        self.running: List[HomingBase] = []
+        """Admitted homings."""
+
+        self.cycle = -1
+        self.sdoSteps = 0
+
+    def add(self,
+            homing: HomingBase,
+            priority: Optional[int] = None,
+            after: Iterable[HomingBase] = (),
+        ):
+        """Schedule homing.
+
+        Args:
+            homing: Homing to schedule.
+            priority (optional): Scheduling priority. Higher first.
+            after (optional): Homings which have to be done before.
+        """
+        homing.scheduler = self
+        if priority is not None:
+            homing.priority = priority
+
+        homing.dependencies.update(after)
+        if homing not in self.homings:
+            self.homings.append(homing)
+
+    def enqueue(self, homing: HomingBase):
+        """Queue homing. Called when the homing starts."""
+        if homing in self.running or homing in self.pending:
+            return
+
+        self.pending.append(homing)
+        self.pending.sort(key=lambda h: -h.priority)
+
+    def waiting(self, homing: HomingBase) -> bool:
+        """Check if one of the dependencies of a homing is not homed yet."""
+        return any(not dep.homed for dep in homing.dependencies)
+
+    def circular(self, homing: HomingBase) -> bool:
+        """Check if a homing only waits for other queued homings."""
+        return all(dep in self.pending for dep in homing.dependencies if not dep.homed)
+
+    def fail(self, homing: HomingBase):
+        """Fail queued homing without running it."""
+        self.pending.remove(homing)
+        homing.job = None
+        homing.state = HomingState.FAILED
+        LOGGER.error('%s failed since one of its dependencies failed', homing)
+        self.release(homing)
+
+    def fill(self):
+        """Admit pending homings until the batch is full. Homings with a
+        failed dependency fail as well. Homings with an unhomed dependency
+        which is not queued keep waiting.
+        """
+        for homing in list(self.pending):
+            if any(dep.state is HomingState.FAILED for dep in homing.dependencies):
+                self.fail(homing)
+
+        for homing in list(self.pending):
+            if len(self.running) >= self.batchSize:
+                return
+
+            if not self.waiting(homing):
+                self.pending.remove(homing)
+                self.running.append(homing)
+
+        if self.pending and not self.running:
+            # Circular dependencies. Resolve by priority
+            for homing in self.pending:
+                if self.circular(homing):
+                    LOGGER.warning('Circular homing dependencies. Starting %s anyway', homing)
+                    self.pending.remove(homing)
+                    self.running.append(homing)
+                    return
+
+    def admitted(self, homing: HomingBase) -> bool:
+        """Check if homing is allowed to run."""
+        if homing not in self.running:
+            self.fill()
+
+        return homing in self.running
+
+    def release(self, homing: HomingBase):
+        """Homing finished. Make room for the next one."""
+        if homing in self.running:
+            self.running.remove(homing)
+
+        progress = self.progress()
+        LOGGER.info(
+            'Homing progress: %d / %d homed, %d failed',
+            progress['homed'], progress['total'], progress['failed'],
+        )
+
+    def acquire_sdo_slot(self) -> bool:
+        """Try to acquire one of the SDO slots of the current cycle."""
+        cycle = int(self.time_func() / self.interval)
+        if cycle != self.cycle:
+            self.cycle = cycle
+            self.sdoSteps = 0
+
+        if self.sdoSteps >= self.sdoStepsPerCycle:
+            return False
+
+        self.sdoSteps += 1
+        return True
+
+    def sdo_slot(self) -> Generator:
+        """Yield until an SDO slot is available."""
+        while not self.acquire_sdo_slot():
+            yield
+
+    def progress(self) -> Dict[str, int]:
+        """Aggregate homing progress.
+
+        Returns:
+            Number of homings in total, pending, running, homed and failed.
+        """
+        counts = collections.Counter(homing.state for homing in self.homings)
+        return {
+            'total': len(self.homings),
+            'pending': len(self.pending),
+            'running': len(self.running),
+            'homed': counts[HomingState.HOMED],
+            'failed': counts[HomingState.FAILED],
+        }
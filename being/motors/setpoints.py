@@ -0,0 +1,99 @@
+"""Set-point generator for cyclic synchronous position mode. Turns the
+position targets of the main cycle into position set-points with velocity
+feed-forward. If the main cycle is late the set-points get extrapolated within
+the kinematic limits of the drive so that the drive does not see a stair
+stepped trajectory.
+"""
+import math
+import time
+from typing import Callable, Optional, Tuple
+
+from being.configuration import CONFIG
+from being.constants import INF
+from being.math import clip
+
+
+INTERVAL = CONFIG['General']['INTERVAL']
+
+SetPoint = Tuple[float, float]
+"""Position and velocity feed-forward."""
+
+
+class SetPointGenerator:
+
+    """Position set-points with velocity feed-forward.
+
+    Velocity gets estimated from consecutive targets of the main cycle (nominal
+    cycle interval since the targets follow the being clock). Extrapolation
+    continues with the last velocity and brakes with the maximum acceleration.
+    All values in the same units (e.g. device units).
+    """
+
+    def __init__(self,
+            maxVelocity: float = INF,
+            maxAcceleration: float = INF,
+            interval: float = INTERVAL,
+            clock: Callable[[], float] = time.perf_counter,
+        ):
+        """Args:
+            maxVelocity (optional): Maximum velocity.
+            maxAcceleration (optional): Maximum acceleration (for braking).
+            interval (optional): Nominal cycle interval.
+            clock (optional): Time function.
+        """
+        self.maxVelocity = maxVelocity
+        self.maxAcceleration = maxAcceleration
+        self.interval = interval
+        self.clock = clock
+        self.position: Optional[float] = None
+        self.velocity = 0.
+        self.timestamp = 0.
+
+    def reset(self):
+        """Forget last set-point. Next target starts at rest."""
+        self.position = None
+        self.velocity = 0.
+
+    def set_target(self, position: float) -> SetPoint:
+        """New target position from main cycle.
+
+        Args:
+            position: Target position.
+
+        Returns:
+            Position and velocity feed-forward.
+        """
+        if self.position is None:
+            velocity = 0.
+        else:
+            velocity = (position - self.position) / self.interval
+            velocity = clip(velocity, -self.maxVelocity, self.maxVelocity)
+
+        self.position = position
+        self.velocity = velocity
+        self.timestamp = self.clock()
+        return position, velocity
+
+    def extrapolate(self) -> Optional[SetPoint]:
+        """Extrapolate from the last set-point to now. Continues with the last
+        velocity while braking with the maximum acceleration.
+
+        Returns:
+            Position and velocity feed-forward. None if there was no
+            set-point yet.
+        """
+        if self.position is None:
+            return None
+
+        dt = self.clock() - self.timestamp
+        vel = self.velocity
+        if vel == 0. or dt <= 0.:
+            return self.position, vel
+
+        acc = self.maxAcceleration
+        stopTime = abs(vel) / acc
+        if dt >= stopTime:
+            return self.position + math.copysign(.5 * vel ** 2 / acc, vel), 0.
+
+        decel = math.copysign(acc, vel)
+        return self.position + vel * dt - .5 * decel * dt ** 2, vel - decel * dt
@@ -4,7 +4,7 @@ from typing import Optional, Tuple
 
 from being.block import Block
 from being.resources import register_resource
-from being.serialization import EOT, FlyByDecoder, dumps
+from being.serialization import EOT, JSON_CODEC, Codec, FlyByDecoder
 from being.connectables import MessageOutput, MessageInput
 
 
@@ -18,6 +18,9 @@ TERM: str = EOT
 BUFFER_SIZE: int = 1024
 """Number of bytes for socket recv call."""
 
+MAX_DATAGRAM_SIZE: int = 65507
+"""Maximum UDP payload size. Binary codecs send one message per datagram."""
+
 
 class NetworkBlock(Block):
 
@@ -28,10 +31,18 @@ class NetworkBlock(Block):
         sock: Socket instance.
     """
 
-    def __init__(self, address: Address, sock: Optional[Socket] = None, **kwargs):
+    def __init__(
+            self,
+            address: Address,
+            sock: Optional[Socket] = None,
+            codec: Codec = JSON_CODEC,
+            **kwargs,
+        ):
         """Args:
             address: Network address.
             sock: Socket instance.
+            codec: Serialization codec. Text codecs get terminated by EOT,
+                binary codecs send one message per datagram.
         """
         super().__init__(**kwargs)
         if sock is None:
@@ -41,6 +52,7 @@ class NetworkBlock(Block):
 
         self.address = address
         self.sock = sock
+        self.codec = codec
 
 
 class NetworkOut(NetworkBlock):
@@ -53,8 +65,12 @@ class NetworkOut(NetworkBlock):
 
     def update(self):
         for msg in self.input.receive():
-            data = dumps(msg) + TERM
-            self.sock.sendto(data.encode(), self.address)
+            if self.codec.binary:
+                data = self.codec.dumps(msg)
+            else:
+                data = (self.codec.dumps(msg) + TERM).encode()
+
+            self.sock.sendto(data, self.address)
 
 
 class NetworkIn(NetworkBlock):
@@ -64,10 +80,14 @@ class NetworkIn(NetworkBlock):
     def __init__(self, address: Address, sock: Optional[Socket] = None, **kwargs):
         super().__init__(address, sock, **kwargs)
         self.outputs = [MessageOutput(owner=self)]
-        self.decoder = FlyByDecoder(term=TERM)
+        self.decoder = FlyByDecoder(term=TERM, loads=self.codec.loads)
         self.sock.bind(address)
 
     def update(self):
+        if self.codec.binary:
+            self.receive_datagrams()
+            return
+
         try:
             newData = self.sock.recv(BUFFER_SIZE).decode()
         except BlockingIOError:
@@ -75,3 +95,13 @@ class NetworkIn(NetworkBlock):
 
         for obj in self.decoder.decode_more(newData):
             self.output.send(obj)
+
+    def receive_datagrams(self):
+        """Receive all pending datagrams. One message each (binary codec)."""
+        while True:
+            try:
+                data = self.sock.recv(MAX_DATAGRAM_SIZE)
+            except BlockingIOError:
+                return
+
+            self.output.send(self.codec.loads(data))
@@ -1,6 +1,23 @@
-"""Pacemaker thread."""
+"""Pacemaker thread. Dedicated transmit thread which emits the published RPDOs
+followed by the SYNC message on a strict period. Decoupled from the jitter of
+the main cycle (block execution, garbage collection, asyncio scheduling). The
+main cycle only publishes its set-points (double buffering). If the main cycle
+is late the drives get the previous set-points on time instead of late ones.
+
+Pacemaker and main cycle share one time grid (:func:`time.perf_counter`). The
+main cycle runs :data:`MAIN_CYCLE_PHASE` periods after the pacemaker (see
+:func:`cycle_time`). Every transmit therefore sees exactly one new publish.
+With unrelated clocks or aligned phases the two threads race for the same
+instant which leads to duplicated or skipped set-points (aliasing).
+"""
 import contextlib
+import math
+import os
 import threading
+import time
+from typing import Iterable, Union
+
+import can
 
 from being.backends import CanBackend
 from being.configuration import CONFIG
@@ -9,6 +26,42 @@ from being.logging import get_logger
 
 INTERVAL = CONFIG['General']['INTERVAL']
 
+REALTIME_PRIORITY = 50
+"""Real-time scheduling priority of the transmit thread (if permitted)."""
+
+MAIN_CYCLE_PHASE = .5
+"""Phase offset of the main cycle relative to the pacemaker in periods. Half
+a period of slack for publishing before and after each transmit.
+"""
+
+
+def next_cycle(now: float, interval: float, phase: float = 0.) -> int:
+    """Number of the next cycle on the common time grid.
+
+    Args:
+        now: Current :func:`time.perf_counter` time.
+        interval: Cycle interval.
+        phase (optional): Phase offset in periods.
+
+    Returns:
+        Cycle number. Its :func:`cycle_time` lies after now.
+    """
+    return math.floor(now / interval - phase) + 1
+
+
+def cycle_time(cycle: int, interval: float, phase: float = 0.) -> float:
+    """Deadline of a cycle on the common time grid.
+
+    Args:
+        cycle: Cycle number.
+        interval: Cycle interval.
+        phase (optional): Phase offset in periods.
+
+    Returns:
+        :func:`time.perf_counter` time.
+    """
+    return (cycle + phase) * interval
+
 
 class Once:
 
@@ -25,64 +78,126 @@ class Once:
         return True
 
 
+def raise_thread_priority(priority: int = REALTIME_PRIORITY) -> bool:
+    """Try to switch the calling thread to real-time FIFO scheduling. Only
+    works on Linux with sufficient privileges.
+
+    Args:
+        priority (optional): Real-time priority.
+
+    Returns:
+        If successful.
+    """
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        return True
+    except (AttributeError, OSError):
+        return False
+
+
 class Pacemaker(contextlib.AbstractContextManager):
 
-    """Pacemaker / watchdog / dead man's switch daemon thread.
+    """Pacemaker / transmit thread with watchdog.
 
-    Can step in to trigger PDO transmission / SYNC message if main thread is not
-    on time. In order to prevent RPDO timeouts.
+    Transmits the RPDOs published by the main cycle (see
+    :meth:`being.backends.CanBackend.publish_rpdos`) followed by the SYNC
+    message for all networks every ``interval`` seconds. Deadlines are absolute
+    so that the period does not drift. The main cycle pushes the dead man's
+    switch with :meth:`Pacemaker.tick`. Without a tick for more than
+    ``maxWait`` the pacemaker keeps the previous (or extrapolated, see
+    :meth:`being.backends.CanBackend.extrapolate_set_points`) set-points going
+    and counts its interventions in the bus metrics.
     """
 
-    def __init__(self, network: CanBackend, maxWait: float = 1.2 * INTERVAL):
+    def __init__(self,
+            network: Union[None, CanBackend, Iterable[CanBackend]],
+            maxWait: float = 1.2 * INTERVAL,
+            interval: float = INTERVAL,
+        ):
         """Args:
-            network: CanBackend network instance to trigger PDO transmits / SYNC
-                messages.
-            maxWait: Maximum wait duration before stepping in.
+            network: CanBackend network instance(s) to trigger PDO transmits /
+                SYNC messages.
+            maxWait: Maximum wait duration for the main cycle before stepping
+                in.
+            interval: Transmit period.
         """
-        self.network = network
+        if network is None:
+            networks = []
+        elif isinstance(network, CanBackend):
+            networks = [network]
+        else:
+            networks = list(network)
+
+        self.networks = networks
         self.maxWait = maxWait
+        self.interval = interval
         self.logger = get_logger('Pacemaker')
-        self.pulseEvent = threading.Event()
+        self.lastTick = time.perf_counter()
+        self.stopEvent = threading.Event()
         self.running = False
         self.thread = None
         self.once = Once(initial=True)
 
     def tick(self):
-        """Push the dead man's switch."""
-        self.pulseEvent.set()
+        """Push the dead man's switch. Main cycle published its set-points."""
+        self.lastTick = time.perf_counter()
+
+    def transmit(self):
+        """Transmit published RPDOs and SYNC on all networks."""
+        late = time.perf_counter() - self.lastTick > self.maxWait
+        if self.once.changed(not late):
+            self.logger.warning('On' if late else 'Off')
+
+        for network in self.networks:
+            try:
+                if late:
+                    network.metrics.pacemaker_stepped_in()
+                    network.extrapolate_set_points()
+
+                network.transmit_all_rpdos(published=True)
+                network.send_sync()
+            except (can.CanError, OSError) as err:
+                self.logger.error('Could not send frames on %s (%s)', network.channel, err)
 
     def _run(self):
-        while self.running:
-            if self.pulseEvent.wait(timeout=self.maxWait):
-                if self.once.changed(True):
-                    self.logger.warning('Off')
+        if raise_thread_priority():
+            self.logger.info('Running with real-time priority')
+
+        interval = self.interval
+        cycle = next_cycle(time.perf_counter(), interval)
+        while True:
+            sleepTime = cycle_time(cycle, interval) - time.perf_counter()
+            if sleepTime > 0 and self.stopEvent.wait(sleepTime):
+                break
+
+            if not self.running:
+                break
 
-            else:
-                self.network.transmit_all_rpdos()
-                self.network.send_sync()
-                if self.once.changed(False):
-                    self.logger.warning('On')
+            self.transmit()
 
-            self.pulseEvent.clear()
+            # Skip missed periods instead of bursting
+            cycle = max(cycle + 1, next_cycle(time.perf_counter(), interval))
 
     def start(self):
-        """Start watchdog daemon thread."""
+        """Start transmit thread."""
         if self.running:
-            raise RuntimeError('Watchdog thread already running!')
+            raise RuntimeError('Pacemaker thread already running!')
 
-        self.logger.info('Starting watchdog thread')
+        self.logger.info('Starting pacemaker thread')
         self.running = True
-        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.lastTick = time.perf_counter()
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name='Pacemaker')
         self.thread.start()
 
     def stop(self):
-        """Stop watchdog daemon thread."""
+        """Stop transmit thread."""
         if not self.running:
-            raise RuntimeError('No watchdog thread running!')
+            raise RuntimeError('No pacemaker thread running!')
 
-        self.logger.info('Stopping watchdog thread')
+        self.logger.info('Stopping pacemaker thread')
         self.running = False
-        self.tick()
+        self.stopEvent.set()
         self.thread.join()
 
     def __enter__(self):
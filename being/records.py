@@ -0,0 +1,132 @@
+"""Small JSON file backed key -> value records. For remembering things across
+restarts (e.g. settings checksums or homing results per drive). Everything
+gets loaded lazily once. Changes get written back in the background so that
+recording something never stalls the caller on file I/O.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple, Type
+
+from being.logging import get_logger
+
+
+LOGGER = get_logger(name=__name__, parent=None)
+
+
+class JsonRecord:
+
+    """Thread safe key -> value record. JSON file backed. Values have to be
+    JSON serializable.
+    """
+
+    def __init__(self, filepath: Optional[str] = None):
+        """Args:
+            filepath (optional): JSON filepath. Only in memory if None.
+        """
+        if filepath is not None:
+            filepath = os.path.expanduser(filepath)
+
+        self.filepath = filepath
+        self.entries: Optional[Dict[str, Any]] = None
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.writer: Optional[threading.Thread] = None
+
+    def load(self) -> Dict[str, Any]:
+        """Load entries (once)."""
+        if self.entries is None:
+            self.entries = {}
+            if self.filepath is not None and os.path.exists(self.filepath):
+                try:
+                    with open(self.filepath) as f:
+                        self.entries = json.load(f)
+                except (OSError, ValueError) as err:
+                    LOGGER.warning('Could not load record %r (%s)', self.filepath, err)
+
+        return self.entries
+
+    def get(self, key: str) -> Any:
+        """Get recorded value (None if missing)."""
+        with self.lock:
+            return self.load().get(key)
+
+    def set(self, key: str, value: Any):
+        """Record new value (or forget about it if None). The file gets written
+        by a background writer thread.
+        """
+        with self.lock:
+            entries = self.load()
+            if value is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = value
+
+            if self.filepath is None:
+                return
+
+            self.dirty = True
+            if self.writer is None:
+                # Not a daemon thread. Pending changes get written before the
+                # interpreter exits.
+                self.writer = threading.Thread(target=self._write_changes, name='JsonRecord')
+                self.writer.start()
+
+    def _write_changes(self):
+        """Write entries to file until there are no more pending changes."""
+        while True:
+            with self.lock:
+                if not self.dirty:
+                    self.writer = None
+                    return
+
+                self.dirty = False
+                try:
+                    data = json.dumps(self.entries, indent=2, sort_keys=True)
+                except (TypeError, ValueError) as err:
+                    LOGGER.warning('Could not serialize record %r (%s)', self.filepath, err)
+                    continue
+
+            try:
+                os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+                tmpPath = self.filepath + '.tmp'
+                with open(tmpPath, 'w') as f:
+                    f.write(data)
+
+                os.replace(tmpPath, self.filepath)
+            except OSError as err:
+                LOGGER.warning('Could not save record %r (%s)', self.filepath, err)
+
+    def flush(self):
+        """Wait until all pending changes are written."""
+        with self.lock:
+            writer = self.writer
+
+        if writer is not None:
+            writer.join()
+
+
+_SHARED_RECORDS: Dict[Tuple[type, Optional[str]], JsonRecord] = {}
+_SHARED_RECORDS_LOCK = threading.Lock()
+
+
+def shared_record(filepath: Optional[str], cls: Type[JsonRecord] = JsonRecord) -> JsonRecord:
+    """Get the record of a JSON file. Created on first use and shared by all
+    callers so that there is only one writer per file.
+
+    Args:
+        filepath: JSON filepath. Only in memory if None.
+        cls (optional): Record type.
+
+    Returns:
+        Shared record instance.
+    """
+    if filepath is not None:
+        filepath = os.path.expanduser(filepath)
+
+    with _SHARED_RECORDS_LOCK:
+        key = (cls, filepath)
+        if key not in _SHARED_RECORDS:
+            _SHARED_RECORDS[key] = cls(filepath)
+
+        return _SHARED_RECORDS[key]
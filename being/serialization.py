@@ -9,13 +9,19 @@ Notation:
 
 Notes:
   - We use OrderedDict to control key ordering for Python versions before 3.6.
+  - Custom types are encoded via the :func:`to_serializable` type dispatch
+    table. Plain data stays on the C accelerated path of the json module.
+    Additional types can be registered with ``to_serializable.register()``.
+  - :func:`dumps_fast` uses orjson (if installed) for hot paths like the
+    being state stream.
 """
 import base64
+import functools
 import json
 import logging
 from collections import OrderedDict
-from enum import EnumMeta
-from typing import Generator, Dict
+from enum import Enum, EnumMeta
+from typing import Any, Callable, Dict, Generator, NamedTuple
 
 import numpy as np
 from numpy import ndarray
@@ -26,6 +32,11 @@ from being.constants import EOT
 from being.curve import Curve
 from being.typing import Spline
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 NAMED_TUPLE_LOOKUP: Dict[str, type] = {}
 """Named tuples type lookup."""
@@ -120,7 +131,7 @@ def spline_from_dict(dct: dict) -> Spline:
 
 def ndarray_to_dict(arr: ndarray) -> OrderedDict:
     """Convert numpy array to serializable dict representation."""
-    raw = base64.b64encode(arr.data)
+    raw = base64.b64encode(np.ascontiguousarray(arr).data)
     return OrderedDict([
         ('type', 'ndarray'),
         ('dtype', str(arr.dtype)),
@@ -203,60 +214,158 @@ def being_object_hook(dct):
     return dct
 
 
+def _is_registered_named_tuple(obj) -> bool:
+    """Check if obj is an instance of a registered named tuple type."""
+    objType = type(obj)
+    return NAMED_TUPLE_LOOKUP.get(objType.__name__) is objType
+
+
+@functools.singledispatch
+def to_serializable(obj):
+    """Convert being object to JSON serializable representation. Type dispatch
+    table for :meth:`BeingEncoder.default`.
+
+    Raises:
+        TypeError: For unsupported types.
+    """
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+@to_serializable.register(PPoly)
+@to_serializable.register(BPoly)
+def _spline_to_serializable(spline):
+    return spline_to_dict(spline)
+
+
+@to_serializable.register(ndarray)
+def _ndarray_to_serializable(arr):
+    if arr.ndim == 0:  # Scalar shape
+        return float(arr)
+
+    return ndarray_to_dict(arr)
+
+
+@to_serializable.register(np.generic)
+def _numpy_scalar_to_serializable(scalar):
+    return scalar.item()
+
+
+@functools.lru_cache(maxsize=None)
+def _registered_enum_type(enumType) -> tuple:
+    """Qualified name and member names of a registered enum type. Cached as
+    immutable tuple, every caller builds its own dict from it.
+    """
+    qualname = _enum_type_qualname(enumType)
+    if ENUM_LOOKUP.get(qualname) is not enumType:
+        raise TypeError(f'Enum {enumType.__name__} is not registered!')
+
+    return qualname, tuple(enumType.__members__)
+
+
+@to_serializable.register(Enum)
+def _enum_to_serializable(enum):
+    qualname, members = _registered_enum_type(type(enum))
+    return OrderedDict([
+        ('type', qualname),
+        ('members', list(members)),
+        ('value', enum.value),
+    ])
+
+
+@to_serializable.register(set)
+def _set_to_serializable(set_):
+    return {'type': set.__name__, 'values': list(set_)}
+
+
+@to_serializable.register(Block)
+def _block_to_serializable(block):
+    return block.to_dict()
+
+
+@to_serializable.register(logging.LogRecord)
+def _log_record_to_serializable(record):
+    return {
+        'type': 'LogRecord',
+        'name': record.name,
+        #'msg': record.msg,
+        #'args': record.args,
+        'message': record.msg % record.args,
+        'levelname': record.levelname,
+        'levelno': record.levelno,
+    }
+
+
+@to_serializable.register(Curve)
+def _curve_to_serializable(curve):
+    return OrderedDict([
+        ('type', type(curve).__name__),
+        ('splines', curve.splines),
+    ])
+
+
 class BeingEncoder(json.JSONEncoder):
 
-    """Being JSONEncoder object hook for custom JSON serialization."""
+    """Being JSONEncoder object hook for custom JSON serialization. Registered
+    named tuples are only converted at the top level. Nested ones end up as
+    JSON arrays (C encoder).
+    """
+
+    def encode(self, o):
+        if _is_registered_named_tuple(o):
+            o = named_tuple_as_dict(o)
+
+        return super().encode(o)
 
     def iterencode(self, o, _one_shot=False):
-        objType = type(o)
-        if objType in NAMED_TUPLE_LOOKUP.values():
+        if _is_registered_named_tuple(o):
             o = named_tuple_as_dict(o)
 
-        yield from super().iterencode(o, _one_shot)
+        return super().iterencode(o, _one_shot)
 
     def default(self, o):
-        if isinstance(o, tuple(SPLINE_TYPES)):
-            return spline_to_dict(o)
+        return to_serializable(o)
 
-        if isinstance(o, ndarray):
-            if o.ndim == 0:  # Scalar shape
-                return float(o)
 
-            return ndarray_to_dict(o)
+_ENCODER = BeingEncoder()
+"""Shared default encoder instance for :func:`dumps`."""
 
-        objType = type(o)
-        if objType in ENUM_LOOKUP.values():
-            return enum_to_dict(o)
 
-        if objType is set:
-            return {'type': set.__name__, 'values': list(o)}
+def dumps(obj, *args, **kwargs):
+    """Serialize being object to JSON string."""
+    if args or kwargs:
+        return json.dumps(obj, cls=BeingEncoder, *args, **kwargs)
 
-        if isinstance(o, Block):
-            return o.to_dict()
+    return _ENCODER.encode(obj)
 
-        if isinstance(o, logging.LogRecord):
-            return {
-                'type': 'LogRecord',
-                'name': o.name,
-                #'msg': o.msg,
-                #'args': o.args,
-                'message': o.msg % o.args,
-                'levelname': o.levelname,
-                'levelno': o.levelno,
-            }
 
-        if isinstance(o, Curve):
-            return OrderedDict([
-                ('type', type(o).__name__),
-                ('splines', o.splines),
-            ])
+def _orjson_default(obj):
+    """orjson default hook. Same as for the stdlib but orjson does not know
+    about named tuples.
+    """
+    if _is_registered_named_tuple(obj):
+        return named_tuple_as_dict(obj)
 
-        return json.JSONEncoder.default(self, o)
+    return to_serializable(obj)
 
 
-def dumps(obj, *args, **kwargs):
-    """Serialize being object to JSON string."""
-    return json.dumps(obj, cls=BeingEncoder, *args, **kwargs)
+def dumps_fast(obj) -> str:
+    """Fast JSON serialization with orjson (if installed, otherwise
+    :func:`dumps`). Meant for hot paths towards the front end.
+
+    Caution:
+        The output is not identical to :func:`dumps`. orjson encodes enums by
+        their value, NaN / infinity as null and named tuples (also nested ones)
+        as objects. Use :func:`dumps` if the result has to be loaded again with
+        :func:`loads`.
+    """
+    if orjson is None:
+        return dumps(obj)
+
+    return orjson.dumps(
+        obj,
+        default=_orjson_default,
+        option=orjson.OPT_NON_STR_KEYS,
+    ).decode()
 
 
 def loads(string):
@@ -264,6 +373,29 @@ def loads(string):
     return json.loads(string, object_hook=being_object_hook)
 
 
+class Codec(NamedTuple):
+
+    """Serialization codec. Pair of dumps / loads functions which can be handed
+    to the different consumers (content files, network blocks).
+    """
+
+    dumps: Callable[[Any], Any]
+    """Serialization function."""
+
+    loads: Callable[[Any], Any]
+    """Deserialization function."""
+
+    binary: bool = False
+    """If the serialized data is bytes (otherwise str)."""
+
+    extension: str = '.json'
+    """File extension."""
+
+
+JSON_CODEC = Codec(dumps=dumps, loads=loads)
+"""Default JSON codec."""
+
+
 class FlyByDecoder:
 
     """Continuously decode objects from partial messages.
@@ -280,11 +412,13 @@ class FlyByDecoder:
         {'a': 1, 'b': 2}
     """
 
-    def __init__(self, term: str = EOT):
+    def __init__(self, term: str = EOT, loads=loads):
         """Args:
             term: Termination character.
+            loads: Deserialization function.
         """
         self.term = term
+        self.loads = loads
         self.incomplete = ''
 
     def decode_more(self, new: str) -> Generator:
@@ -292,7 +426,7 @@ class FlyByDecoder:
         self.incomplete += new
         while self.term in self.incomplete:
             complete, self.incomplete = self.incomplete.split(self.term, maxsplit=1)
-            yield loads(complete)
+            yield self.loads(complete)
 
 
 def demo():
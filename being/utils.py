@@ -6,7 +6,7 @@ import itertools
 import os
 import random
 import weakref
-from typing import Dict, List, Generator
+from typing import Dict, List, Generator, Union
 
 
 def filter_by_type(sequence, type_) -> Generator[object, None, None]:
@@ -51,15 +51,21 @@ def listdir(directory, fullpath=True) -> List[str]:
     ]
 
 
-def read_file(filepath: str) -> str:
-    """Read entire data from file."""
-    with open(filepath) as file:
+def read_file(filepath: str, binary: bool = False) -> Union[str, bytes]:
+    """Read entire data from file.
+
+    Args:
+        filepath: File to read.
+        binary: Read bytes instead of text.
+    """
+    with open(filepath, 'rb' if binary else 'r') as file:
         return file.read()
 
 
-def write_file(filepath: str, data):
-    """Write data to file."""
-    with open(filepath, 'w') as file:
+def write_file(filepath: str, data: Union[str, bytes]):
+    """Write data to file. Text or binary mode depending on data type."""
+    mode = 'wb' if isinstance(data, (bytes, bytearray)) else 'w'
+    with open(filepath, mode) as file:
         file.write(data)
 
 
@@ -2,33 +2,34 @@
 import collections
 import functools
 import glob
-import io
 import itertools
 import json
 import math
-import os
-import zipfile
-from typing import Dict
+from typing import Dict, Iterable, Optional
 
 import numpy as np
 from aiohttp import web
-from aiohttp.typedefs import MultiDictProxy
 
 from being.behavior import State as BehaviorState, Behavior
+from being.behavior import BEHAVIOR_CHANGED
 from being.being import Being
+from being.block import output_neighbors
 from being.configs import SEP, Config
 from being.configuration import CONFIG
-from being.connectables import ValueOutput, _ValueContainer
+from being.connectables import OutputBase, ValueOutput, _ValueContainer
 from being.content import CONTENT_CHANGED, Content
 from being.curve import Curve
 from being.logging import get_logger
 from being.motors.blocks import MotorBlock
+from being.motors.definitions import MotorEvent
 from being.params import Parameter
 from being.serialization import loads, spline_from_dict
 from being.spline import fit_spline
 from being.typing import Spline
-from being.utils import NestedDict, filter_by_type, update_dict_recursively
+from being.utils import NestedDict, filter_by_type, read_file, update_dict_recursively
 from being.web.responses import respond_ok, json_response
+from being.web.snapshots import SnapshotCache
+from being.web.streaming import receive_uploads, stream_zip_archive
 
 
 LOGGER = get_logger(name=__name__, parent=None)
@@ -149,68 +150,62 @@ def content_controller(content: Content) -> web.RouteTableDef:
 
     @routes.get('/download-zipped-curves')
     async def download_zipped_curves(request):
-        stream = io.BytesIO()
-        with zipfile.ZipFile(stream, 'w') as zf:
-            for fp in glob.glob(content.directory + '/*.json'):
-                zf.write(fp)
+        filepaths = sorted(glob.glob(content.directory + '/*' + content.ext))
+        return await stream_zip_archive(request, filepaths, filename='curves.zip')
 
-        stream.seek(0)
+    def validate_curve_file(fp: str):
+        """Check that file holds a serialized curve / spline. Raises otherwise."""
+        codec = content.codec
+        thing = codec.loads(read_file(fp, binary=codec.binary))
+        if not isinstance(thing, (Curve, *Spline.__args__)):
+            raise ValueError('is not a curve!')
 
-        return web.Response(
-            body=stream,
-            content_type='application/zip'
-        )
-
-    def pluck_files(dct: MultiDictProxy) -> tuple:
-        """Pluck JSON files (and data) from MultiDictProxy files dct. Also open
-        up zip files if any.
-
-        Args:
-            dct: Multi dict proxy from file upload post request.
-
-        Yields:
-            File basename and raw data.
-        """
-        for filefield in dct.values():
-            fn = filefield.filename
-            if fn.lower().endswith('.zip'):
-                with zipfile.ZipFile(filefield.file, 'r') as zf:
-                    for fp in zf.namelist():
-                        yield fp, zf.read(fp)
-            else:
-                yield fn, filefield.file.read()
+    def is_curve_file(fp: str) -> bool:
+        return fp.lower().endswith(content.ext.lower())
 
     @routes.post('/upload-curves')
     async def upload_curves(request):
-        data = await request.post()
+        if not request.content_type.startswith('multipart/'):
+            return json_response([{'type': 'error', 'message': 'Nothing uploaded!'}])
 
-        # Empty upload
-        if isinstance(data, bytearray):
+        notificationMessages = await receive_uploads(
+            request,
+            content.directory,
+            validate=validate_curve_file,
+            accept=is_curve_file,
+        )
+        if not notificationMessages:
             return json_response([{'type': 'error', 'message': 'Nothing uploaded!'}])
 
-        notificationMessages = []
-        for fp, data in pluck_files(data):
-            if not fp.lower().endswith('.json'):
-                notificationMessages.append({'type': 'error', 'message': '%r is not a JSON file!' % fp})
-                continue
+        content.publish(CONTENT_CHANGED)
+        return json_response(notificationMessages)
 
-            try:
-                thing = loads(data)
-                if not isinstance(thing, Spline.__args__):
-                    raise ValueError('is not a spline!')
+    return routes
 
-                fn = os.path.basename(fp)
-                with open(os.path.join(content.directory, fn), 'wb') as f:
-                    f.write(data)
 
-                notificationMessages.append({'type': 'success', 'message': 'Uploaded file %r' % fp})
-            except Exception as err:
-                notificationMessages.append({'type': 'error', 'message': '%r %s' % (fp, err)})
+def output_index_map(outputs: Iterable[OutputBase]) -> Dict[OutputBase, int]:
+    """Output -> index lookup. Replaces linear ``list.index()`` searches.
 
-        content.publish(CONTENT_CHANGED)
-        return json_response(notificationMessages)
+    Args:
+        outputs: Ordered outputs (e.g. ``being.valueOutputs``).
 
-    return routes
+    Returns:
+        Index lookup dictionary.
+    """
+    return {output: index for index, output in enumerate(outputs)}
+
+
+def invalidate_on_motor_events(snapshots: SnapshotCache, motors, *names: str):
+    """Invalidate snapshots whenever one of the motors changes.
+
+    Args:
+        snapshots: Snapshot cache.
+        motors: Motor blocks.
+        *names: Snapshot names.
+    """
+    for motor in motors:
+        for event in MotorEvent:
+            snapshots.invalidate_on(motor, event, *names)
 
 
 def serialize_elk_graph(being, skipParameters=True):
@@ -224,6 +219,8 @@ def serialize_elk_graph(being, skipParameters=True):
         ('children', []),
         ('edges', []),
     ])
+    valueIndices = output_index_map(being.valueOutputs)
+    messageIndices = output_index_map(being.messageOutputs)
     queue = collections.deque(being.execOrder)
     visited = set()
     edgeIdCounter = itertools.count()
@@ -244,10 +241,10 @@ def serialize_elk_graph(being, skipParameters=True):
         for output in block.outputs:
             if isinstance(output, _ValueContainer):
                 connectionType = 'value'
-                index = being.valueOutputs.index(output)
+                index = valueIndices[output]
             else:
                 connectionType = 'message'
-                index = being.messageOutputs.index(output)
+                index = messageIndices[output]
 
             for input_ in output.outgoingConnections:
                 if input_.owner and input_.owner is not block:
@@ -262,22 +259,38 @@ def serialize_elk_graph(being, skipParameters=True):
     return elkGraph
 
 
-def being_controller(being: Being) -> web.RouteTableDef:
+def being_controller(being: Being, snapshots: Optional[SnapshotCache] = None) -> web.RouteTableDef:
     """API routes for being object.
 
     Args:
         being: Being instance to wrap up in API.
+        snapshots: Shared snapshot cache.
 
     Returns:
         Routes table for API app.
     """
+    if snapshots is None:
+        snapshots = SnapshotCache()
+
     routes = web.RouteTableDef()
 
     blockLookup = { block.id: block for block in being.execOrder }
+    valueIndices = output_index_map(being.valueOutputs)
+
+    # The graph does not change at runtime. Blocks do (motor states, behavior
+    # states, param values, motion selection possibilities)
+    blocksSnapshot = snapshots.register('blocks', lambda: blockLookup)
+    graphSnapshot = snapshots.register('graph', lambda: serialize_elk_graph(being))
+    invalidate_on_motor_events(snapshots, being.motors, 'blocks')
+    for behavior in being.behaviors:
+        snapshots.invalidate_on(behavior, BEHAVIOR_CHANGED, 'blocks')
+
+    content = Content.single_instance_setdefault()
+    snapshots.invalidate_on(content, CONTENT_CHANGED, 'blocks')
 
     @routes.get('/blocks')
     async def get_blocks(request):
-        return json_response(blockLookup)
+        return blocksSnapshot.response(request)
 
     @routes.get('/blocks/{id}')
     async def get_block(request):
@@ -296,7 +309,7 @@ def being_controller(being: Being) -> web.RouteTableDef:
         try:
             block = blockLookup[id]
             return json_response([
-                being.valueOutputs.index(out)
+                valueIndices[out]
                 for out in filter_by_type(block.outputs, ValueOutput)
             ])
         except KeyError:
@@ -304,8 +317,7 @@ def being_controller(being: Being) -> web.RouteTableDef:
 
     @routes.get('/graph')
     async def get_graph(request):
-        elkGraph = serialize_elk_graph(being)
-        return json_response(elkGraph)
+        return graphSnapshot.response(request)
 
     @routes.get('/config')
     async def config(request):
@@ -314,15 +326,19 @@ def being_controller(being: Being) -> web.RouteTableDef:
     return routes
 
 
-def behavior_controllers(behaviors) -> web.RouteTableDef:
+def behavior_controllers(behaviors, snapshots: Optional[SnapshotCache] = None) -> web.RouteTableDef:
     """API routes for being behaviors.
 
     Args:
         behaviors: All behaviors.
+        snapshots: Shared snapshot cache.
 
     Returns:
         Routes table for API app.
     """
+    if snapshots is None:
+        snapshots = SnapshotCache()
+
     routes = web.RouteTableDef()
     behaviorLookup: Dict[int, Behavior] = {
         behavior.id: behavior
@@ -366,6 +382,7 @@ def behavior_controllers(behaviors) -> web.RouteTableDef:
             params = await request.json()
             behavior = behaviorLookup[id]
             behavior.params = params
+            snapshots.invalidate('blocks')
             return json_response(behavior)
         except json.JSONDecodeError:
             msg = f'Failed deserializing JSON behavior params!'
@@ -377,24 +394,37 @@ def behavior_controllers(behaviors) -> web.RouteTableDef:
     return routes
 
 
-def motion_player_controllers(motionPlayers, behaviors) -> web.RouteTableDef:
+def motion_player_controllers(motionPlayers, behaviors, snapshots: Optional[SnapshotCache] = None) -> web.RouteTableDef:
     """API routes for motion players. Also needs to know about behaviors. To
     pause them on some actions.
 
     Args:
         motionPlayers: All motion players.
         behaviors: All behaviors.
+        snapshots: Shared snapshot cache.
 
     Returns:
         Routes table for API app.
     """
+    if snapshots is None:
+        snapshots = SnapshotCache()
+
     routes = web.RouteTableDef()
     mpLookup = { mp.id: mp for mp in motionPlayers }
 
+    # Motion players serialize their connected motors
+    mpSnapshot = snapshots.register('motionPlayers', lambda: motionPlayers)
+    motors = {
+        motor
+        for mp in motionPlayers
+        for motor in filter_by_type(output_neighbors(mp), MotorBlock)
+    }
+    invalidate_on_motor_events(snapshots, motors, 'motionPlayers')
+
     @routes.get('/motionPlayers')
     async def get_motion_players(request):
         """Inform front end of available motion players / motors."""
-        return json_response(motionPlayers)
+        return mpSnapshot.response(request)
 
     @routes.post('/motionPlayers/play')
     async def play_curves(request):
@@ -471,18 +501,24 @@ def motion_player_controllers(motionPlayers, behaviors) -> web.RouteTableDef:
     return routes
 
 
-def motor_controllers(being)  -> web.RouteTableDef:
+def motor_controllers(being, snapshots: Optional[SnapshotCache] = None)  -> web.RouteTableDef:
     """API routes for motors. Also needs to know about behaviors. To pause them
     on some actions.
 
     Args:
         being: Main being application instance.
+        snapshots: Shared snapshot cache.
 
     Returns:
         Routes table for API app.
 
     """
+    if snapshots is None:
+        snapshots = SnapshotCache()
+
     routes = web.RouteTableDef()
+    motorsSnapshot = snapshots.register('motors', lambda: being.motors)
+    invalidate_on_motor_events(snapshots, being.motors, 'motors')
 
     def pause_others():
         for behavior in being.behaviors:
@@ -493,7 +529,7 @@ def motor_controllers(being)  -> web.RouteTableDef:
 
     @routes.get('/motors')
     async def get_motors(request):
-        return json_response(being.motors)
+        return motorsSnapshot.response(request)
 
     @routes.put('/motors/disable')
     async def disable_motors(request):
@@ -512,6 +548,31 @@ def motor_controllers(being)  -> web.RouteTableDef:
         being.home_motors()
         return respond_ok()
 
+    @routes.get('/motors/homing-progress')
+    async def get_homing_progress(request):
+        return json_response(being.homingScheduler.progress())
+
+    return routes
+
+
+def bus_metrics_controller(networks) -> web.RouteTableDef:
+    """API routes for CAN bus metrics.
+
+    Args:
+        networks: CAN backends / networks.
+
+    Returns:
+        Routes table for API app.
+    """
+    routes = web.RouteTableDef()
+
+    @routes.get('/bus-metrics')
+    async def get_bus_metrics(request):
+        return json_response({
+            str(network.channel): list(network.metrics.history)
+            for network in networks
+        })
+
     return routes
 
 
@@ -540,8 +601,20 @@ def misc_controller() -> web.RouteTableDef:
     return routes
 
 
-def params_controller(params) -> web.RouteTableDef:
-    """Parameter block controller / view."""
+def params_controller(params, snapshots: Optional[SnapshotCache] = None) -> web.RouteTableDef:
+    """Parameter block controller / view.
+
+    Args:
+        params: All parameter blocks.
+        snapshots: Shared snapshot cache. Parameter values are part of the
+            blocks snapshot.
+
+    Returns:
+        Routes table for API app.
+    """
+    if snapshots is None:
+        snapshots = SnapshotCache()
+
     # Params ordering as in the config file(s)
     config = Config()
     for p in params:
@@ -568,6 +641,7 @@ def params_controller(params) -> web.RouteTableDef:
         value = await request.json()
         LOGGER.debug('set_param() %s %s', param, value)
         param.change(value)
+        snapshots.invalidate('blocks')
         return json_response()
 
     for param in params:
@@ -0,0 +1,197 @@
+"""Static asset serving with HTTP caching and precompressed variants.
+
+Static files get served with strong, content hash based ETags. Versioned URLs
+(see :meth:`StaticAssets.url`) carry the content hash as query parameter and
+can therefore be cached forever by the browser. Everything else has to be
+revalidated (cheap 304 Not Modified responses).
+
+Precompressed variants (``.br`` / ``.gz`` next to the original file) are served
+when the client accepts them. They can be generated at build time with
+:func:`precompress_directory` (or ``scripts/precompress_static.py``).
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, List, Tuple
+
+from aiohttp import web
+
+from being.utils import collect_files
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+HASH_LENGTH: int = 12
+"""Number of hex digits of content hashes."""
+
+IMMUTABLE: str = 'public, max-age=31536000, immutable'
+"""Cache-Control for versioned URLs."""
+
+REVALIDATE: str = 'no-cache'
+"""Cache-Control for unversioned URLs. Browser has to revalidate with ETag."""
+
+ENCODINGS: List[Tuple[str, str]] = [
+    ('br', '.br'),
+    ('gzip', '.gz'),
+]
+"""Supported content codings and their file extensions in order of
+preference.
+"""
+
+INCOMPRESSIBLE: set = {'.png', '.ico', '.jpg', '.jpeg', '.gif', '.zip', '.gz', '.br', '.woff', '.woff2'}
+"""File extensions which do not benefit from compression."""
+
+
+def _compressors() -> List[Tuple[str, callable]]:
+    """Available compressors (extension, compress function)."""
+    compressors = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        compressors.insert(0, ('.br', lambda data: brotli.compress(data, quality=11)))
+
+    return compressors
+
+
+def precompress_directory(directory: str, minSize: int = 1024) -> List[str]:
+    """Create precompressed ``.br`` / ``.gz`` variants for all compressible
+    files inside directory (recursively). Brotli only if installed. Variants
+    which are not smaller than the original are skipped.
+
+    Args:
+        directory: Directory to process.
+        minSize: Minimum file size in bytes.
+
+    Returns:
+        Filepaths of the newly created variants.
+    """
+    created = []
+    for fp in collect_files(directory):
+        _, ext = os.path.splitext(fp)
+        if ext.lower() in INCOMPRESSIBLE or os.path.getsize(fp) < minSize:
+            continue
+
+        with open(fp, 'rb') as f:
+            data = f.read()
+
+        for suffix, compress in _compressors():
+            dst = fp + suffix
+            if os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(fp):
+                continue
+
+            compressed = compress(data)
+            if len(compressed) >= len(data):
+                continue
+
+            with open(dst, 'wb') as f:
+                f.write(compressed)
+
+            created.append(dst)
+
+    return created
+
+
+def accepted_encodings(request: web.Request) -> set:
+    """Parse Accept-Encoding header (q-values are ignored)."""
+    header = request.headers.get('Accept-Encoding', '')
+    return {
+        part.split(';')[0].strip().lower()
+        for part in header.split(',')
+    }
+
+
+class StaticAssets:
+
+    """Static directory request handler with content hash ETags, versioned
+    URLs and precompressed variants.
+
+    Example:
+        >>> assets = StaticAssets('path/to/static', prefix='/static')
+        ... app.router.add_get('/static/{path:.*}', assets.handle)
+        ... assets.url('css/being.css')
+        '/static/css/being.css?v=4d8d6c33a0f7'
+    """
+
+    def __init__(self, directory: str, prefix: str = '/static'):
+        """Args:
+            directory: Static directory.
+            prefix: URL prefix.
+        """
+        self.directory = os.path.abspath(directory)
+        self.prefix = prefix.rstrip('/')
+        self.hashes: Dict[str, Tuple[tuple, str]] = {}
+
+    def resolve(self, path: str) -> str:
+        """Resolve relative path to filepath inside static directory.
+
+        Raises:
+            web.HTTPNotFound: If file does not exist or is outside of the
+                static directory.
+        """
+        fp = os.path.abspath(os.path.join(self.directory, path))
+        if not fp.startswith(self.directory + os.sep) or not os.path.isfile(fp):
+            raise web.HTTPNotFound()
+
+        return fp
+
+    def content_hash(self, fp: str) -> str:
+        """Content hash of file. Cached until the file changes."""
+        st = os.stat(fp)
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self.hashes.get(fp)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        hasher = hashlib.sha256()
+        with open(fp, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                hasher.update(chunk)
+
+        digest = hasher.hexdigest()[:HASH_LENGTH]
+        self.hashes[fp] = (key, digest)
+        return digest
+
+    def url(self, path: str) -> str:
+        """Versioned URL for static asset. For the Jinja templates."""
+        digest = self.content_hash(self.resolve(path))
+        return f'{self.prefix}/{path}?v={digest}'
+
+    def select_variant(self, fp: str, request: web.Request) -> Tuple[str, str]:
+        """Pick best precompressed variant for request. Variants have to be
+        kept up to date with their originals (see :func:`precompress_directory`).
+
+        Returns:
+            Filepath and content coding (empty string for identity).
+        """
+        accepted = accepted_encodings(request)
+        for encoding, suffix in ENCODINGS:
+            variant = fp + suffix
+            if encoding in accepted and os.path.isfile(variant):
+                return variant, encoding
+
+        return fp, ''
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """aiohttp request handler. Route has to provide a ``path`` match
+        info.
+        """
+        fp = self.resolve(request.match_info['path'])
+        digest = self.content_hash(fp)
+        variant, encoding = self.select_variant(fp, request)
+        etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+        headers = {
+            'ETag': etag,
+            'Vary': 'Accept-Encoding',
+            'Cache-Control': IMMUTABLE if request.query.get('v') == digest else REVALIDATE,
+        }
+        if etag in request.headers.get('If-None-Match', ''):
+            return web.Response(status=304, headers=headers)
+
+        contentType, _ = mimetypes.guess_type(fp)
+        headers['Content-Type'] = contentType or 'application/octet-stream'
+        if encoding:
+            headers['Content-Encoding'] = encoding
+
+        return web.FileResponse(variant, headers=headers)
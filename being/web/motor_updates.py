@@ -0,0 +1,153 @@
+"""Aggregated motor updates for the front-end.
+
+Motors publish their :class:`being.motors.definitions.MotorEvent` events from
+within the control loop. Serializing and queuing the whole motor for every
+single event does not scale. A flapping drive or a bus wide fault can easily
+emit hundreds of events per second. :class:`MotorUpdates` only marks motors as
+dirty and counts their errors. A periodic flush then packs all due motors and
+their deduplicated errors into one ``motor-updates`` message. Every motor gets
+published at most once per :data:`MOTOR_UPDATE_INTERVAL`.
+
+Example:
+    >>> updates = MotorUpdates(ws)
+    ... for motor in being.motors:
+    ...     updates.watch(motor)
+    ...
+    ... app.on_startup.append(updates.start)
+    ... app.on_shutdown.append(updates.stop)
+"""
+import asyncio
+import collections
+import time
+from typing import Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from being.configuration import CONFIG
+from being.motors.blocks import MotorBlock
+from being.motors.definitions import MotorEvent
+from being.web.web_socket import WebSocket
+
+
+FLUSH_INTERVAL = CONFIG['Web']['INTERVAL']
+"""Interval of the flush task in seconds."""
+
+MOTOR_UPDATE_INTERVAL = CONFIG['Web']['MOTOR_UPDATE_INTERVAL']
+"""Minimum interval between two updates of the same motor in seconds."""
+
+
+class MotorUpdates:
+
+    """Batches motor state changes and errors into ``motor-updates`` messages.
+    Subscribers are cheap enough to be called from the control loop during
+    fault storms. Repeated error messages of a motor get counted instead of
+    queued.
+
+    Attributes:
+        dirty: Motors with pending updates. Insertion ordered.
+        errors: Pending error message counts per motor.
+        lastPublished: Last publication timestamp per motor.
+    """
+
+    def __init__(self,
+            ws: Optional[WebSocket] = None,
+            interval: float = MOTOR_UPDATE_INTERVAL,
+            time_func: Callable = time.perf_counter,
+        ):
+        """Args:
+            ws (optional): Web socket to send the messages over.
+            interval (optional): Minimum interval between two updates of the
+                same motor.
+            time_func (optional): Timing function.
+        """
+        self.ws = ws
+        self.interval = interval
+        self.time_func = time_func
+        self.dirty: Dict[MotorBlock, None] = {}
+        self.errors: Dict[MotorBlock, collections.Counter] = collections.defaultdict(collections.Counter)
+        self.lastPublished: Dict[MotorBlock, float] = {}
+        self.flushTask = None
+
+    def watch(self, motor: MotorBlock):
+        """Subscribe to the events of a motor.
+
+        Args:
+            motor: Motor block to watch.
+        """
+        markDirty = lambda: self.mark_dirty(motor)
+        motor.subscribe(MotorEvent.STATE_CHANGED, markDirty)
+        motor.subscribe(MotorEvent.HOMING_CHANGED, markDirty)
+        motor.subscribe(MotorEvent.ERROR, lambda msg: self.add_error(motor, msg))
+
+    def mark_dirty(self, motor: MotorBlock):
+        """Mark motor for the next update."""
+        self.dirty[motor] = None
+
+    def add_error(self, motor: MotorBlock, msg: str):
+        """Count error message of motor. Also marks the motor."""
+        self.errors[motor][msg] += 1
+        self.dirty[motor] = None
+
+    def due(self, now: float) -> List[MotorBlock]:
+        """Dirty motors whose last update is at least one interval ago."""
+        return [
+            motor for motor in self.dirty
+            if now - self.lastPublished.get(motor, -float('inf')) >= self.interval
+        ]
+
+    def flush(self) -> Optional[dict]:
+        """Pack all due motors and their errors into one message.
+
+        Returns:
+            ``motor-updates`` message. None if there is nothing to send.
+        """
+        now = self.time_func()
+        motors = self.due(now)
+        if not motors:
+            return None
+
+        errors = []
+        for motor in motors:
+            del self.dirty[motor]
+            self.lastPublished[motor] = now
+            counts = self.errors.pop(motor, None)
+            if counts:
+                errors.extend(
+                    {'motorId': motor.id, 'message': msg, 'count': count}
+                    for msg, count in counts.items()
+                )
+
+        return {
+            'type': 'motor-updates',
+            'motors': motors,
+            'errors': errors,
+        }
+
+    async def flush_task(self, interval: float = FLUSH_INTERVAL):
+        """Periodically flush and send the pending updates."""
+        while True:
+            msg = self.flush()
+            if msg is not None:
+                self.ws.send_json_buffered(msg)
+
+            await asyncio.sleep(interval)
+
+    #pylint: disable=unused-argument
+    async def start(self, app: web.Application = None):
+        """Start flush task."""
+        await self.stop()
+        self.flushTask = asyncio.create_task(self.flush_task())
+
+    #pylint: disable=unused-argument
+    async def stop(self, app: web.Application = None):
+        """Stop flush task."""
+        if not self.flushTask:
+            return
+
+        self.flushTask.cancel()
+        try:
+            await self.flushTask
+        except asyncio.CancelledError:
+            pass
+
+        self.flushTask = None
@@ -1,6 +1,12 @@
 from aiohttp import web
+from aiohttp.web import ContentCoding
 
+from being.configuration import CONFIG
 from being.serialization import dumps
+from being.web.assets import accepted_encodings
+
+
+COMPRESSION_THRESHOLD = CONFIG['Web']['COMPRESSION_THRESHOLD']
 
 
 def respond_ok():
@@ -19,6 +25,24 @@ def json_response(obj=None):
 
     return web.json_response(obj, dumps=dumps)
 
+
+@web.middleware
+async def compress_large_responses(request, handler):
+    """Middleware for gzip compressing large responses (if the client accepts
+    it). Small responses are not worth the CPU cycles.
+    """
+    response = await handler(request)
+    if not isinstance(response, web.Response) or response.body is None:
+        return response
+
+    if response.headers.get('Content-Encoding'):
+        return response
+
+    if len(response.body) >= COMPRESSION_THRESHOLD and 'gzip' in accepted_encodings(request):
+        response.enable_compression(ContentCoding.gzip)
+
+    return response
+
 # Note: Do not use lambda function as response factories! Leads to errors under Windows because the
 # IocpProactor proactor does not accept non-async lambda functions.
 #
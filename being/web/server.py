@@ -15,13 +15,13 @@ from being.configuration import CONFIG
 from being.connectables import MessageInput
 from being.content import CONTENT_CHANGED, Content
 from being.logging import BEING_LOGGER, get_logger
-from being.motors.definitions import MotorEvent
 from being.params import MotionSelection
 from being.sensors import Sensor
 from being.utils import filter_by_type
 from being.web.api import (
     behavior_controllers,
     being_controller,
+    bus_metrics_controller,
     content_controller,
     messageify,
     misc_controller,
@@ -29,6 +29,10 @@ from being.web.api import (
     motor_controllers,
     params_controller,
 )
+from being.web.assets import StaticAssets
+from being.web.motor_updates import MotorUpdates
+from being.web.responses import compress_large_responses
+from being.web.snapshots import SnapshotCache
 from being.web.web_socket import WebSocket
 
 
@@ -80,8 +84,8 @@ def patch_sensor_to_web_socket(sensor, ws: WebSocket):
 def init_api(being, ws: WebSocket) -> web.Application:
     """Initialize and setup Rest-like API sub-app."""
     content = Content.single_instance_setdefault()
-    api = web.Application()
-
+    api = web.Application(middlewares=[compress_large_responses])
+    snapshots = SnapshotCache()
 
     def ws_emit(obj):
         """Function factory for creating callable sender task to emit the
@@ -115,7 +119,7 @@ def init_api(being, ws: WebSocket) -> web.Application:
         return lambda: ws.send_json_buffered(messageify(obj))
 
     # Being
-    api.add_routes(being_controller(being))
+    api.add_routes(being_controller(being, snapshots))
 
     # Misc functionality
     api.add_routes(misc_controller())
@@ -133,30 +137,28 @@ def init_api(being, ws: WebSocket) -> web.Application:
         patch_sensor_to_web_socket(sensor, ws)
 
     # Behaviors
-    api.add_routes(behavior_controllers(being.behaviors))
+    api.add_routes(behavior_controllers(being.behaviors, snapshots))
     for behavior in being.behaviors:
         behavior.subscribe(BEHAVIOR_CHANGED, ws_emit(behavior))
         content.subscribe(CONTENT_CHANGED, behavior._purge_params)
 
     # Motion players
-    api.add_routes(motion_player_controllers(being.motionPlayers, being.behaviors))
+    api.add_routes(motion_player_controllers(being.motionPlayers, being.behaviors, snapshots))
 
     # Motors
-    api.add_routes(motor_controllers(being))
-
-    def ws_motor_error_notification(motor):
-        return lambda msg: ws.send_json_buffered({
-            'type': 'motor-error',
-            'motor': motor,
-            'message': msg,
-        })
+    api.add_routes(motor_controllers(being, snapshots))
 
+    motorUpdates = MotorUpdates(ws)
     for motor in being.motors:
-        motor.subscribe(MotorEvent.STATE_CHANGED, ws_emit(motor))
-        motor.subscribe(MotorEvent.HOMING_CHANGED, ws_emit(motor))
-        motor.subscribe(MotorEvent.ERROR, ws_motor_error_notification(motor))
+        motorUpdates.watch(motor)
+
+    api.on_startup.append(motorUpdates.start)
+    api.on_shutdown.append(motorUpdates.stop)
+
+    api.add_routes(params_controller(being.params, snapshots))
 
-    api.add_routes(params_controller(being.params))
+    # CAN bus metrics
+    api.add_routes(bus_metrics_controller(being.networks))
 
     wire_being_loggers_to_web_socket(ws)
 
@@ -179,7 +181,11 @@ def init_web_server(being, ws) -> web.Application:
         app: Application instance.
     """
     app = web.Application()
-    aiohttp_jinja2.setup(app, loader=jinja2.PackageLoader('being.web', 'templates'))
+    here = os.path.dirname(os.path.abspath(__file__))
+    staticDir = os.path.join(here, 'static')
+    assets = StaticAssets(staticDir, prefix='/static')
+    env = aiohttp_jinja2.setup(app, loader=jinja2.PackageLoader('being.web', 'templates'))
+    env.globals['static_url'] = assets.url
 
     # Web socket
     app.router.add_get(WEB_SOCKET_ADDRESS, ws.handle_new_connection)
@@ -189,17 +195,17 @@ def init_web_server(being, ws) -> web.Application:
     app.on_shutdown.append(ws.stop_broker)
     app.on_shutdown.append(ws.close_all_connections)
 
-    # Static directory
-    here = os.path.dirname(os.path.abspath(__file__))
-    staticDir = os.path.join(here, 'static')
-    app.router.add_static(prefix='/static', path=staticDir, show_index=True)
+    # Static directory. Content hash ETags, precompressed variants
+    app.router.add_get('/static/{path:.*}', assets.handle)
 
     # Routes
     routes = web.RouteTableDef()
 
     @routes.get('/favicon.ico')
     async def get_favicon(request):
-        return web.FileResponse(os.path.join(staticDir, 'favicon.ico'))
+        return web.FileResponse(os.path.join(staticDir, 'favicon.ico'), headers={
+            'Cache-Control': 'public, max-age=86400',
+        })
 
     @routes.get('/')
     @aiohttp_jinja2.template('index.html')
@@ -0,0 +1,141 @@
+"""Versioned and cached JSON snapshots for API responses.
+
+Serializing the whole being (all blocks, motors, motion players, ...) is not
+for free. A :class:`Snapshot` caches the serialized response body and carries a
+version number which gets bumped whenever the underlying objects change. This
+is typically triggered by the already existing :class:`being.pubsub.PubSub`
+events (:class:`being.motors.definitions.MotorEvent`,
+:data:`being.behavior.BEHAVIOR_CHANGED`, :data:`being.content.CONTENT_CHANGED`).
+The version number is used as ETag so that clients which already have the
+latest snapshot get a cheap 304 Not Modified response.
+
+Example:
+    >>> snapshots = SnapshotCache()
+    ... snapshot = snapshots.register('motors', lambda: being.motors)
+    ... for motor in being.motors:
+    ...     snapshots.invalidate_on(motor, MotorEvent.STATE_CHANGED, 'motors')
+    ...
+    ... @routes.get('/motors')
+    ... async def get_motors(request):
+    ...     return snapshot.response(request)
+"""
+import secrets
+from typing import Any, Callable, Dict, Optional
+
+from aiohttp import web
+
+from being.pubsub import PubSub
+from being.serialization import dumps
+from being.web.assets import REVALIDATE
+
+
+EPOCH: str = secrets.token_hex(4)
+"""Random token for this process. Part of the ETags so that snapshot versions
+from a previous run do not get mistaken for the current ones.
+"""
+
+
+class Snapshot:
+
+    """Lazily serialized JSON snapshot with version number based ETag."""
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        """Args:
+            name: Snapshot name (part of the ETag).
+            factory: Returns the object to serialize.
+        """
+        self.name = name
+        self.factory = factory
+        self.version = 0
+        self.body: Optional[bytes] = None
+
+    @property
+    def etag(self) -> str:
+        """Current ETag."""
+        return f'"{self.name}-{EPOCH}-{self.version}"'
+
+    def invalidate(self, *args, **kwargs):
+        """Mark snapshot as outdated. Accepts and ignores any arguments so that
+        it can be used directly as PubSub callback.
+        """
+        self.version += 1
+        self.body = None
+
+    def serialize(self) -> bytes:
+        """Serialized snapshot. Only gets re-serialized if outdated."""
+        if self.body is None:
+            self.body = dumps(self.factory()).encode()
+
+        return self.body
+
+    def response(self, request: web.Request) -> web.Response:
+        """Respond with snapshot or 304 Not Modified if the client already has
+        the current version.
+        """
+        headers = {
+            'ETag': self.etag,
+            'Cache-Control': REVALIDATE,
+        }
+        if self.etag in request.headers.get('If-None-Match', ''):
+            return web.Response(status=304, headers=headers)
+
+        return web.Response(
+            body=self.serialize(),
+            content_type='application/json',
+            headers=headers,
+        )
+
+    def __str__(self):
+        return f'{type(self).__name__}({self.name!r}, version: {self.version})'
+
+
+class SnapshotCache:
+
+    """Named snapshots which can be shared and invalidated across API
+    controllers.
+    """
+
+    def __init__(self):
+        self.snapshots: Dict[str, Snapshot] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> Snapshot:
+        """Register a new snapshot.
+
+        Args:
+            name: Snapshot name.
+            factory: Returns the object to serialize.
+
+        Returns:
+            New snapshot.
+        """
+        if name in self.snapshots:
+            raise ValueError(f'Snapshot {name!r} already registered!')
+
+        snapshot = self.snapshots[name] = Snapshot(name, factory)
+        return snapshot
+
+    def invalidate(self, *names: str):
+        """Invalidate snapshots by name. Unknown names are ignored.
+
+        Args:
+            *names: Snapshot names. All snapshots if omitted.
+        """
+        if not names:
+            names = tuple(self.snapshots)
+
+        for name in names:
+            if name in self.snapshots:
+                self.snapshots[name].invalidate()
+
+    def invalidate_on(self, publisher: PubSub, event, *names: str):
+        """Invalidate snapshots whenever publisher publishes event.
+
+        Args:
+            publisher: Event publisher.
+            event: Event to subscribe to.
+            *names: Snapshot names.
+        """
+        publisher.subscribe(event, lambda *args, **kwargs: self.invalidate(*names))
+
+    def __getitem__(self, name: str) -> Snapshot:
+        return self.snapshots[name]
@@ -136,6 +136,12 @@ export class NotificationCenter {
             this.update_motor_notification(msg.motor);
         } else if (msg.type === "motor-updates") {
             msg.motors.forEach(motor => this.update_motor_notification(motor));
+            const names = {};
+            msg.motors.forEach(motor => names[motor.id] = motor.name);
+            (msg.errors || []).forEach(error => {
+                const repeated = error.count > 1 ? " (" + error.count + "x)" : "";
+                this.notify(names[error.motorId] + " " + error.message + repeated, "error", 5);
+            });
         } else if (msg.type === "motor-error") {
             const name = msg.motor.name;
             this.notify(name + " " + msg.message, "error", 5);
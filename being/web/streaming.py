@@ -0,0 +1,240 @@
+"""Chunked streaming of zip archives for down- and uploads.
+
+Backups / restores of content directories can get large. Neither the outgoing
+archive nor the uploaded files are held in memory as a whole. Archives get
+streamed out chunk by chunk and uploads are spooled to disk and unpacked member
+by member. Blocking work (zip extraction, validation) runs in the default
+executor so that the event loop stays responsive.
+"""
+import asyncio
+import io
+import os
+import tempfile
+import zipfile
+from typing import Callable, Iterable, List
+
+from aiohttp import web
+
+from being.logging import get_logger
+
+
+CHUNK_SIZE: int = 64 * 1024
+"""Number of bytes per read / write chunk (being.constants.KB is in bits)."""
+
+MAX_FILE_SIZE: int = 64 * 1024 ** 2
+"""Maximum size of a single uploaded (or unpacked) file. Zip bombs."""
+
+SPOOL_SIZE: int = 1024 ** 2
+"""Uploads larger than this get spooled to disk instead of memory."""
+
+LOGGER = get_logger(name=__name__, parent=None)
+"""Streaming module logger."""
+
+
+class _ChunkBuffer(io.RawIOBase):
+
+    """Non-seekable, write-only file object. Collects written bytes until they
+    get popped. ZipFile falls back to data descriptors for non-seekable files
+    which allows us to stream the archive while it is being written.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b) -> int:
+        self.chunks.append(bytes(b))
+        self.position += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self.position
+
+    def pop(self) -> bytes:
+        """Pop all collected bytes so far."""
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+async def stream_zip_archive(
+        request: web.Request,
+        filepaths: Iterable[str],
+        filename: str = 'archive.zip',
+    ) -> web.StreamResponse:
+    """Stream files as zip archive to the client. Only one chunk at the time is
+    held in memory.
+
+    Args:
+        request: Incoming request.
+        filepaths: Files to pack into the archive (flat, by basename).
+        filename: Archive filename for the client.
+
+    Returns:
+        Finished stream response.
+    """
+    response = web.StreamResponse(headers={
+        'Content-Type': 'application/zip',
+        'Content-Disposition': f'attachment; filename="{filename}"',
+    })
+    await response.prepare(request)
+    buf = _ChunkBuffer()
+    with zipfile.ZipFile(buf, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for fp in filepaths:
+            zinfo = zipfile.ZipInfo.from_file(fp, arcname=os.path.basename(fp))
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            with open(fp, 'rb') as src, zf.open(zinfo, 'w') as dst:
+                while True:
+                    chunk = src.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+
+                    dst.write(chunk)
+                    await response.write(buf.pop())
+
+            await response.write(buf.pop())
+
+    await response.write(buf.pop())  # Central directory
+    await response.write_eof()
+    return response
+
+
+def _copy_bounded(src, dst, maxSize: int = MAX_FILE_SIZE) -> int:
+    """Copy file object chunk by chunk. ValueError if exceeding maxSize."""
+    total = 0
+    while True:
+        chunk = src.read(CHUNK_SIZE)
+        if not chunk:
+            return total
+
+        total += len(chunk)
+        if total > maxSize:
+            raise ValueError(f'exceeds maximum file size of {maxSize} bytes!')
+
+        dst.write(chunk)
+
+
+def install_file(src, directory: str, filename: str, validate: Callable[[str], None]):
+    """Copy file object into directory. The data first goes into a temporary
+    file next to the destination which gets validated and then atomically
+    moved into place. Invalid files leave no trace behind.
+
+    Args:
+        src: Readable binary file object.
+        directory: Destination directory.
+        filename: Destination filename.
+        validate: Validation function. Gets called with the temporary filepath.
+            Raises an exception if invalid.
+    """
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as dst:
+            _copy_bounded(src, dst)
+
+        validate(tmp)
+        os.replace(tmp, os.path.join(directory, filename))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def unpack_upload(
+        fileobj,
+        filename: str,
+        directory: str,
+        validate: Callable[[str], None],
+        accept: Callable[[str], bool],
+    ) -> List[dict]:
+    """Unpack a spooled upload into directory. Zip archives get extracted
+    member by member. Blocking.
+
+    Args:
+        fileobj: Spooled upload file object.
+        filename: Upload filename.
+        directory: Destination directory.
+        validate: Validation function for each file (see :func:`install_file`).
+        accept: Filename filter. Rejected files are reported as errors.
+
+    Returns:
+        Notification messages for the front end.
+    """
+    messages = []
+
+    def install(src, fp):
+        if not accept(fp):
+            messages.append({'type': 'error', 'message': '%r has an unsupported file type!' % fp})
+            return
+
+        try:
+            install_file(src, directory, os.path.basename(fp), validate)
+            messages.append({'type': 'success', 'message': 'Uploaded file %r' % fp})
+        except Exception as err:
+            messages.append({'type': 'error', 'message': '%r %s' % (fp, err)})
+
+    if not filename.lower().endswith('.zip'):
+        install(fileobj, filename)
+        return messages
+
+    try:
+        with zipfile.ZipFile(fileobj, 'r') as zf:
+            for zinfo in zf.infolist():
+                if zinfo.is_dir():
+                    continue
+
+                with zf.open(zinfo) as src:
+                    install(src, zinfo.filename)
+
+    except zipfile.BadZipFile as err:
+        messages.append({'type': 'error', 'message': '%r %s' % (filename, err)})
+
+    return messages
+
+
+async def receive_uploads(
+        request: web.Request,
+        directory: str,
+        validate: Callable[[str], None],
+        accept: Callable[[str], bool],
+    ) -> List[dict]:
+    """Receive multipart file uploads in chunks. Each uploaded file gets spooled
+    (memory or disk, depending on its size) and then unpacked / validated in
+    the default executor.
+
+    Args:
+        request: Incoming multipart POST request.
+        directory: Destination directory.
+        validate: Validation function for each file (see :func:`install_file`).
+        accept: Filename filter.
+
+    Returns:
+        Notification messages for the front end.
+    """
+    loop = asyncio.get_running_loop()
+    reader = await request.multipart()
+    messages = []
+    async for part in reader:
+        if not part.filename:
+            continue
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+            size = 0
+            while True:
+                chunk = await part.read_chunk(CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                spool.write(chunk)
+
+            spool.seek(0)
+            LOGGER.debug('Received %r (%d bytes)', part.filename, size)
+            messages.extend(await loop.run_in_executor(
+                None, unpack_upload, spool, part.filename, directory, validate, accept,
+            ))
+
+    return messages
+
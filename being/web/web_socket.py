@@ -28,17 +28,22 @@ class WebSocket:
         self.logger = get_logger('WebSocket')
         self.brokerTask = None
 
-    async def send_json(self, data):
-        """Send data as JSON to all connected web sockets.
+    async def send_json(self, data, dumps=dumps):
+        """Send data as JSON to all connected web sockets. Data gets only
+        serialized once for all connections.
 
         Args:
             data: Data to send as JSON.
+            dumps: JSON serialization function.
         """
-        for ws in self.sockets.copy():
-            if ws.closed:
-                continue
+        sockets = [ws for ws in self.sockets.copy() if not ws.closed]
+        if not sockets:
+            return
+
+        text = dumps(data)
+        for ws in sockets:
             try:
-                await ws.send_json(data, dumps=dumps)
+                await ws.send_str(text)
             except ConnectionResetError as err:
                 self.logger.exception(err)
 
@@ -1,10 +1,13 @@
 #!/usr/local/python3
 """Being for ECAL workshop May 2021."""
+import functools
+
 from being.behavior import Behavior
 from being.awakening import awake
-from being.logging import setup_logging, suppress_other_loggers
+from being.logging import get_logger, setup_logging, suppress_other_loggers
 from being.motion_player import MotionPlayer
 from being.motors import LinearMotor, RotaryMotor
+from being.motors.bringup import bring_up
 from being.resources import manage_resources
 from being.sensors import SensorGpio
 
@@ -12,14 +15,22 @@ from being.sensors import SensorGpio
 NODE_IDS = [1, 2]
 """Motor ids to use."""
 
+LOGGER = get_logger('ecal_being')
+
+
+def find_motor(nodeId):
+    """Create motor for node id. None if it is not available."""
+    try:
+        return LinearMotor(nodeId, length=0.100)
+    except RuntimeError as err:
+        LOGGER.warning('Skipping motor %d (%s)', nodeId, err)
+        return None
+
 
 def look_for_motors():
-    """Look which motors for NODE_IDS are available."""
-    for nodeId in NODE_IDS:
-        try:
-            yield LinearMotor(nodeId, length=0.100)
-        except RuntimeError:
-            pass
+    """Look which motors for NODE_IDS are available. Brought up concurrently."""
+    motors = bring_up(functools.partial(find_motor, nodeId) for nodeId in NODE_IDS)
+    return [motor for motor in motors if motor is not None]
 
 
 #setup_logging()
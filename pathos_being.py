@@ -1,5 +1,6 @@
 #!/usr/local/python3
 """Pathos being for linear motors."""
+import functools
 import logging
 
 from being.awakening import awake
@@ -8,6 +9,7 @@ from being.behavior import Behavior
 from being.logging import setup_logging, suppress_other_loggers
 from being.motion_player import MotionPlayer
 from being.motors import LinearMotor, RotaryMotor
+from being.motors.bringup import bring_up
 from being.resources import register_resource, manage_resources
 from being.sensors import SensorGpio
 
@@ -25,10 +27,10 @@ with manage_resources():
     # Scan for motors
     network = CanBackend.single_instance_setdefault()
     register_resource(network, duplicates=False)
-    motors = [
-        LinearMotor(nodeId, motor=MOTOR_NAME, name=f'Motor ID {nodeId}')
+    motors = bring_up(
+        functools.partial(LinearMotor, nodeId, motor=MOTOR_NAME, name=f'Motor ID {nodeId}')
         for nodeId in network.scan_for_node_ids()
-    ]
+    )
     if not motors:
         raise RuntimeError('Found no motors!')
 
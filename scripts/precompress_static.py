@@ -0,0 +1,31 @@
+#!/bin/python3
+"""Precompress static web assets (.gz / .br variants) CLI util. Run before
+packaging / deploying. Brotli variants only if the brotli package is installed.
+"""
+import argparse
+import os
+
+import being.web
+from being.web.assets import precompress_directory
+
+
+def cli(args=None):
+    defaultDir = os.path.join(os.path.dirname(being.web.__file__), 'static')
+    parser = argparse.ArgumentParser(description='Static assets precompressor.')
+    parser.add_argument('directory', type=str, nargs='?', default=defaultDir, help='static directory')
+    parser.add_argument('-v', '--verbose', default=False, action='store_true', help='Verbose console output')
+    return parser.parse_args(args)
+
+
+def main():
+    args = cli()
+    created = precompress_directory(args.directory)
+    if args.verbose:
+        for fp in created:
+            print(fp)
+
+    print(f'Created {len(created)} precompressed variants')
+
+
+if __name__ == '__main__':
+    main()
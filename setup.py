@@ -54,6 +54,8 @@ setup(
         'aiohttp-jinja2',
         #'RPi.GPIO',  # Needed on Rpi. We do not include it here that being can run on normal computers...
         #'PyAudio',  # Optional. Not needed right now
+        #'orjson',  # Optional. Faster JSON serialization of the being state stream
+        #'msgpack',  # Optional. Binary serialization codec
         'ruamel.yaml',
         'tomlkit',
         'configobj',
@@ -0,0 +1,73 @@
+"""Shared test helpers."""
+import time
+
+from being.backends import CanBackend
+from being.can import load_object_dictionary
+from being.can.cia_402 import CiA402Node
+from being.can.od_cache import ObjectDictionaryCache
+from being.can.simulation import DriveSimulator
+
+
+OD_CACHE = ObjectDictionaryCache(directory=None)
+"""Object dictionary cache of the tests. Only in memory so that the tests do not
+write into the cache directory of the user.
+"""
+
+
+def run(job, timeout=1.0):
+    """Drive generator job to completion and return its value."""
+    endTime = time.perf_counter() + timeout
+    while time.perf_counter() < endTime:
+        try:
+            next(job)
+        except StopIteration as stop:
+            return stop.value
+
+        time.sleep(0.001)
+
+    raise TimeoutError
+
+
+class SimulatedBusMixin:
+
+    """Mixin for test cases which run against simulated drives on a virtual CAN
+    bus. Everything gets torn down via ``addCleanup()`` (in reverse order), also
+    when ``setUp()`` fails halfway.
+
+    Example:
+        >>> class TestSomething(SimulatedBusMixin, unittest.TestCase):
+        ...     def setUp(self):
+        ...         self.start_simulation('test_something', nodeIds=[1, 2])
+        ...         self.nodes = [self.create_node(1), self.create_node(2)]
+    """
+
+    def enter_context(self, cm):
+        """Enter context manager and register its exit as cleanup."""
+        obj = cm.__enter__()
+        self.addCleanup(cm.__exit__, None, None, None)
+        return obj
+
+    def start_simulation(self, channel: str, nodeIds=(1,), **kwargs):
+        """Start drive simulator with some drives and connect a network to it.
+        Sets ``self.simulator`` and ``self.network``.
+
+        Args:
+            channel: Virtual bus channel. Unique per test module.
+            nodeIds (optional): Node IDs of the simulated drives to add.
+            **kwargs: Arguments for :meth:`DriveSimulator.add_drive`.
+        """
+        self.simulator = self.enter_context(DriveSimulator(channel=channel))
+        for nodeId in nodeIds:
+            self.simulator.add_drive(nodeId, **kwargs)
+
+        self.network = self.enter_context(CanBackend(bustype='virtual', channel=channel))
+
+    def load_object_dictionary(self, nodeId: int):
+        """Load object dictionary of a node on the network. Cached in memory
+        only (see :data:`OD_CACHE`).
+        """
+        return load_object_dictionary(self.network, nodeId, cache=OD_CACHE)
+
+    def create_node(self, nodeId: int) -> CiA402Node:
+        """Create CiA 402 node on the network."""
+        return CiA402Node(nodeId, self.load_object_dictionary(nodeId), self.network)
@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
+
+from being.web.assets import IMMUTABLE, REVALIDATE, StaticAssets, precompress_directory
+from being.web.responses import compress_large_responses
+
+
+SCRIPT = b'console.log("Hello, world!");\n' * 200
+
+
+class TestStaticAssets(AioHTTPTestCase):
+    async def get_application(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmpdir.name, 'js'))
+        with open(os.path.join(self.tmpdir.name, 'js', 'script.js'), 'wb') as f:
+            f.write(SCRIPT)
+
+        self.assets = StaticAssets(self.tmpdir.name)
+
+        async def get_big_json(request):
+            return web.json_response(list(range(1000)))
+
+        app = web.Application(middlewares=[compress_large_responses])
+        app.router.add_get('/static/{path:.*}', self.assets.handle)
+        app.router.add_get('/big', get_big_json)
+        return app
+
+    async def tearDownAsync(self):
+        self.tmpdir.cleanup()
+
+    @unittest_run_loop
+    async def test_versioned_urls_are_immutable(self):
+        url = self.assets.url('js/script.js')
+        resp = await self.client.get(url)
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.headers['Cache-Control'], IMMUTABLE)
+        self.assertEqual(await resp.read(), SCRIPT)
+
+        resp = await self.client.get('/static/js/script.js')
+
+        self.assertEqual(resp.headers['Cache-Control'], REVALIDATE)
+
+    @unittest_run_loop
+    async def test_matching_etag_leads_to_not_modified(self):
+        resp = await self.client.get('/static/js/script.js')
+        etag = resp.headers['ETag']
+        resp = await self.client.get('/static/js/script.js', headers={'If-None-Match': etag})
+
+        self.assertEqual(resp.status, 304)
+
+    @unittest_run_loop
+    async def test_precompressed_variant_gets_served(self):
+        created = precompress_directory(self.tmpdir.name)
+
+        self.assertIn(os.path.join(self.tmpdir.name, 'js', 'script.js.gz'), created)
+
+        resp = await self.client.get('/static/js/script.js', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(await resp.read(), SCRIPT)
+
+    @unittest_run_loop
+    async def test_no_escaping_from_static_directory(self):
+        resp = await self.client.get('/static/../../etc/passwd')
+
+        self.assertEqual(resp.status, 404)
+
+    @unittest_run_loop
+    async def test_large_responses_get_compressed(self):
+        resp = await self.client.get('/big', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(await resp.json(), list(range(1000)))
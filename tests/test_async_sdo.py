@@ -0,0 +1,101 @@
+import threading
+import time
+import unittest
+
+from canopen import RemoteNode
+from canopen.sdo import SdoAbortedError, SdoCommunicationError
+
+from being.can.async_sdo import AsyncSdoClient
+from being.can.cia_402 import (
+    MAX_PROFILE_VELOCITY, PROFILE_VELOCITY, STATUSWORD, TARGET_POSITION, OperationMode, State,
+)
+
+from tests.helpers import SimulatedBusMixin, run
+
+
+class TestAsyncSdoClient(SimulatedBusMixin, unittest.TestCase):
+    def setUp(self):
+        self.start_simulation('test_async_sdo')
+        self.drive = self.simulator.drives[1]
+        self.node = self.create_node(1)
+
+    def test_requests_get_resolved_in_order(self):
+        asyncSdo = self.node.asyncSdo
+        write = asyncSdo.write(MAX_PROFILE_VELOCITY, 1234)
+        read = asyncSdo.read(MAX_PROFILE_VELOCITY)
+
+        self.assertIsNone(write.result(timeout=1.0))
+        self.assertEqual(read.result(timeout=1.0), 1234)
+        self.assertEqual(asyncSdo.pending_requests(), 0)
+
+    def test_waiting_inside_generator_job(self):
+        job = self.node.asyncSdo.read('Max Profile Velocity').wait()
+
+        self.assertEqual(run(job), self.node.sdo[MAX_PROFILE_VELOCITY].raw)
+
+    def test_aborted_transfer(self):
+        future = self.node.asyncSdo.write(STATUSWORD, 0)
+
+        with self.assertRaises(SdoAbortedError):
+            future.result(timeout=1.0)
+
+    def test_blocking_client_keeps_working_side_by_side(self):
+        self.node.sdo[PROFILE_VELOCITY].raw = 42
+        future = self.node.asyncSdo.read(MAX_PROFILE_VELOCITY)
+
+        self.assertEqual(self.node.sdo[PROFILE_VELOCITY].raw, 42)
+        self.assertEqual(future.result(timeout=1.0), self.drive.get_value(MAX_PROFILE_VELOCITY))
+
+    def test_concurrent_blocking_and_async_transfers_get_serialized(self):
+        asyncSdo = self.node.asyncSdo
+        errors = []
+
+        def hammer():
+            try:
+                for value in range(50):
+                    self.node.sdo[PROFILE_VELOCITY].raw = value
+                    self.assertEqual(self.node.sdo[PROFILE_VELOCITY].raw, value)
+            except Exception as err:
+                errors.append(err)
+
+        thread = threading.Thread(target=hammer)
+        thread.start()
+        futures = [asyncSdo.write(MAX_PROFILE_VELOCITY, value) for value in range(50)]
+        futures.append(asyncSdo.read(MAX_PROFILE_VELOCITY))
+        thread.join(timeout=5.0)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(futures[-1].result(timeout=1.0), 49)
+        self.assertEqual(asyncSdo.pending_requests(), 0)
+        self.assertFalse(asyncSdo.transferLock.locked())
+
+    def test_missing_node_times_out(self):
+        node = RemoteNode(42, self.load_object_dictionary(1))
+        self.network.add_node(node)
+        asyncSdo = AsyncSdoClient(node, timeout=0.01)
+        first = asyncSdo.read(MAX_PROFILE_VELOCITY)
+        second = asyncSdo.read(MAX_PROFILE_VELOCITY)
+
+        with self.assertRaises(SdoCommunicationError):
+            run(first.wait())
+
+        with self.assertRaises(SdoCommunicationError):
+            run(second.wait())
+
+    def test_profile_moves_do_not_block(self):
+        self.node.set_operation_mode(OperationMode.PROFILE_POSITION)
+        self.node.change_state(State.OPERATION_ENABLED)
+        future = self.node.move_to(1000, velocity=500)
+        future.result(timeout=1.0)
+
+        self.assertEqual(self.drive.get_value(TARGET_POSITION), 1000)
+        self.assertEqual(self.drive.get_value(PROFILE_VELOCITY), 500)
+
+    def test_operation_mode_switching_job(self):
+        run(self.node.operation_mode_switching_job(OperationMode.PROFILE_VELOCITY))
+
+        self.assertEqual(self.node.get_operation_mode(), OperationMode.PROFILE_VELOCITY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+import threading
+import time
+import unittest
+
+import can
+
+from being.backends import (
+    CanBackend, RpdoFrame, connected_networks, find_network, frame_bits,
+    network_for_channel,
+)
+from being.can.cia_402 import State, change_states
+
+from tests.helpers import SimulatedBusMixin
+
+
+class DummyBus:
+
+    """Collects sent CAN messages (copies)."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg, timeout=None):
+        self.sent.append((msg.arbitration_id, bytes(msg.data)))
+
+
+class DummyRpdo:
+
+    """Placeholder for canopen RPDO map."""
+
+    def __init__(self, cobId, data):
+        self.cob_id = cobId
+        self.data = bytearray(data)
+
+
+class TestRpdoFrame(unittest.TestCase):
+    def test_frame_does_not_alias_map_data(self):
+        rx = DummyRpdo(0x201, [0, 0])
+        frame = RpdoFrame(rx)
+        rx.data[0] = 1
+
+        self.assertTrue(frame.refresh())
+        self.assertEqual(frame.msg.data, bytearray([1, 0]))
+        self.assertFalse(frame.refresh())
+
+    def test_new_cob_id_and_size(self):
+        rx = DummyRpdo(0x201, [0, 0])
+        frame = RpdoFrame(rx)
+        rx.cob_id = 0x301
+        rx.data = bytearray([1, 2, 3, 4])
+
+        self.assertTrue(frame.refresh())
+        self.assertEqual(frame.msg.arbitration_id, 0x301)
+        self.assertEqual(frame.msg.dlc, 4)
+
+
+class TestRpdoTransmission(unittest.TestCase):
+    def create_backend(self, refreshCycles):
+        backend = CanBackend(refreshCycles=refreshCycles)
+        backend.bus = DummyBus()
+        self.a = DummyRpdo(0x201, [0])
+        self.b = DummyRpdo(0x202, [0])
+        backend.register_rpdo(self.a)
+        backend.register_rpdo(self.b)
+        return backend
+
+    def test_all_rpdos_get_sent_every_cycle_by_default(self):
+        backend = self.create_backend(refreshCycles=1)
+        for _ in range(3):
+            backend.transmit_all_rpdos()
+
+        self.assertEqual(len(backend.bus.sent), 6)
+
+    def test_unchanged_rpdos_get_skipped(self):
+        backend = self.create_backend(refreshCycles=3)
+        for cycle in range(6):
+            self.a.data[0] = cycle
+            backend.transmit_all_rpdos()
+
+        sentA = [data for cobId, data in backend.bus.sent if cobId == 0x201]
+        sentB = [data for cobId, data in backend.bus.sent if cobId == 0x202]
+
+        self.assertEqual(sentA, [bytes([cycle]) for cycle in range(6)])
+        self.assertEqual(len(sentB), 2)
+
+    def test_registering_twice(self):
+        backend = self.create_backend(refreshCycles=1)
+        backend.register_rpdo(self.a)
+        backend.transmit_all_rpdos()
+
+        self.assertEqual(len(backend.bus.sent), 2)
+
+
+class TestDoubleBuffering(unittest.TestCase):
+    def test_published_data_gets_sent(self):
+        backend = CanBackend()
+        backend.bus = DummyBus()
+        rx = DummyRpdo(0x201, [1])
+        backend.register_rpdo(rx)
+        backend.transmit_all_rpdos(published=True)
+
+        self.assertEqual(backend.bus.sent, [])
+
+        backend.publish_rpdos()
+        rx.data[0] = 2  # Next cycle already writing
+        backend.transmit_all_rpdos(published=True)
+
+        self.assertEqual(backend.bus.sent, [(0x201, b'\x01')])
+
+
+class TestExtrapolation(SimulatedBusMixin, unittest.TestCase):
+    def test_publish_during_extrapolation(self):
+        self.start_simulation('test_backends_extrapolation')
+        node = self.create_node(1)
+        frame = self.network.rpdos[node.rpdo[2]]
+        entered = threading.Event()
+        proceed = threading.Event()
+
+        def extrapolate():
+            entered.set()
+            proceed.wait(timeout=1.0)
+            self.assertTrue(self.network.stage_value(node.targetPositionField, 42))
+
+        self.network.extrapolators.append(extrapolate)
+        self.network.publish_rpdos()
+        pacemaker = threading.Thread(target=self.network.extrapolate_set_points)
+        pacemaker.start()
+        entered.wait(timeout=1.0)
+
+        node.set_target_position(1000)  # Main cycle
+        publisher = threading.Thread(target=self.network.publish_rpdos)
+        publisher.start()
+        publisher.join(timeout=0.05)
+
+        self.assertTrue(publisher.is_alive())
+
+        proceed.set()
+        pacemaker.join()
+        publisher.join()
+
+        self.assertEqual(node.targetPositionField.raw, 1000)
+        self.assertEqual(int.from_bytes(frame.staged[:4], 'little', signed=True), 1000)
+
+    def test_extrapolation_only_touches_staged_data(self):
+        self.start_simulation('test_backends_extrapolation')
+        node = self.create_node(1)
+        frame = self.network.rpdos[node.rpdo[2]]
+        self.network.extrapolators.append(lambda: self.network.stage_value(node.targetPositionField, 42))
+        node.set_target_position(1000)
+        self.network.publish_rpdos()
+        node.set_target_position(2000)  # Main cycle already writing the next one
+        self.network.extrapolate_set_points()
+
+        self.assertEqual(node.targetPositionField.raw, 2000)
+        self.assertEqual(int.from_bytes(frame.staged[:4], 'little', signed=True), 42)
+
+
+class TestMultipleBuses(unittest.TestCase):
+    def test_connected_networks_by_channel(self):
+        with CanBackend(bustype='virtual', channel='test_backends_1') as a:
+            with CanBackend(bustype='virtual', channel='test_backends_0') as b:
+                self.assertEqual([net.channel for net in connected_networks()], ['test_backends_0', 'test_backends_1'])
+                self.assertIs(find_network('test_backends_1'), a)
+                self.assertIs(network_for_channel('test_backends_0'), b)
+
+            self.assertIsNone(find_network('test_backends_0'))
+
+    def test_bus_load_estimate(self):
+        self.assertEqual(frame_bits(0), 55)
+        self.assertEqual(frame_bits(8), 135)
+
+        backend = CanBackend(bitrate=1000000)
+        for nr in range(25):
+            backend.register_rpdo(DummyRpdo(0x200 + nr, 8 * [0]))
+
+        self.assertAlmostEqual(backend.estimated_bus_load(interval=0.010), (55 + 25 * 135) / 10000)
+
+
+class TestShutdown(SimulatedBusMixin, unittest.TestCase):
+    def setUp(self):
+        self.start_simulation('test_shutdown', nodeIds=range(1, 6))
+        self.nodes = [self.create_node(nodeId) for nodeId in range(1, 6)]
+        change_states(self.nodes, State.OPERATION_ENABLED)
+
+    def assert_switched_off(self, states):
+        self.assertEqual(states, dict.fromkeys(range(1, 6), State.SWITCH_ON_DISABLED))
+        for drive in self.simulator.drives.values():
+            self.assertIs(drive.state, State.SWITCH_ON_DISABLED)
+
+    def test_switch_off_via_pdo(self):
+        self.network.enable_pdo_communication()
+        self.network.transmit_cycle()
+        time.sleep(0.05)
+        startTime = time.perf_counter()
+        states = self.network.switch_off_drives()
+
+        self.assertLess(time.perf_counter() - startTime, 0.5)
+        self.assert_switched_off(states)
+
+    def test_switch_off_via_sdo(self):
+        self.assert_switched_off(self.network.switch_off_drives())
+
+    def test_unresponsive_drive_gets_reported(self):
+        # Simulated drive goes silent
+        del self.simulator.network[3]
+        del self.simulator.drives[3]
+        self.network.enable_pdo_communication()
+        self.network.transmit_cycle()
+        time.sleep(0.05)
+        startTime = time.perf_counter()
+        states = self.network.switch_off_drives(timeout=0.5)
+
+        self.assertLess(time.perf_counter() - startTime, 1.)
+        self.assertIsNot(states.pop(3), State.SWITCH_ON_DISABLED)
+        self.assertEqual(set(states.values()), {State.SWITCH_ON_DISABLED})
+
+    def test_send_errors_do_not_abort_switch_off(self):
+        self.network.enable_pdo_communication()
+        self.network.transmit_cycle()
+        time.sleep(0.05)
+
+        def broken_bus():
+            raise can.CanError('Bus off')
+
+        self.network.send_sync = broken_bus
+        with self.assertLogs(self.network.logger, 'ERROR'):
+            states = self.network.switch_off_drives()
+
+        self.assert_switched_off(states)
+
+    def test_exit_always_disconnects(self):
+        network = CanBackend(bustype='virtual', channel='test_shutdown')
+        network.__enter__()
+
+        def broken_switch_off():
+            raise can.CanError('Bus off')
+
+        network.switch_off_drives = broken_switch_off
+        with self.assertRaises(can.CanError):
+            network.__exit__(None, None, None)
+
+        self.assertIsNone(network.bus)
+        self.assertIsNot(find_network('test_shutdown'), network)
+
+
+if __name__ == '__main__':
+    unittest.main()
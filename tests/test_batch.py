@@ -0,0 +1,112 @@
+import math
+import unittest
+
+from being.can.batch import TargetBatch
+from being.can.cia_402 import POSITION_ACTUAL_VALUE, TARGET_POSITION
+from being.can.simulation import EPOS4
+from being.math import clip
+from being.motors.blocks import RotaryMotor, WindupMotor
+from being.motors.definitions import HomingState
+from being.records import JsonRecord
+
+from tests.helpers import SimulatedBusMixin
+
+
+class TestTargetBatch(SimulatedBusMixin, unittest.TestCase):
+    def setUp(self):
+        self.start_simulation('test_batch', nodeIds=[1, 2])
+        self.nodes = [self.create_node(nodeId) for nodeId in [1, 2]]
+        self.batch = TargetBatch()
+        for node in self.nodes:
+            self.batch.add(node.pdo[TARGET_POSITION], node.pdo[POSITION_ACTUAL_VALUE], factor=1000., lower=0., upper=500., active=True)
+
+    def test_matches_scalar_encoding(self):
+        self.batch.targets[:] = [0.1234, 0.4]
+        self.batch.flush()
+
+        self.assertEqual([node.pdo[TARGET_POSITION].raw for node in self.nodes], [123, 400])
+
+    def test_clipping_and_inactive_slots(self):
+        self.batch.targets[:] = [-1., 2.]
+        self.batch.flush()
+
+        self.assertEqual([node.pdo[TARGET_POSITION].raw for node in self.nodes], [0, 500])
+
+        self.batch.active[1] = False
+        self.batch.targets[:] = [0.2, 0.3]
+        self.batch.flush()
+
+        self.assertEqual([node.pdo[TARGET_POSITION].raw for node in self.nodes], [200, 500])
+
+    def test_nan_targets_get_skipped(self):
+        self.batch.targets[:] = [0.1, 0.1]
+        self.batch.flush()
+        self.batch.targets[0] = math.nan
+        self.batch.flush()
+
+        self.assertEqual(self.nodes[0].pdo[TARGET_POSITION].raw, 100)
+
+    def test_actual_position(self):
+        self.nodes[1].pdo[POSITION_ACTUAL_VALUE].raw = -250
+
+        self.assertEqual(self.batch.actual_position(1), -0.25)
+
+    def test_network_flushes_before_transmitting(self):
+        self.network.targetBatch = self.batch
+        self.batch.targets[:] = [0.1, 0.2]
+        self.network.transmit_all_rpdos()
+
+        self.assertEqual(self.nodes[1].pdo[TARGET_POSITION].raw, 200)
+
+
+class TestMotorBatching(SimulatedBusMixin, unittest.TestCase):
+    def setUp(self):
+        self.start_simulation('test_batch_motors', profile=EPOS4)
+
+    def expected_raw(self, controller, position):
+        dev = position * controller.position_si_2_device
+        return int(clip(dev, controller.lower, controller.upper))
+
+    def test_windup_motor_goes_through_batch(self):
+        motor = WindupMotor(
+            1,
+            diameter=0.02,
+            length=0.1,
+            objectDictionary=self.load_object_dictionary(1),
+            network=self.network,
+            homingRecord=JsonRecord(),
+        )
+        motor.controller.homing.state = HomingState.HOMED
+        motor.targetPosition.value = 0.05
+        motor.update()
+        self.network.publish_rpdos()
+        expected = self.expected_raw(motor.controller, motor.mapping.angle(0.05))
+
+        self.assertTrue(motor.batched())
+        self.assertNotEqual(expected, 0)
+        self.assertEqual(motor.controller.node.pdo[TARGET_POSITION].raw, expected)
+
+    def test_non_vectorizable_controller_falls_back_to_scalar(self):
+        motor = RotaryMotor(
+            1,
+            motor='EC 45',
+            objectDictionary=self.load_object_dictionary(1),
+            network=self.network,
+            homingRecord=JsonRecord(),
+        )
+        controller = motor.controller
+        controller.homing.state = HomingState.HOMED
+
+        self.assertTrue(motor.batched())
+
+        controller.init_set_point_generator()  # After construction
+        motor.targetPosition.value = 1.
+        motor.update()
+        self.network.publish_rpdos()
+
+        self.assertFalse(self.network.targetBatch.active[motor.slot])
+        self.assertEqual(controller.node.pdo[TARGET_POSITION].raw, self.expected_raw(controller, 1.))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import enum
+import unittest
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+from numpy.testing import assert_equal
+from scipy.interpolate import BPoly, CubicSpline
+
+from being.binary_serialization import msgpack, packb, unpackb
+from being.curve import Curve
+from being.serialization import (
+    ENUM_LOOKUP, NAMED_TUPLE_LOOKUP, _enum_type_qualname, dumps,
+    register_enum, register_named_tuple,
+)
+
+
+@unittest.skipIf(msgpack is None, 'msgpack is not installed')
+class TestBinarySerialization(unittest.TestCase):
+    def assert_splines_equal(self, a, b):
+        self.assertIs(type(a), type(b))
+        assert_equal(a.x, b.x)
+        assert_equal(a.c, b.c)
+        self.assertEqual(a.extrapolate, b.extrapolate)
+        self.assertEqual(a.axis, b.axis)
+
+    def test_plain_data(self):
+        obj = {'a': [1, 2.5, None, True], 1: 'one', 'nested': OrderedDict(b=(3, 4))}
+
+        self.assertEqual(unpackb(packb(obj)), {'a': [1, 2.5, None, True], 1: 'one', 'nested': {'b': [3, 4]}})
+
+    def test_numpy_arrays(self):
+        arrays = [
+            np.array(1.234),
+            np.random.random((10, 2, 3)),
+            (255 * np.random.random((10, 2, 3))).astype(np.uint8),
+            np.arange(20.).reshape(4, 5)[:, ::2],
+        ]
+
+        for arr in arrays:
+            arrCpy = unpackb(packb(arr))
+
+            self.assertEqual(arrCpy.dtype, arr.dtype)
+            assert_equal(arrCpy, arr)
+
+    def test_unpacked_arrays_are_writable(self):
+        arr = unpackb(packb(np.zeros(5)))
+        arr[0] = 1.
+
+        self.assertTrue(arr.flags.writeable)
+
+    def test_binary_is_smaller_than_json_for_arrays(self):
+        arr = np.random.random(1000)
+
+        self.assertLess(len(packb(arr)), len(dumps(arr)))
+
+    def test_splines_and_curves(self):
+        spline = CubicSpline([0, 1, 2, 4], [0, 1, 0, -1])
+        bpoly = BPoly.from_power_basis(spline)
+        curve = Curve([bpoly, bpoly])
+
+        self.assert_splines_equal(unpackb(packb(bpoly)), bpoly)
+        curveCpy = unpackb(packb(curve))
+
+        self.assertIsInstance(curveCpy, Curve)
+        for a, b in zip(curveCpy.splines, curve.splines):
+            self.assert_splines_equal(a, b)
+
+    def test_enums(self):
+        Foo = enum.Enum('Foo', 'FIRST SECOND THIRD')
+
+        with self.assertRaises(TypeError):
+            packb(Foo.SECOND)
+
+        register_enum(Foo)
+
+        self.assertIs(unpackb(packb(Foo.SECOND)), Foo.SECOND)
+
+        ENUM_LOOKUP.pop(_enum_type_qualname(Foo))
+
+    def test_nested_named_tuples(self):
+        Foo = NamedTuple('Foo', name=str, id=int)
+        register_named_tuple(Foo)
+        obj = [Foo('Calimero', 42), {'foo': Foo('Calimero', 43)}]
+
+        self.assertEqual(unpackb(packb(obj)), obj)
+
+        NAMED_TUPLE_LOOKUP.pop('Foo')
+
+    def test_sets_and_numpy_scalars(self):
+        obj = [{1, 2, 'Hello, world!'}, np.int64(1), np.float32(.5)]
+
+        self.assertEqual(unpackb(packb(obj)), obj)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from being.can.cia_402 import State, change_states
+from being.can.simulation import EPOS4, MCLM3002
+from being.motors.blocks import LinearMotor, RotaryMotor
+from being.motors.bringup import bring_up
+from being.records import JsonRecord
+
+from tests.helpers import SimulatedBusMixin
+
+
+NODE_IDS = [1, 2, 3, 4, 5, 6]
+
+
+class TestBringUp(SimulatedBusMixin, unittest.TestCase):
+    def setUp(self):
+        self.start_simulation('test_bringup', nodeIds=[])
+        for nodeId in NODE_IDS:
+            profile = EPOS4 if nodeId % 2 else MCLM3002
+            self.simulator.add_drive(nodeId, profile)
+
+    def factory(self, cls, nodeId, **kwargs):
+        """Motor factory for bring_up(). Object dictionary gets loaded on
+        call.
+        """
+        def create():
+            od = self.load_object_dictionary(nodeId)
+            return cls(nodeId, objectDictionary=od, network=self.network, homingRecord=JsonRecord(), **kwargs)
+
+        return create
+
+    def test_motors_get_brought_up_in_order(self):
+        factories = [
+            self.factory(RotaryMotor, nodeId, motor='EC 45')
+            if nodeId % 2 else
+            self.factory(LinearMotor, nodeId)
+            for nodeId in NODE_IDS
+        ]
+        motors = bring_up(factories)
+
+        self.assertEqual([motor.controller.node.id for motor in motors], NODE_IDS)
+        for nodeId in NODE_IDS:
+            self.assertIs(self.simulator[nodeId].state, State.SWITCH_ON_DISABLED)
+
+        # Concurrent setup of the shared network
+        self.assertEqual(sorted(self.network), NODE_IDS)
+        self.assertEqual(sorted(motor.slot for motor in motors), list(range(len(NODE_IDS))))
+        self.assertEqual(len(self.network.targetBatch), len(NODE_IDS))
+
+    def test_failing_bring_ups(self):
+        missing = self.factory(LinearMotor, 42)
+
+        with self.assertRaises(RuntimeError):
+            bring_up([missing])
+
+        present = self.factory(LinearMotor, 2)
+        motors = bring_up([present, missing], ignoreErrors=True)
+
+        self.assertEqual(motors[0].controller.node.id, 2)
+        self.assertIsNone(motors[1])
+
+    def test_changing_states_in_lock_step(self):
+        nodes = [
+            self.factory(RotaryMotor, nodeId, motor='EC 45')().controller.node
+            for nodeId in [1, 3]
+        ]
+        states = change_states(nodes, State.SWITCHED_ON)
+
+        self.assertEqual(states, [State.SWITCHED_ON, State.SWITCHED_ON])
+        self.assertIs(self.simulator[1].state, State.SWITCHED_ON)
+        self.assertIs(self.simulator[3].state, State.SWITCHED_ON)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import concurrent.futures
 import unittest
 import logging
 
+from canopen.sdo import SdoCommunicationError
+
 from being.can.cia_402 import (
     Command, State, find_shortest_state_path, CiA402Node, STATUSWORD_2_STATE,
     STATUSWORD, CONTROLWORD, TRANSITION_COMMANDS
@@ -33,6 +36,39 @@ class DummyVariable:
         self.node.write_callback(self, value)
 
 
+class DummyAsyncSdo:
+
+    """Placeholder for the async SDO client. Resolves requests right away."""
+
+    def __init__(self, node):
+        self.node = node
+        self.error = None
+
+    def resolved(self, result=None):
+        future = concurrent.futures.Future()
+        if self.error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(self.error)
+
+        return future
+
+    def read(self, index):
+        if self.error is not None:
+            return self.resolved()
+
+        return self.resolved(self.node[index].raw)
+
+    def write(self, index, value):
+        if self.error is None:
+            self.node[index].raw = value
+
+        return self.resolved()
+
+    def check_timeout(self):
+        pass
+
+
 class DummyNode(CiA402Node):
 
     """Dummy node for testing state switching logic."""
@@ -41,6 +77,9 @@ class DummyNode(CiA402Node):
         self.cyclesNeeded = cyclesNeeded
         self._statusword = DummyVariable(node=self)
         self._controlword = DummyVariable(node=self)
+        self.statuswordField = self._statusword
+        self.controlwordField = self._controlword
+        self.asyncSdo = DummyAsyncSdo(node=self)
         self.state = initialState
         self._stateSwitching = None
         self.logger = logging.getLogger('dummy')
@@ -169,6 +208,21 @@ class TestCiA402Node(unittest.TestCase):
             + [State.OPERATION_ENABLED]
         )
 
+    def test_failing_statusword_request_times_out(self):
+        node = DummyNode(State.SWITCH_ON_DISABLED)
+        node.asyncSdo.error = SdoCommunicationError('No SDO response received')
+        job = node.state_switching_job(State.READY_TO_SWITCH_ON)
+
+        with self.assertRaises(TimeoutError):
+            list(job)
+
+    def test_failing_controlword_write_gets_logged(self):
+        node = DummyNode(State.SWITCH_ON_DISABLED)
+        node.asyncSdo.error = SdoCommunicationError('No SDO response received')
+
+        with self.assertLogs('dummy', logging.ERROR):
+            node.send_state_command(State.SWITCH_ON_DISABLED, State.READY_TO_SWITCH_ON)
+
 
 if __name__ == '__main__':
     unittest.main()
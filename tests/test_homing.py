@@ -0,0 +1,256 @@
+import unittest
+
+from being.can.cia_402 import HOME_OFFSET, MAX_PROFILE_VELOCITY
+from being.motors.homing import (
+    CiA402Homing, CrudeHoming, DummyHoming, HomingBase, HomingScheduler, HomingState,
+)
+from being.records import JsonRecord
+
+from tests.helpers import SimulatedBusMixin, run
+
+
+class SdoHoming(HomingBase):
+
+    """Homing with one SDO step. Counts the SDO steps per tick."""
+
+    def __init__(self, steps):
+        super().__init__()
+        self.steps = steps
+
+    def homing_job(self):
+        yield from self.sdo_slot()
+        self.steps.append(self)
+        yield
+        self.state = HomingState.HOMED
+
+
+class TestHomingScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.
+        self.scheduler = HomingScheduler(batchSize=2, sdoStepsPerCycle=None, interval=1., time_func=self.time)
+
+    def time(self):
+        return self.now
+
+    def create_homing(self, duration=1., successProbability=1., **kwargs):
+        homing = DummyHoming(minDuration=duration, maxDuration=duration, successProbability=successProbability, time_func=self.time)
+        self.scheduler.add(homing, **kwargs)
+        return homing
+
+    def tick(self, homings):
+        for homing in homings:
+            if homing.ongoing:
+                homing.update()
+
+        self.now += 1.
+
+    def test_batch_size_limits_concurrent_homings(self):
+        homings = [self.create_homing(duration=2.) for _ in range(5)]
+        for homing in homings:
+            homing.home()
+
+        self.tick(homings)
+
+        self.assertEqual(self.scheduler.running, homings[:2])
+        self.assertEqual(self.scheduler.progress()['pending'], 3)
+
+        for _ in range(20):
+            self.tick(homings)
+
+        self.assertTrue(all(homing.homed for homing in homings))
+        self.assertEqual(self.scheduler.progress(), {
+            'total': 5, 'pending': 0, 'running': 0, 'homed': 5, 'failed': 0,
+        })
+
+    def test_priority_and_dependencies(self):
+        first = self.create_homing()
+        last = self.create_homing()
+        important = self.create_homing(priority=1, after=[last])
+        for homing in [first, last, important]:
+            homing.home()
+
+        self.tick([first, last, important])
+
+        self.assertEqual(self.scheduler.running, [first, last])
+
+        self.assertTrue(self.scheduler.waiting(important))
+
+        self.tick([first, last, important])
+
+        self.assertTrue(first.homed and last.homed)
+        self.assertEqual(self.scheduler.running, [important])
+
+    def test_circular_dependencies_do_not_deadlock(self):
+        a = self.create_homing()
+        b = self.create_homing(after=[a])
+        a.dependencies.add(b)
+        a.home()
+        b.home()
+
+        for _ in range(10):
+            self.tick([a, b])
+
+        self.assertTrue(a.homed and b.homed)
+
+    def test_failed_dependency_fails_dependents(self):
+        broken = self.create_homing(successProbability=0.)
+        dependent = self.create_homing(after=[broken])
+        independent = self.create_homing()
+        homings = [broken, dependent, independent]
+        for homing in homings:
+            homing.home()
+
+        for _ in range(10):
+            self.tick(homings)
+
+        self.assertIs(broken.state, HomingState.FAILED)
+        self.assertIs(dependent.state, HomingState.FAILED)
+        self.assertTrue(independent.homed)
+        self.assertEqual(self.scheduler.progress()['failed'], 2)
+
+    def test_unhomed_dependency_blocks(self):
+        unhomed = self.create_homing()
+        dependent = self.create_homing(after=[unhomed])
+        dependent.home()
+
+        for _ in range(5):
+            self.tick([unhomed, dependent])
+
+        self.assertTrue(dependent.ongoing)
+        self.assertEqual(self.scheduler.running, [])
+
+        unhomed.home()
+        for _ in range(5):
+            self.tick([unhomed, dependent])
+
+        self.assertTrue(unhomed.homed and dependent.homed)
+
+    def test_sdo_steps_get_throttled_per_cycle(self):
+        steps = []
+        scheduler = HomingScheduler(batchSize=None, sdoStepsPerCycle=2, interval=1., time_func=self.time)
+        homings = [SdoHoming(steps) for _ in range(5)]
+        for homing in homings:
+            scheduler.add(homing)
+            homing.home()
+
+        self.tick(homings)
+        self.assertEqual(len(steps), 2)
+
+        self.tick(homings)
+        self.assertEqual(len(steps), 4)
+
+        for _ in range(5):
+            self.tick(homings)
+
+        self.assertEqual(steps, homings[:2] + homings[2:4] + homings[4:])
+        self.assertTrue(all(homing.homed for homing in homings))
+
+    def test_persist_errors_get_caught(self):
+        homing = self.create_homing()
+        homing.persist = lambda: 1 / 0
+        homing.home()
+
+        with self.assertLogs(homing.logger, 'ERROR'):
+            for _ in range(5):
+                self.tick([homing])
+
+        self.assertTrue(homing.homed)
+        self.assertEqual(self.scheduler.running, [])
+
+
+MARKER = MAX_PROFILE_VELOCITY
+"""Stand-in for a volatile object of the drive."""
+
+
+class TestHomingRecord(SimulatedBusMixin, unittest.TestCase):
+    def setUp(self):
+        self.start_simulation('test_homing')
+        self.drive = self.simulator.drives[1]
+        self.node = self.create_node(1)
+        self.record = JsonRecord(filepath=None)
+
+    def create_homing(self, marker=MARKER):
+        return CiA402Homing(self.node, record=self.record, marker=marker)
+
+    def homed_homing(self, position=1234, homeOffset=42, marker=MARKER):
+        self.drive.position = position
+        self.node.sdo[HOME_OFFSET].raw = homeOffset
+        homing = self.create_homing(marker)
+        homing.state = HomingState.HOMED
+        homing.homeOffset = homeOffset
+        run(homing.mark())
+        self.node.actualPositionField.raw = position
+        homing.persist()
+        return homing
+
+    def test_marker_gets_written_by_homing_job(self):
+        homing = self.homed_homing()
+        snapshot = self.record.get(homing.record_key())
+
+        self.assertIsNotNone(homing.nonce)
+        self.assertEqual(snapshot['marker'], homing.nonce)
+        self.assertEqual(self.node.sdo[MARKER].raw, homing.nonce)
+
+    def test_resume_recorded_homing(self):
+        self.homed_homing()
+        homing = self.create_homing()
+
+        self.assertTrue(homing.resume())
+        self.assertTrue(homing.homed)
+
+    def test_moved_drive_has_to_be_homed_again(self):
+        self.homed_homing()
+        self.drive.position = 5000
+        homing = self.create_homing()
+
+        self.assertFalse(homing.resume())
+        self.assertIs(homing.state, HomingState.UNHOMED)
+        self.assertIsNone(self.record.get(homing.record_key()))
+
+    def test_changed_home_offset_has_to_be_homed_again(self):
+        self.homed_homing()
+        self.node.sdo[HOME_OFFSET].raw = 0  # E.g. after power cycle
+        homing = self.create_homing()
+
+        self.assertFalse(homing.resume())
+
+    def test_power_cycled_drive_has_to_be_homed_again(self):
+        self.homed_homing()
+        self.node.sdo[MARKER].raw = 0  # Volatile marker lost
+        homing = self.create_homing()
+
+        self.assertFalse(homing.resume())
+
+    def test_marker_is_single_use(self):
+        self.homed_homing()
+
+        self.assertTrue(self.create_homing().resume())
+        self.assertFalse(self.create_homing().resume())
+
+    def test_no_resume_without_marker(self):
+        self.homed_homing(marker=None)
+
+        self.assertFalse(self.create_homing(marker=None).resume())
+
+    def test_crude_homing_resumes_without_marker(self):
+        create_homing = lambda: CrudeHoming(self.node, minWidth=0, currentLimit=0, record=self.record, marker=None)
+        self.node.sdo[HOME_OFFSET].raw = 42
+        homed = create_homing()
+        homed.state = HomingState.HOMED
+        homed.homeOffset = 42
+        homed.lower, homed.upper = 0, 1000
+        homed.persist()
+        homing = create_homing()
+
+        self.assertTrue(homing.resume())
+        self.assertEqual(homing.width, 1000)
+
+    def test_homing_invalidates_record(self):
+        homing = self.homed_homing()
+        homing.home()
+
+        self.assertIsNone(self.record.get(homing.record_key()))
+
+
+if __name__ == '__main__':
+    unittest.main()
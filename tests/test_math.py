@@ -0,0 +1,50 @@
+import math
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from being.math import ArchimedeanSpiral, SpiralMapping
+
+
+class TestSpiralMapping(unittest.TestCase):
+    def setUp(self):
+        self.spiral, self.maxAngle = ArchimedeanSpiral.fit(diameter=0.02, outerDiameter=0.05, arcLength=1.5)
+        self.mapping = self.spiral.mapping(self.maxAngle)
+
+    def test_arc_length_matches_spiral(self):
+        for angle in np.linspace(0, self.maxAngle, 17):
+            self.assertAlmostEqual(self.mapping.arc_length(angle), self.spiral.arc_length(angle))
+
+    def test_angle_inverts_arc_length(self):
+        for angle in np.linspace(0, self.maxAngle, 101):
+            self.assertAlmostEqual(self.mapping.angle(self.spiral.arc_length(angle)), angle, places=9)
+
+    def test_vectorized_matches_scalar(self):
+        arcLengths = np.linspace(-0.1, 1.6, 1001)
+        angles = self.mapping.angles(arcLengths)
+
+        assert_allclose(angles, [self.mapping.angle(s) for s in arcLengths], atol=1e-12)
+        assert_allclose(self.mapping.arc_lengths(angles), [self.mapping.arc_length(phi) for phi in angles], atol=1e-12)
+
+    def test_inputs_get_clipped(self):
+        self.assertEqual(self.mapping.angle(-1.), 0.)
+        self.assertEqual(self.mapping.angle(10.), self.maxAngle)
+        self.assertAlmostEqual(self.mapping.arc_length(2 * self.maxAngle), self.mapping.maxArcLength)
+
+    def test_right_below_max_arc_length(self):
+        for size in range(2, 100):
+            mapping = self.spiral.mapping(self.maxAngle, size=size)
+            arcLength = math.nextafter(mapping.maxArcLength, 0)
+
+            self.assertAlmostEqual(mapping.angle(arcLength), self.maxAngle)
+
+    def test_circle(self):
+        mapping = SpiralMapping(ArchimedeanSpiral(a=0.5), maxAngle=4.)
+
+        self.assertAlmostEqual(mapping.angle(1.), 2.)
+        self.assertAlmostEqual(mapping.arc_length(3.), 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
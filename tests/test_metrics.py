@@ -0,0 +1,107 @@
+import time
+import unittest
+
+import can
+
+from being.backends import CanBackend
+from being.can.metrics import BusMetrics, frame_bits
+
+from tests.helpers import SimulatedBusMixin
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+class FailingBus:
+    def send(self, msg, timeout=None):
+        raise can.CanOperationError('No buffer space available')
+
+
+class TestBusMetrics(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.metrics = BusMetrics(bitrate=1000, historySize=3, clock=self.clock)
+
+    def test_latency_and_pdo_age(self):
+        self.metrics.sync_sent()
+        self.clock.now = 0.002
+        self.metrics.on_message_received(can.Message(arbitration_id=0x181, data=[0, 0]))
+        self.clock.now = 0.003
+        self.metrics.on_message_received(can.Message(arbitration_id=0x281, data=[0, 0]))
+        self.clock.now = 0.010
+        snapshot = self.metrics.sample()
+        node, = snapshot['nodes']
+
+        self.assertEqual(node['nodeId'], 1)
+        self.assertAlmostEqual(node['latency'], 0.002)
+        self.assertAlmostEqual(node['pdoAge'], 0.007)
+
+    def test_bus_load_and_frame_rates(self):
+        self.metrics.sync_sent()
+        self.metrics.frame_sent(8)
+        self.metrics.on_message_received(can.Message(arbitration_id=0x181, data=[0, 0]))
+        self.clock.now = 1.0
+        snapshot = self.metrics.sample()
+
+        self.assertEqual(snapshot['txFrameRate'], 2)
+        self.assertEqual(snapshot['rxFrameRate'], 1)
+        self.assertEqual(snapshot['syncRate'], 1)
+        self.assertAlmostEqual(snapshot['busLoad'], (frame_bits(0) + frame_bits(8) + frame_bits(2)) / 1000)
+
+    def test_error_counters_reset_per_window(self):
+        self.metrics.send_failed()
+        self.metrics.pacemaker_stepped_in()
+        self.metrics.on_message_received(can.Message(arbitration_id=0x82, data=[0] * 8))
+        first = self.metrics.sample()
+        second = self.metrics.sample()
+
+        self.assertEqual(first['sendErrors'], 1)
+        self.assertEqual(first['pacemakerInterventions'], 1)
+        self.assertEqual(first['nodes'][0]['emergencies'], 1)
+        self.assertEqual(second['sendErrors'], 0)
+        self.assertEqual(second['totalSendErrors'], 1)
+        self.assertEqual(second['totalPacemakerInterventions'], 1)
+
+    def test_history_is_a_ring_buffer(self):
+        for _ in range(5):
+            self.metrics.sample()
+
+        self.assertEqual(len(self.metrics.history), 3)
+
+
+class TestNetworkMetrics(SimulatedBusMixin, unittest.TestCase):
+    def test_send_errors_get_counted(self):
+        network = CanBackend()
+        network.bus = FailingBus()
+        with self.assertRaises(can.CanError):
+            network.send_sync()
+
+        self.assertEqual(network.metrics.sample()['sendErrors'], 1)
+
+    def test_simulated_drive(self):
+        self.start_simulation('test_metrics')
+        self.create_node(1)
+        self.network.enable_pdo_communication()
+        self.network.metrics.sample()
+        for _ in range(10):
+            self.network.send_sync()
+            time.sleep(0.005)
+
+        snapshot = self.network.metrics.sample()
+
+        node, = snapshot['nodes']
+
+        self.assertEqual(node['nodeId'], 1)
+        self.assertGreater(node['latency'], 0.)
+        self.assertLess(node['pdoAge'], 0.1)
+        self.assertGreater(snapshot['syncRate'], 0.)
+        self.assertGreater(snapshot['busLoad'], 0.)
+
+
+if __name__ == '__main__':
+    unittest.main()
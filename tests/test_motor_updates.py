@@ -0,0 +1,72 @@
+import unittest
+
+from being.motors.blocks import DummyMotor
+from being.motors.definitions import MotorEvent
+from being.web.motor_updates import MotorUpdates
+
+
+class TestMotorUpdates(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.
+        self.updates = MotorUpdates(interval=1., time_func=self.time)
+        self.motors = [DummyMotor(), DummyMotor()]
+        for motor in self.motors:
+            self.updates.watch(motor)
+
+    def time(self):
+        return self.now
+
+    def test_nothing_to_send(self):
+        self.assertIsNone(self.updates.flush())
+
+    def test_state_changes_get_batched(self):
+        for _ in range(100):
+            for motor in self.motors:
+                motor.enable()
+                motor.disable()
+
+        msg = self.updates.flush()
+
+        self.assertEqual(msg['type'], 'motor-updates')
+        self.assertEqual(msg['motors'], self.motors)
+        self.assertEqual(msg['errors'], [])
+        self.assertIsNone(self.updates.flush())
+
+    def test_repeated_errors_get_counted(self):
+        a, b = self.motors
+        for _ in range(50):
+            a.publish(MotorEvent.ERROR, 'Overcurrent')
+
+        a.publish(MotorEvent.ERROR, 'Overvoltage')
+
+        msg = self.updates.flush()
+
+        self.assertEqual(msg['motors'], [a])
+        self.assertEqual(msg['errors'], [
+            {'motorId': a.id, 'message': 'Overcurrent', 'count': 50},
+            {'motorId': a.id, 'message': 'Overvoltage', 'count': 1},
+        ])
+
+    def test_updates_get_rate_limited_per_motor(self):
+        a, b = self.motors
+        a.enable()
+        self.assertEqual(self.updates.flush()['motors'], [a])
+
+        self.now = .5
+        a.publish(MotorEvent.ERROR, 'Overcurrent')
+        b.enable()
+        msg = self.updates.flush()
+
+        self.assertEqual(msg['motors'], [b])
+        self.assertEqual(msg['errors'], [])
+
+        a.publish(MotorEvent.ERROR, 'Overcurrent')
+        self.now = 1.
+        msg = self.updates.flush()
+
+        self.assertEqual(msg['motors'], [a])
+        self.assertEqual(msg['errors'], [{'motorId': a.id, 'message': 'Overcurrent', 'count': 2}])
+
+
+if __name__ == '__main__':
+    unittest.main()
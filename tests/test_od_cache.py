@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from canopen.objectdictionary import ODVariable
+
+from being.can import _load_local_eds
+from being.can.od_cache import DeviceIdentity, ObjectDictionaryCache, import_eds
+
+
+DEVICE_TYPE = b'\x92\x01\x42\x00'
+IDENTITY = DeviceIdentity(0x00420192, 0x147, 0x3002, 0x1)
+EDS_DATA = _load_local_eds(DEVICE_TYPE).getvalue()
+TPDO1_COB_ID = 0x1800
+
+
+def all_variables(od):
+    for obj in od.values():
+        if isinstance(obj, ODVariable):
+            yield obj
+        else:
+            yield from obj.values()
+
+
+class TestObjectDictionaryCache(unittest.TestCase):
+    def assert_same_defaults(self, a, b):
+        self.assertEqual(a.node_id, b.node_id)
+        for varA, varB in zip(all_variables(a), all_variables(b)):
+            self.assertEqual((varA.index, varA.subindex), (varB.index, varB.subindex))
+            self.assertEqual(varA.default, varB.default)
+            self.assertEqual(varA.value, varB.value)
+
+    def test_relabeled_template_matches_parsed_eds(self):
+        cache = ObjectDictionaryCache(directory=None)
+        for nodeId in [1, 8, 42]:
+            od = cache.object_dictionary(IDENTITY, EDS_DATA, nodeId)
+
+            self.assert_same_defaults(od, import_eds(_load_local_eds(DEVICE_TYPE), nodeId))
+
+        self.assertEqual(len(cache.templates), 1)
+
+    def test_eds_gets_parsed_only_once_across_caches(self):
+        with tempfile.TemporaryDirectory() as dirpath:
+            with mock.patch('being.can.od_cache.import_eds', wraps=import_eds) as parse:
+                ObjectDictionaryCache(dirpath).object_dictionary(IDENTITY, EDS_DATA, 1)
+                od = ObjectDictionaryCache(dirpath).object_dictionary(IDENTITY, EDS_DATA, 2)
+
+            self.assertEqual(parse.call_count, 1)
+            self.assertEqual(od[TPDO1_COB_ID][1].default, 0x180 + 2)
+            self.assertEqual(len(os.listdir(dirpath)), 1)
+
+    def test_changed_eds_invalidates_template(self):
+        with tempfile.TemporaryDirectory() as dirpath:
+            ObjectDictionaryCache(dirpath).object_dictionary(IDENTITY, EDS_DATA, 1)
+            before, = os.listdir(dirpath)
+            changed = EDS_DATA.replace('ParameterName=Home Offset', 'ParameterName=Home Offset2')
+            od = ObjectDictionaryCache(dirpath).object_dictionary(IDENTITY, changed, 1)
+            after, = os.listdir(dirpath)
+
+            self.assertNotEqual(before, after)
+            self.assertIn('Home Offset2', od)
+
+    def test_corrupt_cache_file_gets_replaced(self):
+        with tempfile.TemporaryDirectory() as dirpath:
+            ObjectDictionaryCache(dirpath).object_dictionary(IDENTITY, EDS_DATA, 1)
+            fn, = os.listdir(dirpath)
+            with open(os.path.join(dirpath, fn), 'wb') as f:
+                f.write(b'garbage')
+
+            od = ObjectDictionaryCache(dirpath).object_dictionary(IDENTITY, EDS_DATA, 1)
+
+            self.assertEqual(od[TPDO1_COB_ID][1].default, 0x180 + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import time
+import unittest
+
+from being.backends import CanBackend
+from being.pacemaker import MAIN_CYCLE_PHASE, Pacemaker, cycle_time, next_cycle
+
+
+class DummyBus:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg, timeout=None):
+        self.sent.append((time.perf_counter(), msg.arbitration_id, bytes(msg.data)))
+
+
+class DummyRpdo:
+    def __init__(self, cobId, data):
+        self.cob_id = cobId
+        self.data = bytearray(data)
+
+
+class TestPacemaker(unittest.TestCase):
+    def setUp(self):
+        self.network = CanBackend()
+        self.network.bus = DummyBus()
+        self.rx = DummyRpdo(0x201, [0])
+        self.network.register_rpdo(self.rx)
+
+    def test_sync_goes_out_on_strict_period(self):
+        with Pacemaker(self.network, interval=0.010) as pacemaker:
+            pacemaker.start()
+            time.sleep(0.105)
+
+        syncs = [timestamp for timestamp, cobId, _ in self.network.bus.sent if cobId == 0x80]
+        periods = [b - a for a, b in zip(syncs[:-1], syncs[1:])]
+
+        self.assertGreaterEqual(len(syncs), 8)
+        self.assertAlmostEqual(sum(periods) / len(periods), 0.010, delta=0.002)
+
+    def test_previous_set_point_when_main_cycle_is_late(self):
+        self.rx.data[0] = 1
+        self.network.publish_rpdos()
+        with Pacemaker(self.network, maxWait=0.015, interval=0.010) as pacemaker:
+            pacemaker.start()
+            pacemaker.tick()
+            self.rx.data[0] = 2  # Unpublished
+            time.sleep(0.1)
+
+        rpdos = {data for _, cobId, data in self.network.bus.sent if cobId == 0x201}
+
+        self.assertEqual(rpdos, {b'\x01'})
+        self.assertGreater(self.network.metrics.sample()['pacemakerInterventions'], 0)
+
+    def test_set_points_get_extrapolated_when_main_cycle_is_late(self):
+        def extrapolate():
+            self.network.rpdos[self.rx].staged[0] += 1
+
+        self.network.extrapolators.append(extrapolate)
+        self.network.publish_rpdos()
+        with Pacemaker(self.network, maxWait=0.015, interval=0.010) as pacemaker:
+            pacemaker.start()
+            time.sleep(0.1)
+
+        rpdos = [data for _, cobId, data in self.network.bus.sent if cobId == 0x201]
+
+        self.assertGreater(len(set(rpdos)), 2)
+
+
+class TestPhaseLocking(unittest.TestCase):
+    def test_main_cycle_runs_between_transmits(self):
+        interval = 0.010
+        for now in [0.0, 0.0049, 0.005, 0.0051, 1234.5678, 98765.4321]:
+            cycle = next_cycle(now, interval, MAIN_CYCLE_PHASE)
+            then = cycle_time(cycle, interval, MAIN_CYCLE_PHASE)
+
+            self.assertGreater(then, now)
+            self.assertLessEqual(then - now, interval)
+
+            transmit = cycle_time(next_cycle(then, interval), interval)
+
+            self.assertAlmostEqual(transmit - then, MAIN_CYCLE_PHASE * interval)
+
+    def test_jittery_main_cycle_does_not_alias(self):
+        network = CanBackend()
+        network.bus = DummyBus()
+        rx = DummyRpdo(0x201, [0])
+        network.register_rpdo(rx)
+        interval = 0.020
+        with Pacemaker(network, interval=interval) as pacemaker:
+            pacemaker.start()
+            cycle = next_cycle(time.perf_counter(), interval, MAIN_CYCLE_PHASE)
+            for value in range(1, 16):
+                jitter = (-.3 if value % 2 else .3) * interval
+                then = cycle_time(cycle, interval, MAIN_CYCLE_PHASE) + jitter
+                time.sleep(max(0, then - time.perf_counter()))
+                rx.data[0] = value
+                network.publish_rpdos()
+                pacemaker.tick()
+                cycle += 1
+
+        rpdos = [data[0] for _, cobId, data in network.bus.sent if cobId == 0x201]
+
+        self.assertGreater(len(rpdos), 10)
+        self.assertEqual(rpdos, list(range(rpdos[0], rpdos[0] + len(rpdos))))
+
+
+if __name__ == '__main__':
+    unittest.main()
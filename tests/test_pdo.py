@@ -0,0 +1,55 @@
+import unittest
+
+from being.can.cia_402 import (
+    CONTROLWORD, DIGITAL_INPUTS, POSITION_ACTUAL_VALUE, STATUSWORD, TARGET_POSITION, State,
+)
+from being.can.pdo import PdoField
+
+from tests.helpers import SimulatedBusMixin
+
+
+class TestPdoFields(SimulatedBusMixin, unittest.TestCase):
+    def setUp(self):
+        self.start_simulation('test_pdo')
+        self.node = self.create_node(1)
+
+    def test_fields_match_canopen_variables(self):
+        for index in [STATUSWORD, CONTROLWORD, POSITION_ACTUAL_VALUE, TARGET_POSITION]:
+            field = self.node.pdo_field(index)
+            var = self.node.pdo[index]
+
+            self.assertIsInstance(field, PdoField)
+
+            field.raw = -12 if index in {POSITION_ACTUAL_VALUE, TARGET_POSITION} else 0x1234
+
+            self.assertEqual(var.raw, field.raw)
+
+            var.raw = 7
+
+            self.assertEqual(field.raw, 7)
+
+    def test_floats_get_truncated(self):
+        self.node.set_target_position(123.9)
+
+        self.assertEqual(self.node.pdo[TARGET_POSITION].raw, 123)
+
+    def test_overflow(self):
+        with self.assertRaises(ValueError):
+            self.node.controlwordField.raw = 0x10000
+
+    def test_remapped_objects_get_accessors(self):
+        self.assertIsNone(self.node.pdo_field(DIGITAL_INPUTS))
+
+        self.node.add_process_data(DIGITAL_INPUTS)
+        self.node.pdo[DIGITAL_INPUTS].raw = 42
+
+        self.assertEqual(self.node.pdo_field(DIGITAL_INPUTS).raw, 42)
+
+    def test_state_via_pdo(self):
+        self.node.statuswordField.raw = 0x0237
+
+        self.assertIs(self.node.get_state('pdo'), State.OPERATION_ENABLED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import time
+import unittest
+
+from being.can.cia_402 import (
+    CONTROLWORD, CURRENT_ACTUAL_VALUE, DIGITAL_INPUTS, MAX_PROFILE_VELOCITY, PROFILE_VELOCITY,
+    STATUSWORD,
+)
+
+from tests.helpers import SimulatedBusMixin
+
+
+ERROR_REGISTER = 0x1001
+
+
+class TestProcessData(SimulatedBusMixin, unittest.TestCase):
+    def setUp(self):
+        self.start_simulation('test_process_data')
+        self.drive = self.simulator.drives[1]
+        self.node = self.create_node(1)
+
+    def test_extra_objects_get_packed_into_free_txpdos(self):
+        unmapped = self.node.add_process_data(CURRENT_ACTUAL_VALUE, DIGITAL_INPUTS, 'Error Register')
+
+        self.assertEqual(unmapped, [])
+        self.assertEqual([var.index for var in self.node.tpdo[1].map], [STATUSWORD, CURRENT_ACTUAL_VALUE, DIGITAL_INPUTS])
+        self.assertEqual(self.node.tpdo[2].map[-1].index, ERROR_REGISTER)
+
+        self.drive.sdo[DIGITAL_INPUTS].raw = 0x12345
+        self.network.enable_pdo_communication()
+        for _ in range(5):
+            self.network.send_sync()
+            time.sleep(0.005)
+
+        self.assertEqual(self.node.process_variable(DIGITAL_INPUTS).raw, 0x12345)
+        self.assertEqual(self.node.get_process_value(DIGITAL_INPUTS), 0x12345)
+
+    def test_sdo_fallback(self):
+        unmapped = self.node.add_process_data('Does Not Exist', CONTROLWORD)
+
+        self.assertEqual(unmapped, ['Does Not Exist'])
+
+        # More than fits into the TxPDOs
+        objects = [MAX_PROFILE_VELOCITY, PROFILE_VELOCITY, 0x6083, 0x6084, 0x607A, 0x6062, 0x606B, 0x60FF]
+        unmapped = self.node.add_process_data(*objects)
+
+        self.assertTrue(unmapped)
+        for key in unmapped:
+            self.assertIsNone(self.node.process_variable(key))
+            self.assertEqual(self.node.get_process_value(key), self.drive.get_value(key))
+
+
+if __name__ == '__main__':
+    unittest.main()
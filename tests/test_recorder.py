@@ -0,0 +1,107 @@
+import contextlib
+import os
+import tempfile
+import time
+import unittest
+
+import can
+
+from being.backends import CanBackend
+from being.can.cia_402 import OperationMode, State
+from being.can.recorder import CanRecorder, CanReplay, export_recording, read_recording
+from being.can.simulation import RPDO_TIMEOUT_EMCY_CODE
+
+from tests.helpers import SimulatedBusMixin
+
+
+class DummyBus:
+    def send(self, msg, timeout=None):
+        pass
+
+
+class TestRingFile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmpdir.name, 'test.canrec')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_ring_keeps_most_recent_frames(self):
+        backend = CanBackend()
+        backend.bus = DummyBus()
+        with CanRecorder(backend, self.filepath, capacity=4):
+            for nr in range(10):
+                backend.send_message(0x200 + nr, [nr])
+
+        frames = read_recording(self.filepath)
+
+        self.assertEqual([msg.arbitration_id for msg in frames], [0x206, 0x207, 0x208, 0x209])
+        self.assertEqual(frames[-1].data, bytearray([9]))
+        self.assertFalse(frames[-1].is_rx)
+        self.assertIsNone(backend.recorder)
+
+    def test_export(self):
+        backend = CanBackend()
+        backend.bus = DummyBus()
+        with CanRecorder(backend, self.filepath):
+            backend.send_sync()
+            backend.send_message(0x201, [1, 2, 3])
+
+        outpath = os.path.join(self.tmpdir.name, 'test.asc')
+        export_recording(self.filepath, outpath)
+
+        exported = list(can.LogReader(outpath))
+
+        self.assertEqual([msg.arbitration_id for msg in exported], [0x80, 0x201])
+
+
+class TestReplay(SimulatedBusMixin, unittest.TestCase):
+    def run_session(self, channel, recordTo=None):
+        """Drive in CSP with RPDO timeout. Main cycle stops transmitting RPDOs
+        halfway through. Returns node state.
+        """
+        self.start_simulation(channel, rpdoTimeout=0.05)
+        node = self.create_node(1)
+        node.set_operation_mode(OperationMode.CYCLIC_SYNCHRONOUS_POSITION)
+        if recordTo is None:
+            recorder = contextlib.nullcontext()
+        else:
+            recorder = CanRecorder(self.network, recordTo)
+
+        with recorder:
+            self.network.enable_pdo_communication()
+            job = node.state_switching_job(State.OPERATION_ENABLED, how='pdo')
+            for cycle in range(40):
+                next(job, None)
+                if cycle < 20:
+                    self.network.transmit_all_rpdos()
+
+                self.network.send_sync()
+                time.sleep(0.005)
+
+        return node.get_state('pdo')
+
+    def test_replaying_rpdo_timeout(self):
+        with tempfile.TemporaryDirectory() as dirpath:
+            filepath = os.path.join(dirpath, 'session.canrec')
+            state = self.run_session('test_recorder_0', recordTo=filepath)
+
+            self.assertIs(state, State.FAULT)
+
+            frames = read_recording(filepath)
+
+        self.start_simulation('test_recorder_1')
+        node = self.create_node(1)
+        replay = CanReplay(frames, self.network)
+        states = set()
+        for _ in replay.replay():
+            states.add(node.get_state('pdo'))
+
+        self.assertIn(State.OPERATION_ENABLED, states)
+        self.assertIs(node.get_state('pdo'), State.FAULT)
+        self.assertEqual(node.emcy.active[-1].code, RPDO_TIMEOUT_EMCY_CODE)
+
+
+if __name__ == '__main__':
+    unittest.main()
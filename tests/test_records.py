@@ -0,0 +1,41 @@
+import json
+import os
+import tempfile
+import unittest
+
+from being.records import JsonRecord, shared_record
+
+
+class TestJsonRecord(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.filepath = os.path.join(tmpdir.name, 'sub', 'record.json')
+
+    def test_changes_get_written_in_the_background(self):
+        record = JsonRecord(self.filepath)
+        record.set('a', 1)
+        record.set('b', [2, 3])
+        record.set('a', None)
+        record.flush()
+
+        with open(self.filepath) as f:
+            self.assertEqual(json.load(f), {'b': [2, 3]})
+
+        self.assertEqual(JsonRecord(self.filepath).get('b'), [2, 3])
+
+    def test_in_memory_record(self):
+        record = JsonRecord(filepath=None)
+        record.set('a', 1)
+        record.flush()
+
+        self.assertEqual(record.get('a'), 1)
+        self.assertIsNone(record.writer)
+
+    def test_shared_records(self):
+        self.assertIs(shared_record(self.filepath), shared_record(self.filepath))
+        self.assertIsNot(shared_record(None), shared_record(self.filepath))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,9 +7,10 @@ from numpy.testing import assert_equal
 from scipy.interpolate import PPoly, CubicSpline, BPoly
 
 from being.serialization import (
-    ENUM_LOOKUP, EOT, NAMED_TUPLE_LOOKUP, FlyByDecoder, dumps, enum_from_dict,
-    enum_to_dict, loads, named_tuple_as_dict, named_tuple_from_dict,
-    register_enum, register_named_tuple, _enum_type_qualname,
+    ENUM_LOOKUP, EOT, NAMED_TUPLE_LOOKUP, FlyByDecoder, dumps, dumps_fast,
+    enum_from_dict, enum_to_dict, loads, named_tuple_as_dict,
+    named_tuple_from_dict, orjson, register_enum, register_named_tuple, to_serializable,
+    _enum_type_qualname,
 )
 
 
@@ -95,12 +96,51 @@ class TestSerialization(unittest.TestCase):
 
         ENUM_LOOKUP.pop(_enum_type_qualname(Foo))
 
+    def test_enum_representations_are_not_shared(self):
+        Foo = enum.Enum('Foo', 'FIRST SECOND')
+        register_enum(Foo)
+        first = to_serializable(Foo.FIRST)
+        first['value'] = 'corrupted'
+        first['members'].append('THIRD')
+
+        self.assertEqual(to_serializable(Foo.FIRST), enum_to_dict(Foo.FIRST))
+
+        ENUM_LOOKUP.pop(_enum_type_qualname(Foo))
+
     def test_a_set_mapps_back_to_itself(self):
         x = {1, 2, 'Hello, world!'}
         y = loads(dumps(x))
 
         self.assertEqual(x, y)
 
+    def test_non_contiguous_numpy_arrays(self):
+        arr = np.arange(20.).reshape(4, 5)[:, ::2]
+
+        assert_equal(loads(dumps(arr)), arr)
+
+    def test_numpy_scalars(self):
+        self.assertEqual(loads(dumps([np.int64(1), np.bool_(True), np.float32(0.5)])), [1, True, .5])
+
+    def test_unregistered_enums_are_not_serializable(self):
+        Foo = enum.Enum('Foo', 'FIRST SECOND THIRD')
+
+        with self.assertRaises(TypeError):
+            dumps(Foo.FIRST)
+
+    def test_additional_arguments_still_get_forwarded(self):
+        self.assertEqual(dumps({'a': {1, 2}}, indent=4), '{\n    "a": {\n        "type": "set",\n        "values": [\n            1,\n            2\n        ]\n    }\n}')
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_fast_dumps_is_compatible_for_plain_data_and_arrays(self):
+        obj = {'values': [1, 2.5, 'three', None], 'array': np.random.random(10), 1: {4, 5}}
+        expected = loads(dumps(obj))
+        result = loads(dumps_fast(obj))
+
+        self.assertEqual(result.keys(), expected.keys())
+        assert_equal(result['array'], expected['array'])
+        self.assertEqual(result['values'], expected['values'])
+        self.assertEqual(result['1'], expected['1'])
+
 
 class TestFlyByDecoder(unittest.TestCase):
     def test_doc_example(self):
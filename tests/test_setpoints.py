@@ -0,0 +1,84 @@
+import time
+import unittest
+
+from being.can.cia_402 import INTERPOLATION_TIME_PERIOD, VELOCITY_OFFSET, OperationMode, State
+from being.can.simulation import EPOS4
+from being.motors.setpoints import SetPointGenerator
+
+from tests.helpers import SimulatedBusMixin
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+class TestSetPointGenerator(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.gen = SetPointGenerator(maxVelocity=100., maxAcceleration=1000., interval=0.01, clock=self.clock)
+
+    def test_velocity_feed_forward(self):
+        self.assertEqual(self.gen.set_target(0.), (0., 0.))
+        self.assertEqual(self.gen.set_target(0.5), (0.5, 50.))
+
+    def test_velocity_gets_limited(self):
+        self.gen.set_target(0.)
+        _, vel = self.gen.set_target(-5.)
+
+        self.assertEqual(vel, -100.)
+
+    def test_extrapolation_brakes(self):
+        self.assertIsNone(self.gen.extrapolate())
+
+        self.gen.set_target(0.)
+        self.gen.set_target(0.5)
+        self.clock.now = 0.01
+        pos, vel = self.gen.extrapolate()
+
+        self.assertAlmostEqual(pos, 0.5 + 50. * 0.01 - 0.5 * 1000. * 0.01 ** 2)
+        self.assertAlmostEqual(vel, 40.)
+
+        self.clock.now = 1.
+        pos, vel = self.gen.extrapolate()
+
+        self.assertAlmostEqual(pos, 0.5 + 50. ** 2 / 2000.)
+        self.assertEqual(vel, 0.)
+
+    def test_reset(self):
+        self.gen.set_target(0.)
+        self.gen.reset()
+
+        self.assertEqual(self.gen.set_target(1.), (1., 0.))
+
+
+class TestVelocityFeedForward(SimulatedBusMixin, unittest.TestCase):
+    def test_velocity_offset_gets_transmitted(self):
+        self.start_simulation('test_setpoints', profile=EPOS4)
+        drive = self.simulator.drives[1]
+        node = self.create_node(1)
+
+        self.assertTrue(node.enable_velocity_feed_forward())
+        self.assertTrue(node.set_interpolation_time_period(0.005))
+        self.assertEqual(drive.get_value(INTERPOLATION_TIME_PERIOD, 1), 5)
+
+        node.set_operation_mode(OperationMode.CYCLIC_SYNCHRONOUS_POSITION)
+        self.network.enable_pdo_communication()
+        job = node.state_switching_job(State.OPERATION_ENABLED, how='pdo')
+        for _ in range(10):
+            next(job, None)
+            node.set_target_position(1000)
+            node.set_velocity_offset(-42)
+            self.network.transmit_all_rpdos()
+            self.network.send_sync()
+            time.sleep(0.005)
+
+        self.assertEqual(drive.get_value(VELOCITY_OFFSET), -42)
+        self.assertEqual(drive.position, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
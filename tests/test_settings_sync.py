@@ -0,0 +1,77 @@
+import unittest
+
+from being.can.settings_sync import (
+    SAVE_ALL_PARAMETERS, STORE_PARAMETERS, SettingsRecord, maybe_int, read_current_data,
+    resolve_settings, sync_settings,
+)
+
+from tests.helpers import SimulatedBusMixin
+
+
+class TestSettingsSync(SimulatedBusMixin, unittest.TestCase):
+    def setUp(self):
+        self.start_simulation('test_settings_sync')
+        self.drive = self.simulator.drives[1]
+        self.node = self.create_node(1)
+        self.reads = []
+        self.drive.add_read_callback(lambda index, subindex, od: self.reads.append(index))
+
+    def test_only_differences_get_written(self):
+        settings = {
+            'Max Profile Velocity': 1234,
+            'Profile Acceleration': self.node.sdo['Profile Acceleration'].raw,
+        }
+
+        self.assertEqual(sync_settings(self.node, settings), 1)
+        self.assertEqual(self.node.sdo['Max Profile Velocity'].raw, 1234)
+        self.assertEqual(sync_settings(self.node, settings), 0)
+
+    def test_current_data_gets_read_in_one_go(self):
+        resolved = resolve_settings(self.node.sdo, {
+            'Max Profile Velocity': 1234,
+            'Profile Acceleration': 1234,
+            'Software Position Limit/1': -1,
+        })
+        current = read_current_data(self.node, resolved)
+
+        self.assertEqual(self.reads, [0x607F, 0x6083, 0x607D])
+        self.assertEqual(self.node.asyncSdo.pending_requests(), 0)
+        for address, (var, _) in resolved.items():
+            self.assertEqual(current[address], var.data)
+
+    def test_last_entry_wins_for_the_same_object(self):
+        settings = {
+            'Software Position Limit/Minimum Position Limit': -1,
+            'Software Position Limit/1': -2,
+        }
+        sync_settings(self.node, settings)
+
+        self.assertEqual(self.node.sdo['Software Position Limit'][1].raw, -2)
+
+    def test_stored_settings_get_skipped(self):
+        record = SettingsRecord(filepath=None)
+        settings = {'Max Profile Velocity': 1234}
+
+        self.assertEqual(sync_settings(self.node, settings, store=True, record=record), 1)
+        self.assertEqual(self.drive.data_store[STORE_PARAMETERS][SAVE_ALL_PARAMETERS], b'save')
+
+        self.reads.clear()
+
+        self.assertEqual(sync_settings(self.node, settings, store=True, record=record), 0)
+        self.assertNotIn(0x607F, self.reads)
+
+        settings['Max Profile Velocity'] = 4321
+
+        self.assertEqual(sync_settings(self.node, settings, store=True, record=record), 1)
+
+
+class TestMaybeInt(unittest.TestCase):
+    def test_numbers_and_names(self):
+        self.assertEqual(maybe_int('123'), 123)
+        self.assertEqual(maybe_int(' 0x7b'), 123)
+        self.assertEqual(maybe_int('0b11'), 3)
+        self.assertEqual(maybe_int('Max Profile Velocity'), 'Max Profile Velocity')
+
+
+if __name__ == '__main__':
+    unittest.main()
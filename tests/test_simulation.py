@@ -0,0 +1,174 @@
+import threading
+import time
+import unittest
+
+from being.backends import CanBackend
+from being.can import load_object_dictionary
+from being.can.cia_301 import MANUFACTURER_DEVICE_NAME
+from being.can.cia_402 import (
+    MODES_OF_OPERATION, TARGET_POSITION, TARGET_VELOCITY, CiA402Node, Command,
+    OperationMode, State, drive_state_switching_jobs, which_state,
+)
+from being.can.simulation import (
+    CURRENT_ACTUAL_VALUE, EPOS4, MCLM3002, RPDO_TIMEOUT_EMCY_CODE, DriveSimulator, SimulatedDrive,
+    next_state,
+)
+
+from tests.helpers import OD_CACHE
+
+
+class TestStateMachine(unittest.TestCase):
+    def test_enabling_and_disabling(self):
+        state = State.SWITCH_ON_DISABLED
+        for cw, expected in [
+                (Command.SHUT_DOWN, State.READY_TO_SWITCH_ON),
+                (Command.SWITCH_ON, State.SWITCHED_ON),
+                (Command.ENABLE_OPERATION, State.OPERATION_ENABLED),
+                (Command.QUICK_STOP, State.QUICK_STOP_ACTIVE),
+                (Command.ENABLE_OPERATION, State.OPERATION_ENABLED),
+                (Command.DISABLE_VOLTAGE, State.SWITCH_ON_DISABLED),
+            ]:
+            state = next_state(state, cw)
+
+            self.assertIs(state, expected)
+
+    def test_fault_needs_fault_reset(self):
+        self.assertIs(next_state(State.FAULT, Command.SHUT_DOWN), State.FAULT)
+
+    def test_statusword_matches_state(self):
+        drive = SimulatedDrive(1)
+        for cw, expected in [
+                (Command.SHUT_DOWN, State.READY_TO_SWITCH_ON),
+                (Command.SWITCH_ON, State.SWITCHED_ON),
+                (Command.ENABLE_OPERATION, State.OPERATION_ENABLED),
+            ]:
+            drive.process_controlword(cw)
+
+            self.assertIs(which_state(drive.statusword), expected)
+
+    def test_fault_reset(self):
+        drive = SimulatedDrive(1)
+        drive.fault(RPDO_TIMEOUT_EMCY_CODE)
+
+        self.assertIs(which_state(drive.statusword), State.FAULT)
+
+        drive.process_controlword(0)
+        drive.process_controlword(Command.FAULT_RESET)
+
+        self.assertIs(drive.state, State.SWITCH_ON_DISABLED)
+
+
+class TestKinematics(unittest.TestCase):
+    def enabled_drive(self, **kwargs):
+        drive = SimulatedDrive(1, **kwargs)
+        drive.process_controlword(Command.SHUT_DOWN)
+        drive.process_controlword(Command.ENABLE_OPERATION)
+        return drive
+
+    def test_cyclic_synchronous_position_respects_max_velocity(self):
+        drive = self.enabled_drive(maxVelocity=100.)
+        drive.sdo[MODES_OF_OPERATION].raw = OperationMode.CYCLIC_SYNCHRONOUS_POSITION
+        drive.sdo[TARGET_POSITION].raw = 1000
+        drive.step(1.)
+
+        self.assertEqual(drive.position, 100.)
+        self.assertEqual(drive.velocity, 100.)
+
+    def test_hard_stop_raises_current(self):
+        drive = self.enabled_drive(travel=(-10., 10.), stallCurrent=1234)
+        drive.sdo[MODES_OF_OPERATION].raw = OperationMode.PROFILE_VELOCITY
+        drive.sdo[TARGET_VELOCITY].raw = -100
+        drive.step(1.)
+
+        self.assertEqual(drive.position, -10.)
+        self.assertEqual(drive.sdo[CURRENT_ACTUAL_VALUE].raw, 1234)
+
+
+class TestSimulatedBus(unittest.TestCase):
+    def test_object_dictionaries_and_state_switching(self):
+        with DriveSimulator(channel='test_simulation_0') as simulator:
+            simulator.add_drive(1, profile=MCLM3002)
+            simulator.add_drive(2, profile=EPOS4)
+            with CanBackend(bustype='virtual', channel='test_simulation_0') as network:
+                for nodeId, profile in [(1, MCLM3002), (2, EPOS4)]:
+                    od = load_object_dictionary(network, nodeId, cache=OD_CACHE)
+                    node = CiA402Node(nodeId, od, network)
+
+                    self.assertEqual(node.sdo[MANUFACTURER_DEVICE_NAME].raw, profile.deviceName)
+
+                    node.set_operation_mode(OperationMode.CYCLIC_SYNCHRONOUS_POSITION)
+                    node.change_state(State.SWITCHED_ON)
+
+                    self.assertIs(simulator[nodeId].state, State.SWITCHED_ON)
+                    self.assertEqual(node.get_operation_mode(), OperationMode.CYCLIC_SYNCHRONOUS_POSITION)
+
+    def test_pdo_communication_and_rpdo_timeout(self):
+        with DriveSimulator(channel='test_simulation_1') as simulator:
+            drive = simulator.add_drive(1, rpdoTimeout=0.05)
+            with CanBackend(bustype='virtual', channel='test_simulation_1') as network:
+                node = CiA402Node(1, load_object_dictionary(network, 1, cache=OD_CACHE), network)
+                node.set_operation_mode(OperationMode.CYCLIC_SYNCHRONOUS_POSITION)
+                network.enable_pdo_communication()
+                job = node.state_switching_job(State.OPERATION_ENABLED, how='pdo')
+                for _ in range(20):
+                    next(job, None)
+                    node.set_target_position(1234)
+                    network.transmit_all_rpdos()
+                    network.send_sync()
+                    time.sleep(0.005)
+
+                self.assertIs(node.get_state('pdo'), State.OPERATION_ENABLED)
+                self.assertEqual(node.get_actual_position(), 1234)
+
+                for _ in range(20):
+                    network.send_sync()
+                    time.sleep(0.005)
+
+                self.assertIs(drive.state, State.FAULT)
+                self.assertIs(node.get_state('pdo'), State.FAULT)
+                self.assertEqual(node.emcy.active[-1].code, RPDO_TIMEOUT_EMCY_CODE)
+
+    def test_state_switching_gets_woken_up_by_sdo_responses(self):
+        with DriveSimulator(channel='test_simulation_2') as simulator:
+            for nodeId in range(1, 11):
+                simulator.add_drive(nodeId)
+
+            with CanBackend(bustype='virtual', channel='test_simulation_2') as network:
+                nodes = [CiA402Node(nodeId, load_object_dictionary(network, nodeId, cache=OD_CACHE), network) for nodeId in range(1, 11)]
+                jobs = [node.state_switching_job(State.OPERATION_ENABLED, timeout=5.) for node in nodes]
+                startTime = time.perf_counter()
+                states = drive_state_switching_jobs(jobs, interval=10.)
+
+                self.assertLess(time.perf_counter() - startTime, 2.)
+                self.assertEqual(states, 10 * [State.OPERATION_ENABLED])
+                self.assertTrue(all(drive.state is State.OPERATION_ENABLED for drive in simulator.drives.values()))
+
+    def test_state_switching_gets_woken_up_by_statusword_pdos(self):
+        with DriveSimulator(channel='test_simulation_3') as simulator:
+            simulator.add_drive(1)
+            with CanBackend(bustype='virtual', channel='test_simulation_3') as network:
+                node = CiA402Node(1, load_object_dictionary(network, 1, cache=OD_CACHE), network)
+                network.enable_pdo_communication()
+                stop = threading.Event()
+
+                def send_syncs():
+                    while not stop.wait(0.005):
+                        network.transmit_all_rpdos()
+                        network.send_sync()
+
+                thread = threading.Thread(target=send_syncs, daemon=True)
+                thread.start()
+                try:
+                    job = node.state_switching_job(State.OPERATION_ENABLED, how='pdo', timeout=5.)
+                    startTime = time.perf_counter()
+                    state, = drive_state_switching_jobs([job], interval=10.)
+                finally:
+                    stop.set()
+                    thread.join()
+
+                self.assertLess(time.perf_counter() - startTime, 2.)
+                self.assertIs(state, State.OPERATION_ENABLED)
+
+
+if __name__ == '__main__':
+    unittest.main()
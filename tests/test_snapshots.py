@@ -0,0 +1,81 @@
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
+
+from being.pubsub import PubSub
+from being.web.snapshots import Snapshot, SnapshotCache
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_body_gets_cached_until_invalidated(self):
+        calls = []
+
+        def factory():
+            calls.append(None)
+            return {'calls': len(calls)}
+
+        snapshot = Snapshot('test', factory)
+
+        self.assertEqual(snapshot.serialize(), b'{"calls": 1}')
+        self.assertEqual(snapshot.serialize(), b'{"calls": 1}')
+
+        etag = snapshot.etag
+        snapshot.invalidate()
+
+        self.assertNotEqual(snapshot.etag, etag)
+        self.assertEqual(snapshot.serialize(), b'{"calls": 2}')
+
+    def test_snapshots_get_invalidated_by_events(self):
+        snapshots = SnapshotCache()
+        a = snapshots.register('a', list)
+        b = snapshots.register('b', list)
+        publisher = PubSub(events=['CHANGED'])
+        snapshots.invalidate_on(publisher, 'CHANGED', 'a')
+
+        publisher.publish('CHANGED', 'some', 'args')
+
+        self.assertEqual(a.version, 1)
+        self.assertEqual(b.version, 0)
+
+    def test_names_have_to_be_unique(self):
+        snapshots = SnapshotCache()
+        snapshots.register('a', list)
+
+        with self.assertRaises(ValueError):
+            snapshots.register('a', list)
+
+
+class TestSnapshotResponses(AioHTTPTestCase):
+    async def get_application(self):
+        self.data = [1, 2, 3]
+        self.snapshot = Snapshot('data', lambda: self.data)
+
+        async def get_data(request):
+            return self.snapshot.response(request)
+
+        app = web.Application()
+        app.router.add_get('/data', get_data)
+        return app
+
+    @unittest_run_loop
+    async def test_not_modified_until_invalidated(self):
+        resp = await self.client.get('/data')
+        etag = resp.headers['ETag']
+
+        self.assertEqual(await resp.json(), [1, 2, 3])
+
+        resp = await self.client.get('/data', headers={'If-None-Match': etag})
+
+        self.assertEqual(resp.status, 304)
+
+        self.data = [4, 5, 6]
+        self.snapshot.invalidate()
+        resp = await self.client.get('/data', headers={'If-None-Match': etag})
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(await resp.json(), [4, 5, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
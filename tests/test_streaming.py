@@ -0,0 +1,111 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
+
+from being.web.streaming import receive_uploads, stream_zip_archive, unpack_upload
+
+
+def validate_json(fp):
+    with open(fp) as f:
+        json.load(f)
+
+
+def is_json(fp):
+    return fp.endswith('.json')
+
+
+def zip_bytes(files: dict) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+
+    return buf.getvalue()
+
+
+class TestUnpackUpload(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_valid_members_get_installed_invalid_ones_reported(self):
+        data = zip_bytes({
+            'sub/a.json': '[1, 2, 3]',
+            'b.json': '{not json',
+            'c.txt': 'hello',
+        })
+        messages = unpack_upload(io.BytesIO(data), 'backup.zip', self.directory, validate_json, is_json)
+
+        self.assertEqual([msg['type'] for msg in messages], ['success', 'error', 'error'])
+        self.assertEqual(os.listdir(self.directory), ['a.json'])
+
+    def test_plain_file_upload(self):
+        messages = unpack_upload(io.BytesIO(b'"hello"'), 'a.json', self.directory, validate_json, is_json)
+
+        self.assertEqual(messages[0]['type'], 'success')
+        with open(os.path.join(self.directory, 'a.json')) as f:
+            self.assertEqual(f.read(), '"hello"')
+
+    def test_corrupt_zip_gets_reported(self):
+        messages = unpack_upload(io.BytesIO(b'garbage'), 'a.zip', self.directory, validate_json, is_json)
+
+        self.assertEqual(messages[0]['type'], 'error')
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+class TestStreamingRoundTrip(AioHTTPTestCase):
+    async def get_application(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmpdir.name, 'src')
+        self.dst = os.path.join(self.tmpdir.name, 'dst')
+        os.makedirs(self.src)
+        os.makedirs(self.dst)
+        for i in range(3):
+            with open(os.path.join(self.src, f'{i}.json'), 'w') as f:
+                json.dump(list(range(10000 * i)), f)
+
+        async def download(request):
+            filepaths = sorted(os.path.join(self.src, fn) for fn in os.listdir(self.src))
+            return await stream_zip_archive(request, filepaths)
+
+        async def upload(request):
+            messages = await receive_uploads(request, self.dst, validate_json, is_json)
+            return web.json_response(messages)
+
+        app = web.Application()
+        app.router.add_get('/download', download)
+        app.router.add_post('/upload', upload)
+        return app
+
+    async def tearDownAsync(self):
+        self.tmpdir.cleanup()
+
+    @unittest_run_loop
+    async def test_downloaded_archive_can_be_uploaded_again(self):
+        resp = await self.client.get('/download')
+        archive = await resp.read()
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            self.assertEqual(zf.namelist(), ['0.json', '1.json', '2.json'])
+
+        form = aiohttp.FormData()
+        form.add_field('files', archive, filename='curves.zip')
+        resp = await self.client.post('/upload', data=form)
+        messages = await resp.json()
+
+        self.assertEqual([msg['type'] for msg in messages], 3 * ['success'])
+        self.assertEqual(sorted(os.listdir(self.dst)), ['0.json', '1.json', '2.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()